@@ -0,0 +1,61 @@
+"""
+Benchmark OBJ export text formatting
+
+Compares writing vertex and face lines one row at a time
+(as export_OBJ did originally) with convert._write_rows(),
+which formats a chunk of rows with a single '%' operation,
+checks the output is identical and reports throughput in MB/s
+
+Usage: python benchmarks/obj_export.py [triangles] [repeats]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lavavu'))
+import convert
+
+def write_rows_loop(f, fmt, rows):
+    #Original per row formatting
+    for r in rows:
+        f.write(fmt % tuple(r))
+
+def bench(writer, fmt, rows, repeats):
+    #Best of several runs, writing to a real file
+    best = None
+    with tempfile.TemporaryDirectory() as tmp:
+        fn = os.path.join(tmp, 'out.obj')
+        for r in range(repeats):
+            t = time.perf_counter()
+            with open(fn, 'w') as f:
+                writer(f, fmt, rows)
+            t = time.perf_counter() - t
+            best = t if best is None else min(best, t)
+        size = os.path.getsize(fn)
+        with open(fn, 'r') as f:
+            text = f.read()
+    return best, size, text
+
+def main():
+    tris = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rng = numpy.random.default_rng(0)
+    nverts = tris * 3
+    verts = (rng.random((nverts, 3), dtype=numpy.float32) - 0.5) * 2000.0
+    faces = numpy.repeat(numpy.arange(1, nverts+1, dtype=numpy.int64).reshape((-1,3)), 2, axis=1)
+
+    print("%d triangles, %d vertices" % (tris, nverts))
+    for label, fmt, rows in [("vertices", "v %.6f %.6f %.6f\n", verts),
+                             ("faces (v//n)", "f %d//%d %d//%d %d//%d\n", faces)]:
+        t0, size, old = bench(write_rows_loop, fmt, rows, repeats)
+        t1, size, new = bench(convert._write_rows, fmt, rows, repeats)
+        if old != new:
+            raise RuntimeError("Output differs for " + label)
+        mb = size / 1e6
+        print("%-14s %8.1f MB: per row %6.1f MB/s, chunked %6.1f MB/s (%.1fx)" %
+              (label, mb, mb / t0, mb / t1, t0 / t1))
+
+if __name__ == '__main__':
+    main()
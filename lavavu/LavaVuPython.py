@@ -445,6 +445,7 @@ class GeomData(object):
     width = property(_LavaVuPython.GeomData_width_get, _LavaVuPython.GeomData_width_set)
     height = property(_LavaVuPython.GeomData_height_get, _LavaVuPython.GeomData_height_set)
     depth = property(_LavaVuPython.GeomData_depth_get, _LavaVuPython.GeomData_depth_set)
+    version = property(_LavaVuPython.GeomData_version_get, _LavaVuPython.GeomData_version_set)
     step = property(_LavaVuPython.GeomData_step_get, _LavaVuPython.GeomData_step_set)
     type = property(_LavaVuPython.GeomData_type_get, _LavaVuPython.GeomData_type_set)
 
@@ -475,6 +476,7 @@ class LavaVu(object):
     printall = _swig_new_instance_method(_LavaVuPython.LavaVu_printall)
     loadFile = _swig_new_instance_method(_LavaVuPython.LavaVu_loadFile)
     parseProperty = _swig_new_instance_method(_LavaVuPython.LavaVu_parseProperty)
+    parseProperties = _swig_new_instance_method(_LavaVuPython.LavaVu_parseProperties)
     parseCommands = _swig_new_instance_method(_LavaVuPython.LavaVu_parseCommands)
     gl_version = _swig_new_instance_method(_LavaVuPython.LavaVu_gl_version)
     image = _swig_new_instance_method(_LavaVuPython.LavaVu_image)
@@ -490,7 +492,13 @@ class LavaVu(object):
     colourBar = _swig_new_instance_method(_LavaVuPython.LavaVu_colourBar)
     setState = _swig_new_instance_method(_LavaVuPython.LavaVu_setState)
     getState = _swig_new_instance_method(_LavaVuPython.LavaVu_getState)
+    getStateChanges = _swig_new_instance_method(_LavaVuPython.LavaVu_getStateChanges)
+    getStateVersion = _swig_new_instance_method(_LavaVuPython.LavaVu_getStateVersion)
     getTimeSteps = _swig_new_instance_method(_LavaVuPython.LavaVu_getTimeSteps)
+    getCacheInfo = _swig_new_instance_method(_LavaVuPython.LavaVu_getCacheInfo)
+    exportDatabase = _swig_new_instance_method(_LavaVuPython.LavaVu_exportDatabase)
+    getWriteProgress = _swig_new_instance_method(_LavaVuPython.LavaVu_getWriteProgress)
+    getSortInfo = _swig_new_instance_method(_LavaVuPython.LavaVu_getSortInfo)
     addTimeStep = _swig_new_instance_method(_LavaVuPython.LavaVu_addTimeStep)
     resetViews = _swig_new_instance_method(_LavaVuPython.LavaVu_resetViews)
     addViewport = _swig_new_instance_method(_LavaVuPython.LavaVu_addViewport)
@@ -86,22 +86,92 @@ def _execute(lv, cmds):
 headers = {'Access-Control-Allow-Origin' : '*',
            'x-colab-notebook-cache-control' : 'no-cache'} #Colab: disable offline access cache      
 
-def img_response(lv, query={}):
+def img_response(lv, query={}, etag=None):
     global headers
     resp = None
+    resolution = None
     if 'width' in query and 'height' in query:
-        resp = lv.jpeg(resolution=(int(query['width']), int(query['height'])))
+        resolution = (int(query['width']), int(query['height']))
     elif 'width' in query:
-        resp = lv.jpeg(resolution=(int(query['width']), 0))
-    else:
-        resp = lv.jpeg()
+        resolution = (int(query['width']), 0)
+
+    #Client already has this frame (If-None-Match), nothing changed
+    if etag and etag == lv.frame_etag('jpeg', resolution):
+        return web.Response(status=304, headers=dict(headers, ETag=etag))
+
+    resp = lv.jpeg(resolution=resolution)
 
     #Ensure the response is valid before serving
     if resp is not None:
-        return web.Response(body=resp, content_type='image/jpeg', headers=headers)
+        tagged = dict(headers, ETag=lv.frame_etag('jpeg', resolution), **{'Cache-Control' : 'no-cache'})
+        return web.Response(body=resp, content_type='image/jpeg', headers=tagged)
     else:
         return web.Response(text='', headers=headers)
 
+#Default settings for /stream frames, can be overridden by query: /stream?fps=5&width=800&quality=80
+stream_fps = 10
+stream_quality = 90
+
+async def stream_response(request):
+    """
+    Serve JPEG frames as a multipart/x-mixed-replace stream,
+    or as binary messages if a WebSocket connection is requested,
+    a new frame is only sent when the viewer state has changed
+    """
+    global headers
+    query = request.query
+    fps = float(query['fps']) if 'fps' in query else stream_fps
+    quality = int(query['quality']) if 'quality' in query else stream_quality
+    resolution = None
+    if 'width' in query:
+        resolution = (int(query['width']), int(query['height']) if 'height' in query else 0)
+
+    websocket = request.headers.get('Upgrade', '').lower() == 'websocket'
+    if websocket:
+        response = web.WebSocketResponse()
+    else:
+        response = web.StreamResponse(headers=headers)
+        response.content_type = 'multipart/x-mixed-replace; boundary=frame'
+        response.headers['Cache-Control'] = 'no-cache'
+    await response.prepare(request)
+
+    reader = None
+    if websocket:
+        #Read incoming messages, the close message from the client is only seen when receiving
+        async def receive():
+            async for msg in response:
+                pass
+        reader = asyncio.ensure_future(receive())
+
+    version = None
+    try:
+        while not (websocket and (response.closed or reader.done())):
+            start = time.time()
+            #(viewer reference is not held between frames)
+            lv = request.app['viewer']()
+            if not lv or not lv.server or lv.server._closing:
+                break
+            current = lv._scene_version()
+            if current != version:
+                version = current
+                frame = await lv.jpeg_async(resolution=resolution, quality=quality)
+                if websocket:
+                    await response.send_bytes(bytes(frame))
+                else:
+                    await response.write(b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: ' + str(len(frame)).encode() + b'\r\n\r\n')
+                    await response.write(bytes(frame) + b'\r\n')
+            lv = None
+            #Limit to max frame rate
+            await asyncio.sleep(max(0, 1.0 / fps - (time.time() - start)))
+    except (ConnectionError) as e:
+        #Client disconnected
+        pass
+    finally:
+        if reader:
+            reader.cancel()
+
+    return response
+
 async def handle_get(request):
     global headers
     lv = _get_viewer(request.app['viewer'])
@@ -121,7 +191,11 @@ async def handle_get(request):
         response = web.Response(text=code, headers=headers, content_type='text/html')
 
     elif request.path.startswith('/image'):
-        response = img_response(lv, request.query)
+        response = img_response(lv, request.query, request.headers.get('If-None-Match'))
+
+    elif request.path.startswith('/stream'):
+        lv = None
+        response = await stream_response(request)
 
     elif request.path.startswith('/command=') or request.path.startswith('/icommand='):
         pos1 = request.path.find('=')
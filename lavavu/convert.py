@@ -58,7 +58,7 @@ def default_sample_grid(vrange, res=8):
     print("Sample grid RES:",RES)
     return RES
 
-def points_to_volume(verts, weights=None, res=8, kdtree=False, normed=True, clamp=None, boundingbox=None):
+def points_to_volume(verts, weights=None, res=8, kdtree=False, normed=True, clamp=None, boundingbox=None, kernel=None, radius=1.0):
     """
     Convert object vertices to a volume by interpolating points to a grid
 
@@ -66,7 +66,9 @@ def points_to_volume(verts, weights=None, res=8, kdtree=False, normed=True, clam
     - Can also be used to sample an irregular grid to a regular so volume render matches the grid dimensions
     - Result is a density field that can be volume rendered
 
-    Default is to use numpy.histogramdd method, pass kdtree=True to use scipy.spatial.KDTree
+    Default is to count the points in each grid cell (as numpy.histogramdd),
+    pass kdtree=True to use distance to the nearest grid point,
+    or kernel='linear'/'gaussian' to spread points over neighbouring cells, see: points_to_grid()
 
     TODO: support colour data too, converted density field becomes alpha channel (actually, use weights)
 
@@ -80,13 +82,176 @@ def points_to_volume(verts, weights=None, res=8, kdtree=False, normed=True, clam
 
     """
     if kdtree:
-        return points_to_volume_tree(verts, weights, res)
+        return points_to_volume_tree(verts, res)
+    elif kernel:
+        values, vmin, vmax = points_to_grid(verts, weights, res, boundingbox, kernel, radius)
+        #Clamp, normalise [0,1]
+        if clamp is not None:
+            values = numpy.clip(values, a_min=clamp[0], a_max=clamp[1])
+        if normed and values.max() > 0:
+            values /= values.max()
+        return (values, vmin, vmax)
     else:
         return points_to_volume_histogram(verts, weights, res, normed, clamp, boundingbox)
 
+def _grid_chunk(verts, weights, vmin, vmax, RES, kernel='nearest', radius=1.0):
+    """
+    Get flat voxel indices and weights for a chunk of points
+    Voxel index order is Z,Y,X as used for volume data
+    """
+    RES = numpy.array(RES)
+    cell = (vmax - vmin) / RES
+    cell[cell == 0] = 1.0
+    verts = numpy.asarray(verts, dtype=numpy.float64).reshape((-1,3))
+    f = (verts - vmin) / cell
+    if weights is None:
+        weights = numpy.ones(len(f))
+    else:
+        weights = numpy.asarray(weights, dtype=numpy.float64).ravel()
+
+    def flat(i):
+        return (i[:,2] * RES[1] + i[:,1]) * RES[0] + i[:,0]
+
+    if kernel == 'nearest':
+        #Cell containing each point, points on the max edge go in the last cell
+        inside = numpy.all((verts >= vmin) & (verts <= vmax), axis=1)
+        i = numpy.clip(numpy.floor(f[inside]).astype(numpy.int64), 0, RES - 1)
+        return flat(i), weights[inside].astype(numpy.float32)
+
+    indices = []
+    values = []
+    if kernel == 'linear':
+        #Cloud in cell: split between the 8 nearest cell centres,
+        #clamped at the edges so every point is fully counted
+        g = f - 0.5
+        i0 = numpy.floor(g).astype(numpy.int64)
+        w1 = g - i0
+        w0 = 1.0 - w1
+        for o in [(x, y, z) for z in (0,1) for y in (0,1) for x in (0,1)]:
+            w = weights.copy()
+            for d in range(3):
+                w *= w1[:,d] if o[d] else w0[:,d]
+            indices.append(flat(numpy.clip(i0 + o, 0, RES - 1)))
+            values.append(w)
+    elif kernel == 'gaussian':
+        #Gaussian splat over cells within 3 sigma, sigma = radius in cells,
+        #normalised so each point adds its full weight (less any outside the grid)
+        r = max(1, int(numpy.ceil(3.0 * radius)))
+        i0 = numpy.floor(f).astype(numpy.int64)
+        #Separable, weight per axis for each offset, normalised per axis
+        axis = [numpy.exp(-0.5 * (i0 + o + 0.5 - f) ** 2 / (radius * radius)) for o in range(-r, r+1)]
+        total = sum(axis)
+        axis = [w / total for w in axis]
+        for z in range(2*r+1):
+            wz = axis[z][:,2] * weights
+            for y in range(2*r+1):
+                wzy = wz * axis[y][:,1]
+                for x in range(2*r+1):
+                    i = i0 + (x - r, y - r, z - r)
+                    inside = numpy.all((i >= 0) & (i < RES), axis=1)
+                    indices.append(flat(i[inside]))
+                    values.append((wzy * axis[x][:,0])[inside])
+    else:
+        raise ValueError("Unknown kernel: " + str(kernel))
+
+    return numpy.concatenate(indices), numpy.concatenate(values).astype(numpy.float32)
+
+def points_to_grid(source, weights=None, res=8, boundingbox=None, kernel='nearest', radius=1.0, chunksize=1000000, threads=None):
+    """
+    Accumulate points into a regular grid volume, one chunk at a time
+
+    Each chunk of points is converted to flat voxel indices and weights
+    on a thread pool, then added into a single preallocated float32 volume,
+    so memory use is bounded by the grid and the chunk size, not the point count
+
+    Kernels:
+    - nearest : each point adds its weight to the cell containing it (as numpy.histogramdd)
+    - linear : cloud-in-cell, weight split between the 8 nearest cell centres
+    - gaussian : weight spread over cells within 3*radius with gaussian falloff
+
+    Parameters
+    ----------
+    source : array or iterable
+        Vertices, or an iterable yielding blocks of vertices or (vertices, weights) tuples,
+        eg: from points.readpointcloud(), for clouds larger than memory
+    weights : array
+        Weight for each vertex if source is an array, default 1
+    res : int or list
+        Grid resolution [x,y,z] or the minimum resolution, see: default_sample_grid()
+    boundingbox : list
+        Bounds of the grid [min, max], required if source is an iterable
+    kernel : str
+        'nearest', 'linear' or 'gaussian'
+    radius : float
+        Gaussian kernel standard deviation, in grid cells
+    chunksize : int
+        Number of points processed at once
+    threads : int
+        Number of threads for processing chunks, default is the cpu count
+
+    Returns
+    -------
+    values: numpy array of float32
+        The accumulated grid, shape Z,Y,X
+    vmin : array
+        the minimum 3d vertex of the bounding box
+    vmax : array
+        the maximum 3d vertex of the bounding box
+    """
+    import collections
+    from concurrent.futures import ThreadPoolExecutor
+    if isinstance(source, numpy.ndarray):
+        verts = source.reshape((-1,3))
+        if boundingbox is None:
+            boundingbox = min_max_range(verts)[0:2]
+        if weights is not None:
+            weights = numpy.asarray(weights).ravel()
+        def chunks():
+            for start in range(0, len(verts), chunksize):
+                yield (verts[start:start+chunksize], weights[start:start+chunksize] if weights is not None else None)
+        source = chunks()
+    elif boundingbox is None:
+        raise ValueError("boundingbox required when source is an iterable")
+
+    vmin = numpy.array(boundingbox[0], dtype=numpy.float64)
+    vmax = numpy.array(boundingbox[1], dtype=numpy.float64)
+    vrange = vmax - vmin
+    RES = default_sample_grid(vrange, res)
+    values = numpy.zeros(RES[::-1], dtype=numpy.float32)
+    flatvalues = values.reshape(-1)
+
+    def process(block):
+        if isinstance(block, tuple):
+            verts, w = block
+        else:
+            verts, w = block, None
+        return _grid_chunk(verts, w, vmin, vmax, RES, kernel, radius)
+
+    def accumulate(result):
+        idx, w = result
+        if len(idx) > len(flatvalues):
+            #Many more points than cells, faster to count
+            numpy.add(flatvalues, numpy.bincount(idx, w, minlength=len(flatvalues)), out=flatvalues, casting='unsafe')
+        else:
+            numpy.add.at(flatvalues, idx, w)
+
+    #Keep a bounded number of chunks in flight, so generator input is not read ahead
+    threads = threads or os.cpu_count() or 1
+    with ThreadPoolExecutor(threads) as pool:
+        pending = collections.deque()
+        for block in source:
+            pending.append(pool.submit(process, block))
+            if len(pending) >= 2 * threads:
+                accumulate(pending.popleft().result())
+        while pending:
+            accumulate(pending.popleft().result())
+
+    return (values, vmin, vmax)
+
 def points_to_volume_histogram(verts, weights, res=8, normed=True, clamp=None, boundingbox=None):
     """
-    Using numpy.histogramdd to create 3d histogram volume grid
+    Create 3d histogram volume grid, same result as numpy.histogramdd
+    but accumulated in chunks with points_to_grid()
     (Easily the fastest, but less control over output)
     """
     #Reshape to 3d vertices
@@ -108,15 +273,13 @@ def points_to_volume_histogram(verts, weights, res=8, normed=True, clamp=None, b
         weights = (weights - weights.min()) / (weights.max() - weights.min())
         #print(verts.shape, weights.shape, weights.min(), weights.max())
 
-    #H, edges = numpy.histogramdd(verts, bins=RES)
-    if boundingbox is None:
-        H, edges = numpy.histogramdd(verts, weights=weights, bins=RES, density=normed) #density=True for newer numpy
-    else:
-        rg = ((vmin[0], vmax[0]), (vmin[1], vmax[1]), (vmin[2], vmax[2])) #provide bounding box as range
-        H, edges = numpy.histogramdd(verts, weights=weights, bins=RES, range=rg, density=normed) #density=True for newer numpy
+    #Counts in Z,Y,X order for volume data
+    values, vmin, vmax = points_to_grid(verts, weights, RES, (vmin, vmax))
 
-    #Reverse ordering X,Y,Z to Z,Y,X for volume data
-    values = H.transpose()
+    #Probability density, as histogramdd(density=True)
+    if normed:
+        cellvolume = numpy.prod(numpy.array(vrange, dtype=numpy.float64) / RES)
+        values /= values.sum() * cellvolume
 
     #Clamp [0,0.1] - optional (for a more binary output, points vs no points)
     if clamp is not None:
@@ -130,9 +293,10 @@ def points_to_volume_histogram(verts, weights, res=8, normed=True, clamp=None, b
 
 def points_to_volume_tree(verts, res=8):
     """
-    Using scipy.spatial.KDTree to find nearest points on grid
+    Using distance to the nearest grid point, calculated directly
+    from the regular grid spacing, points processed in chunks
 
-    Much slower, but more control
+    Slower, but more control
 
     TODO: control parameters
     """
@@ -146,7 +310,6 @@ def points_to_volume_tree(verts, res=8):
     #Push out the edges a bit, will create a smoother boundary when we filter
     #lmin -= 0.1*lrange
     #lmax += 0.1*lrange
-    values = numpy.full(shape=(verts.shape[0]), dtype=numpy.float32, fill_value=1.0)
 
     #Minimum resolution to get ok sampling
     RES = default_sample_grid(lrange, res)
@@ -157,48 +320,40 @@ def points_to_volume_tree(verts, res=8):
     lmin -= 2.0*cell
     lmax += 2.0*cell
 
-    x = numpy.linspace(lmin[0], lmax[0] , RES[0])
-    y = numpy.linspace(lmin[1], lmax[1] , RES[1])
-    z = numpy.linspace(lmin[2], lmax[2] , RES[2])
-    print(x.shape, y.shape, z.shape)
-    Z, Y, X = numpy.meshgrid(z, y, x, indexing='ij') #ij=matrix indexing, xy=cartesian
-    XYZ = numpy.vstack((X,Y,Z)).reshape([3, -1]).T
-
-    print(lmin,lmax, XYZ.shape)
-
-    #KDtree for finding nearest neighbour points
-    from scipy import spatial
-    #sys.setrecursionlimit(1000)
-    #tree = spatial.KDTree(XYZ)
-    print("Building KDTree")
-    tree = spatial.cKDTree(XYZ)
+    #Grid points evenly spaced from lmin to lmax, the nearest to each
+    #point is found directly from its position, no tree or full grid needed
+    RES = numpy.array(RES)
+    spacing = (lmax - lmin) / numpy.maximum(RES - 1, 1)
+    spacing[spacing == 0] = 1.0
+    print(lmin,lmax, RES)
 
     #Outside distance to apply to grid points
     MAXDIST = max(lrange) / max(RES) #Max cell size diagonal
-    print("Tree query, maxdist:",MAXDIST,max(lrange))
+    print("Nearest grid points, maxdist:",MAXDIST,max(lrange))
 
-    #Query all points, result is tuple: distances, indices
-    distances, indices = tree.query(verts, k=1) #Just get a single nearest neighbour for now
+    values = numpy.zeros(shape=(numpy.prod(RES)), dtype=numpy.float32)
+    chunksize = 1000000
+    for start in range(0, len(verts), chunksize):
+        chunk = verts[start:start+chunksize]
+        nearest = numpy.clip(numpy.rint((chunk - lmin) / spacing), 0, RES - 1).astype(numpy.int64)
+        distances = numpy.linalg.norm(chunk - (lmin + nearest * spacing), axis=1)
 
-    print("Calculate distances")
-    #Convert distances to [0,1] where 1=on grid and <= 0 is outside max range
-    distances = (MAXDIST - distances) / MAXDIST
-    print("Zero out of range distances")
-    distances *= (distances>0) #Zero negative elements by multiplication in-place
+        #Convert distances to [0,1] where 1=on grid and <= 0 is outside max range
+        distances = (MAXDIST - distances) / MAXDIST
+        distances *= (distances>0) #Zero negative elements by multiplication in-place
+
+        #Add the distances to the values at their nearest grid point indices
+        indices = (nearest[:,2] * RES[1] + nearest[:,1]) * RES[0] + nearest[:,0]
+        numpy.add.at(values, indices, distances.astype(numpy.float32))
 
-    #Add the distances to the values at their nearest grid point indices
-    print("Compose distance field")
-    values = numpy.zeros(shape=(XYZ.shape[0]), dtype=numpy.float32)
-    values[indices] += distances
     #Clip value max
     print("Clip distance field")
     values = values.clip(max=1.0)
-    
+
     #Reshape to actual grid dims Z,Y,X... (not required but allows slicing)
-    XYZ = XYZ.reshape(RES[::-1] + [3])
     values = values.reshape(RES[::-1])
-    print(XYZ.shape, values.shape)
-    
+    print(values.shape)
+
     return (values, lmin, lmax)
 
 
@@ -271,6 +426,26 @@ def colour2hex(rgb):
         return s[2:].zfill(2)
     return "#" + padhex2(rgb[0]) + padhex2(rgb[1]) + padhex2(rgb[2])
 
+def colours2rgb(colours):
+    """
+    Convert an array of packed 32 bit colour values to an (N,3) uint8 array of r,g,b
+    (bulk version of colour2rgb, returns a view of the bytes where possible)
+    """
+    c = numpy.ascontiguousarray(colours, dtype='<u4').ravel()
+    return c.view(numpy.uint8).reshape((-1,4))[:,0:3]
+
+def _write_rows(f, fmt, rows, chunk=65536):
+    """
+    Write a 2d array as text, one line per row formatted with fmt,
+    lines are formatted and written a chunk at a time instead of per row
+    """
+    rows = numpy.asarray(rows)
+    if rows.ndim == 1:
+        rows = rows.reshape((-1,1))
+    for start in range(0, len(rows), chunk):
+        block = rows[start:start+chunk]
+        f.write((fmt * len(block)) % tuple(block.ravel().tolist()))
+
 def _get_objects(source):
     """
     Returns a list of objects
@@ -351,10 +526,9 @@ def _write_OBJ(f, m, filepath, obj, offset=1, verbose=False, vertexcolours=True)
         mtl_line = _write_MTL(m, name, texture=fn, opacity=obj["opacity"])
 
     elif m and colourcount > 0 and not vertexcolours:
-        #Define material for each (slow for high colour/vertex count - could sort faces by material before writing?)
+        #Define material for each colour (faces are sorted by material when written)
         if colourcount < 10000:
             colourdict = {}
-            #SLOW!
 
             #Get unique https://stackoverflow.com/a/33197029/866759
             allcolours = numpy.concatenate(obj.data.colours)
@@ -464,67 +638,68 @@ def _write_OBJ(f, m, filepath, obj, offset=1, verbose=False, vertexcolours=True)
                 texcoords = numpy.vstack((texcoords,zeros)).reshape([2, -1]).transpose()
 
         #Colours?
-        cv0 = ""
         vperc = 1
         if len(data.colours):
-            vperc = int(verts.shape[0] / len(data.colours))
+            vperc = max(1, int(verts.shape[0] / len(data.colours)))
 
         if verbose: print("- Writing vertices:",verts.shape)
-        for vi,v in enumerate(verts):
+        if vertexcolours and len(data.colours):
             #Vertex colour with vertex? (only if flag passed)
-            if vertexcolours and len(data.colours):
-                #if vi%10==0: print(len(data.colours), len(verts), vperc, vi)
-                c = data.colours[len(data.colours) // vperc - 1]
-                rgb = colour2rgb(c)
-                f.write("v %.6f %.6f %.6f %.6f %.6f %.6f\n" % (v[0], v[1], v[2], rgb[0]/255.0, rgb[1]/255.0, rgb[2]/255.0))
-            else:
-                f.write("v %.6f %.6f %.6f\n" % (v[0], v[1], v[2]))
+            ci = numpy.minimum(numpy.arange(verts.shape[0]) // vperc, len(data.colours)-1)
+            rgb = colours2rgb(data.colours)[ci] / 255.0
+            _write_rows(f, "v %.6f %.6f %.6f %.6f %.6f %.6f\n", numpy.hstack((verts, rgb)))
+        else:
+            _write_rows(f, "v %.6f %.6f %.6f\n", verts)
         if verbose: print("- Writing normals:",normals.shape)
-        for n in normals:
-            f.write("vn %.6f %.6f %.6f\n" % (n[0], n[1], n[2]))
+        _write_rows(f, "vn %.6f %.6f %.6f\n", normals)
         if verbose: print("- Writing texcoords:",texcoords.shape)
         if len(texcoords.shape) == 2:
-            for t in texcoords:
-                f.write("vt %.6f %.6f\n" % (t[0], t[1]))
+            _write_rows(f, "vt %.6f %.6f\n", texcoords)
         else:
-            for t in texcoords:
-                f.write("vt %.6f\n" % t)
+            _write_rows(f, "vt %.6f\n", texcoords)
 
         #Face elements v/t/n v/t v//n
         f.write(mtl_line)
         if len(normals) and len(texcoords):
             if verbose: print("- Writing faces (v/t/n):",indices.shape)
+            fmt = "f %d/%d/%d %d/%d/%d %d/%d/%d\n"
+            repeat = 3
         elif len(texcoords):
             if verbose: print("- Writing faces (v/t):",indices.shape)
+            fmt = "f %d/%d %d/%d %d/%d\n"
+            repeat = 2
         elif len(normals):
             if verbose: print("- Writing faces (v//n):",indices.shape)
+            fmt = "f %d//%d %d//%d %d//%d\n"
+            repeat = 2
         else:
             if verbose: print("- Writing faces (v):",indices.shape)
+            fmt = "f %d %d %d\n"
+            repeat = 1
         if verbose: print("- Colours :",data.colours.shape)
         if verbose: print("- Indices :",indices.shape)
 
-        for n,i in enumerate(indices):
-            if verbose and n%1000==0: print(".", end=''); sys.stdout.flush()
-            i0 = i[0]+offset
-            i1 = i[1]+offset
-            i2 = i[2]+offset
-            #Use mtl colours?
-            if colourdict:
-                ci = int(i[0] / vperc)
-                cv1 = data.colours[ci]
-                if cv0 != cv1 and cv1 in colourdict:
-                    f.write("usemtl " + colourdict[cv1][0] + "\n")
-                    cv0 = cv1
-
-            if len(normals) and len(texcoords):
-                f.write("f %d/%d/%d %d/%d/%d %d/%d/%d\n" % (i0, i0, i0, i1, i1, i1, i2, i2, i2))
-            elif len(texcoords):
-                f.write("f %d/%d %d/%d %d/%d\n" % (i0, i0, i1, i1, i2, i2))
-            elif len(normals):
-                f.write("f %d//%d %d//%d %d//%d\n" % (i0, i0, i1, i1, i2, i2))
-            else:
-                f.write("f %d %d %d\n" % (i0, i1, i2))
-        if verbose: print()
+        #Same index used for vertex, texcoord and normal
+        faces = indices.astype(numpy.int64) + offset
+        if repeat > 1:
+            faces = numpy.repeat(faces, repeat, axis=1)
+
+        #Use mtl colours?
+        if colourdict:
+            #Sort faces by material, then switch material once per block
+            ci = numpy.minimum(indices[:,0] // vperc, len(data.colours)-1)
+            mtl = data.colours[ci]
+            order = numpy.argsort(mtl, kind='stable')
+            mtl = mtl[order]
+            faces = faces[order]
+            starts = numpy.flatnonzero(numpy.r_[True, mtl[1:] != mtl[:-1]])
+            ends = numpy.r_[starts[1:], len(mtl)]
+            for start,end in zip(starts, ends):
+                if mtl[start] in colourdict:
+                    f.write("usemtl " + colourdict[mtl[start]][0] + "\n")
+                _write_rows(f, fmt, faces[start:end])
+        else:
+            _write_rows(f, fmt, faces)
 
         offset += verts.shape[0]
     return offset
@@ -537,6 +712,10 @@ def export_PLY(filepath, source, binary=True):
     If source is lavavu.Viewer() exports all objects
     If source is lavavu.Object() exports single object
 
+    All elements of all objects are written to a single vertex list
+    (and face list for triangles), one element at a time so the
+    full data set is never held in memory
+
     Parameters
     ----------
     filepath : str
@@ -547,114 +726,119 @@ def export_PLY(filepath, source, binary=True):
         Write vertex/face data as binary, default True
     """
     objects = _get_objects(source)
-    with open(filepath, mode='wb') as f:
-        voffset = 0
-        foffset = 0
-        #First count vertices, faces
-        fc = 0
-        vc = 0
-        for obj in objects:
-            for o,data in enumerate(obj):
-                vc += len(data.vertices) #Vertices now in shape (N,3) so len returns correct count
-                fc += len(data.indices) // 3
-
-        #Pass the counts first
-        vertex = None
-        face = None
-        print(vc, " vertices, ", fc, " faces")
-        for obj in objects:
-            for o,data in enumerate(obj):
-                print("[%s] element %d of %d, type %s" % (obj.name, o+1, len(obj.data), data.type))
-                #print("OFFSETS:",voffset,foffset)
-                verts = data.vertices.reshape((-1,3))
-                if len(verts) == 0:
-                    print("No vertices")
-                    return
-                if len(verts) != vc:
-                    print("Vertex count error!", len(verts), vc, verts.shape)
-                    return
-                indices = data.indices.reshape((-1,3))
-                normals = data.normals.reshape((-1,3))
-                texcoords = data.texcoords.reshape((-1,2))
-
-                vperc = 0
-                cperf = 0
-                if len(data.colours):
-                    vperc = int(verts.shape[0] / len(data.colours))
-                    C = data.colours
-                    #print("COLOURS:",len(C),C.shape, verts.shape[0], verts.shape[0] / len(data.colours), vperc)
-
-                if data.type != 'points':
-                    #Per face colours, or less
-                    if face is None:
-                        if vperc and vperc < len(verts):
-                            #cperf = int(indices.shape[0] / len(data.colours))
-                            face = numpy.zeros(shape=(fc), dtype=[('vertex_indices', 'i4', (3,)), ('red', 'u1'), ('green', 'u1'), ('blue', 'u1')])
-                        else:
-                            face = numpy.zeros(shape=(fc), dtype=[('vertex_indices', 'i4', (3,))])
-                        print("FACE:",face.dtype)
-
-                    for i,idx in enumerate(indices):
-                        if i%1000==0: print(".", end=''); sys.stdout.flush()
-                        if vperc and vperc < len(verts):
-                            #Have colour, but less than vertices, apply to faces
-                            ci = idx[0] // vperc
-                            c = data.colours[ci]
-                            rgb = colour2rgb(c)
-                            face[i+foffset] = ([idx[0]+voffset, idx[1]+voffset, idx[2]+voffset], rgb[0], rgb[1], rgb[2])
-                        else:
-                            face[i+foffset] = ([idx[0]+voffset, idx[1]+voffset, idx[2]+voffset])
-                    print()
-
-                #Construct and write vertex elements
-                if vertex is None:
-                    #Setup vertex array based on first object element
-                    D = [('x', 'f4'), ('y', 'f4'), ('z', 'f4')]
-                    if normals.shape[0] == verts.shape[0]:
-                        D += [('nx', 'f4'), ('ny', 'f4'), ('nz', 'f4')]
-                    if texcoords.shape[0] == verts.shape[0]:
-                        D += [('s', 'f4'), ('t', 'f4')]
-                    if vperc and vperc == 1:
-                        D += [('red', 'u1'), ('green', 'u1'), ('blue', 'u1')]
-                    print("VERTEX:",D)
-                    vertex = numpy.zeros(shape=(vc), dtype=D)
-
-                for i,v in enumerate(verts):
-                    #if i%1000==0:
-                    #    print("vert index",i,vperc)
-                    if i%1000==0: print(".", end=''); sys.stdout.flush()
-                    E = [v[0], v[1], v[2]]
-                    if normals.shape[0] == verts.shape[0]:
-                        N = normals[i]
-                        E += [N[0], N[1], N[2]]
-                    if texcoords.shape[0] == verts.shape[0]:
-                        T = texcoords[i]
-                        E += [T[0], T[1]]
-                    if vperc and vperc == 1:
-                        c = data.colours[i]
-                        rgb = colour2rgb(c)
-                        E += [rgb[0], rgb[1], rgb[2]]
-                    vertex[i+voffset] = tuple(E)
-                print()
-
-                #Update offsets : number of vertices / faces added
-                voffset += verts.shape[0]
-                foffset += indices.shape[0]
-
-        import plyfile
-        #vertex = numpy.array(vertex, dtype=vertex.dtype)
-        els = []
-        els.append(plyfile.PlyElement.describe(vertex, 'vertex'))
-        if face is not None:
-            els.append(plyfile.PlyElement.describe(face, 'face'))
-
-        #Write, text or binary
+
+    #First count vertices, faces and find the properties to write,
+    #normals/texcoords only if every element has one per vertex,
+    #colours per vertex or per face if any element has them
+    elements = []
+    vc = 0
+    fc = 0
+    normals = True
+    texcoords = True
+    vcolours = False
+    fcolours = False
+    for obj in objects:
+        for o,data in enumerate(obj):
+            nv = data.vertices.size // 3
+            if nv == 0:
+                continue
+            nf = data.indices.size // 3 if data.type != 'points' else 0
+            nc = data.colours.size
+            normals = normals and data.normals.size // 3 == nv
+            texcoords = texcoords and data.texcoords.size // 2 == nv
+            vcolours = vcolours or nc >= nv
+            fcolours = fcolours or (nf > 0 and 0 < nc < nv)
+            elements.append((obj, data))
+            vc += nv
+            fc += nf
+    print(vc, " vertices, ", fc, " faces")
+
+    V = [('x', '<f4'), ('y', '<f4'), ('z', '<f4')]
+    if normals:
+        V += [('nx', '<f4'), ('ny', '<f4'), ('nz', '<f4')]
+    if texcoords:
+        V += [('s', '<f4'), ('t', '<f4')]
+    if vcolours:
+        V += [('red', 'u1'), ('green', 'u1'), ('blue', 'u1')]
+    F = [('count', 'u1'), ('vertex_indices', '<i4', (3,))]
+    if fcolours:
+        F += [('red', 'u1'), ('green', 'u1'), ('blue', 'u1')]
+
+    def element_colours(obj, data, index):
+        #R,G,B for each vertex index, colour array may be per vertex, per face or single
+        if data.colours.size:
+            vperc = max(1, (data.vertices.size // 3) // data.colours.size)
+            ci = numpy.minimum(index // vperc, data.colours.size - 1)
+            return colours2rgb(data.colours)[ci]
+        #No colours, use the object colour
+        c = obj.parent.parse_colour(obj["colour"])
+        return numpy.array(c[0:3] * 255, dtype=numpy.uint8)
+
+    types = {'<f4' : 'float', '<i4' : 'int', 'u1' : 'uchar'}
+    header = ["ply", "format %s 1.0" % ("binary_little_endian" if binary else "ascii"),
+              "comment Exported by LavaVu", "element vertex %d" % vc]
+    header += ["property %s %s" % (types[d[1]], d[0]) for d in V]
+    if fc:
+        header += ["element face %d" % fc, "property list uchar int vertex_indices"]
+        header += ["property %s %s" % (types[d[1]], d[0]) for d in F[2:]]
+    header += ["end_header", ""]
+
+    def write(f, block, fmt):
         if binary:
-            print("Writing binary PLY data")
-            plyfile.PlyData(els).write(f)
+            block.tofile(f)
         else:
-            print("Writing ascii PLY data")
-            plyfile.PlyData(els, text=True).write(f)
+            #Text, all fields as columns
+            cols = [block[n].reshape((len(block), -1)) for n in block.dtype.names]
+            _write_rows(f, fmt, numpy.hstack([c.astype(numpy.float64) if c.dtype.kind == 'f' else c.astype(numpy.int64) for c in cols]))
+
+    if binary:
+        print("Writing binary PLY data")
+    else:
+        print("Writing ascii PLY data")
+    with open(filepath, mode='wb' if binary else 'w') as f:
+        f.write('\n'.join(header).encode() if binary else '\n'.join(header))
+
+        #Vertices
+        vfmt = ' '.join(['%.6f' if d[1] == '<f4' else '%d' for d in V]) + '\n'
+        for obj,data in elements:
+            verts = data.vertices.reshape((-1,3))
+            vertex = numpy.empty(len(verts), dtype=V)
+            vertex['x'] = verts[:,0]
+            vertex['y'] = verts[:,1]
+            vertex['z'] = verts[:,2]
+            if normals:
+                N = data.normals.reshape((-1,3))
+                vertex['nx'] = N[:,0]
+                vertex['ny'] = N[:,1]
+                vertex['nz'] = N[:,2]
+            if texcoords:
+                T = data.texcoords.reshape((-1,2))
+                vertex['s'] = T[:,0]
+                vertex['t'] = T[:,1]
+            if vcolours:
+                rgb = element_colours(obj, data, numpy.arange(len(verts)))
+                vertex['red'] = rgb[...,0]
+                vertex['green'] = rgb[...,1]
+                vertex['blue'] = rgb[...,2]
+            write(f, vertex, vfmt)
+
+        #Faces, indices offset by vertex count of previous elements
+        ffmt = "%d" + " %d" * (len(F) + 1) + "\n"
+        voffset = 0
+        for obj,data in elements:
+            if data.type != 'points' and data.indices.size:
+                indices = data.indices.reshape((-1,3))
+                face = numpy.empty(len(indices), dtype=F)
+                face['count'] = 3
+                face['vertex_indices'] = indices
+                face['vertex_indices'] += voffset
+                if fcolours:
+                    rgb = element_colours(obj, data, indices[:,0])
+                    face['red'] = rgb[...,0]
+                    face['green'] = rgb[...,1]
+                    face['blue'] = rgb[...,2]
+                write(f, face, ffmt)
+            voffset += data.vertices.size // 3
 
 def _get_PLY_colours(element):
     """
@@ -22,7 +22,7 @@ __all__ = ['Viewer', 'Object', 'Properties', 'ColourMap', 'DrawData', 'Figure',
 import os
 #must be an object or won't be referenced from __init__.py import
 #(enures values are passed on when set externally)
-settings = {"default_args" : [], "echo_fails" : False, "quality_override" : None}
+settings = {"default_args" : [], "echo_fails" : False, "quality_override" : None, "report_copies" : False}
 #Default arguments for viewer creation
 _val = os.environ.get('LV_ARGS')
 if _val:
@@ -35,6 +35,10 @@ if _val:
 _val = os.environ.get('LV_QUALITY')
 if _val:
     settings["quality_override"] = int(_val)
+#Report bytes copied converting data on each load
+_val = os.environ.get('LV_REPORT_COPIES')
+if _val:
+    settings["report_copies"] = _val.lower() not in ('0', 'false', 'no', 'off')
 
 import json
 import math
@@ -46,7 +50,9 @@ import re
 import copy
 import base64
 import threading
-from collections import deque
+import queue
+import concurrent.futures
+from collections import deque, OrderedDict
 import time
 import weakref
 import asyncio
@@ -138,31 +144,62 @@ def _convert_args(dictionary):
     """
     return str(json.dumps(dictionary, cls=_CustomEncoder))
 
+#Bytes copied by data conversion since the last _report_copies()
+#(per thread, data is also loaded from the render thread)
+_copied = threading.local()
+
+def _copy(data):
+    #Record a new array created when converting data
+    if settings["report_copies"]:
+        _copied.bytes = getattr(_copied, 'bytes', 0) + data.nbytes
+    return data
+
+def _report_copies(label, data):
+    #Print bytes copied loading a data set, if enabled
+    if settings["report_copies"]:
+        print("%s: loaded %d bytes, copied %d bytes" % (label, data.nbytes, getattr(_copied, 'bytes', 0)))
+    _copied.bytes = 0
+
+def _flat(data):
+    #Load as flattened 1d array
+    #(ravel() returns view rather than copy if possible, flatten() always copies)
+    if not data.flags.c_contiguous:
+        return _copy(data.ravel())
+    return data.ravel()
+
 def _convert(data, dtype=None):
     #Prepare a data set
+    #(the data passed is never modified, a copy is only made when a conversion is required)
     if not isinstance(data, numpy.ndarray):
         #Convert to numpy array first
-        data = numpy.asarray(data)
+        data = _copy(numpy.asarray(data))
 
     #Always convert float64 to float32
     if data.dtype == numpy.float64:
-        data = data.astype(numpy.float32)
+        data = _copy(data.astype(numpy.float32))
 
     #Transform to requested data type if provided
     if data.dtype == numpy.float32 and dtype == numpy.uint8:
         #Convert float[0,1] to uint8 * 255
         if numpy.amin(data) >= 0.0 and numpy.amax(data) <= 1.0:
-            data *= 255.0
-        data = data.astype(numpy.uint8)
+            if isinstance(data, numpy.ma.MaskedArray):
+                data = _copy(data * 255.0)
+            else:
+                #Scale directly into the new uint8 array
+                out = _copy(numpy.empty(data.shape, dtype=numpy.uint8))
+                numpy.multiply(data, 255.0, out=out, casting='unsafe')
+                data = out
+        if data.dtype != numpy.uint8:
+            data = _copy(data.astype(numpy.uint8))
     elif dtype != None and data.dtype != dtype:
-        data = data.astype(dtype)
+        data = _copy(data.astype(dtype))
 
     #Masked array? Set fill value to NaN
     if numpy.ma.is_masked(data):
         if data.fill_value != numpy.nan:
             print("Warning: setting masked array fill to NaN, was: ", data.fill_value)
             numpy.ma.set_fill_value(data, numpy.nan)
-        data = data.filled()
+        data = _copy(data.filled())
 
     return data
 
@@ -543,6 +580,9 @@ class Object(dict):
         self.parent._setupobject(self.ref, **self.dict)
 
     def __getitem__(self, key):
+        #Pending batched value?
+        if self.parent._batch and self.parent._batch._pending(self, key):
+            return self.parent._batch._value(self, key)
         self.parent._get() #Ensure in sync
         if key in self.dict:
             return self.dict[key]
@@ -570,9 +610,31 @@ class Object(dict):
                 cmap = self.colourmap(value)
                 value = cmap.name
 
+        #Defer until batch completed?
+        if self.parent._batch:
+            self.parent._batch._add(self, key, value)
+            return
+
         self.parent.app.parseProperty(key + '=' + _convert_args(value), self.ref)
         self.parent._get() #Ensure in sync
 
+    def update_properties(self, **kwargs):
+        """
+        Set multiple properties on the object in a single update
+
+        Equivalent to setting each property in turn with obj[key] = value,
+        but the properties are applied together and the viewer state is only
+        synchronised once
+
+        Parameters
+        ----------
+        **kwargs :
+            key=value property names and values to set
+        """
+        with self.parent.batch():
+            for key in kwargs:
+                self[key] = kwargs[key]
+
     def __contains__(self, key):
         return key in self.dict
 
@@ -776,14 +838,14 @@ class Object(dict):
     def _loadScalar(self, data, geomdtype, width=0, height=0, depth=0):
         #Passes a scalar dataset (float/uint8/uint32)
         data = _convert(data)
-        #Load as flattened 1d array
-        #(ravel() returns view rather than copy if possible, flatten() always copies)
+        flat = _flat(data)
+        _report_copies(self.name, data)
         if data.dtype == numpy.float32:
-            return self.parent.app.arrayFloat(self.ref, data.ravel(), geomdtype, width, height, depth)
+            return self.parent.app.arrayFloat(self.ref, flat, geomdtype, width, height, depth)
         elif data.dtype == numpy.uint32:
-            return self.parent.app.arrayUInt(self.ref, data.ravel(), geomdtype, width, height, depth)
+            return self.parent.app.arrayUInt(self.ref, flat, geomdtype, width, height, depth)
         elif data.dtype == numpy.uint8:
-            return self.parent.app.arrayUChar(self.ref, data.ravel(), geomdtype, width, height, depth)
+            return self.parent.app.arrayUChar(self.ref, flat, geomdtype, width, height, depth)
 
 
     def _checkDims(self, size):
@@ -877,18 +939,26 @@ class Object(dict):
         shape = data.shape
         width, height, depth = 0, 0, 0
         if len(shape) >= 2:
-            #Data provided as separate x,y,z columns? (Must be > 3 elements)
-            if shape[-1] > 3 and shape[0] == 3:
-                #Re-arrange to array of [x,y,z] triples
-                data = numpy.dstack((data[0],data[1],data[2]))
-            elif shape[-1] > 3 and shape[0] == 2:
-                #Re-arrange to array of [x,y] pairs
-                data = numpy.dstack((data[0],data[1]))
+            #Data provided as separate x,y,z or x,y columns? (Must be > 3 elements)
+            if shape[-1] > 3 and shape[0] in [2, 3]:
+                #Re-arrange to array of [x,y,z] triples (or [x,y] pairs if D==2)
+                #(shaped as numpy.dstack() would, 1d columns become [1,N,D])
+                C = shape[0]
+                outshape = shape[1:] if len(shape) > 2 else (1,) + shape[1:]
+                out = _copy(numpy.empty(outshape + (max(C, D),), dtype=numpy.float32))
+                for c in range(C):
+                    out[..., c] = data[c]
+                if C < D:
+                    #2d vertices with 3d target, add zero 3rd dimension
+                    out[..., C:] = 0
+                data = out
 
             #Now check for 2d vertices with 3d target
-            if D==3 and data.shape[-1] == 2:
+            elif D==3 and shape[-1] == 2:
                 #Interpret as 2d data... must add 3rd dimension
-                data = numpy.insert(data, 2, values=0, axis=len(shape)-1)
+                out = _copy(numpy.zeros(shape[:-1] + (3,), dtype=numpy.float32))
+                out[..., :2] = data
+                data = out
 
             #Quads or tracers? Use the shape as dims if not provided
             if D==3:
@@ -901,9 +971,9 @@ class Object(dict):
                 if renderer in self.parent.renderers[LavaVuPython.lucTracerType]:
                     width, height, depth = self._tracerDimsFromShape(data)
 
-        #Load as flattened 1d array
-        #(ravel() returns view rather than copy if possible, flatten() always copies)
-        return self.parent.app.arrayFloat(self.ref, data.ravel(), geomdtype, width, height, depth)
+        flat = _flat(data)
+        _report_copies(self.name, data)
+        return self.parent.app.arrayFloat(self.ref, flat, geomdtype, width, height, depth)
 
     @property
     def data(self):
@@ -996,7 +1066,9 @@ class Object(dict):
         #Use the shape as dims if not provided
         width, height, depth = self._valueDimsFromShape(data)
 
-        self.parent.app.arrayFloat(self.ref, data.ravel(), label, width, height, depth)
+        flat = _flat(data)
+        _report_copies(self.name, data)
+        self.parent.app.arrayFloat(self.ref, flat, label, width, height, depth)
 
     def magnitude(self, data, label="magnitude"):
         """
@@ -1356,7 +1428,7 @@ class Object(dict):
         self.parent.files(*args, obj=self, **kwargs)
         self.parent.app.aobject = None
 
-    def export(self, filepath=None, compress=None):
+    def export(self, filepath=None, compress=None, callback=None):
         """
         Export model and state to a database snapshot
 
@@ -1366,10 +1438,12 @@ class Object(dict):
             Filename to export, defaults to [object name].gldb
         compress : int
             Set flag override default zlib compression of database (0=None, 1=fast, 6=standard, 9=best compression)
+        callback : function
+            Progress callback, see: Viewer.export()
         """
         if filepath is None:
             filepath = '"' + self.name + '.gldb"'
-        self.parent.export(filepath, compress)
+        self.parent.export(filepath, [self.name], compress, callback)
 
     def colourbar(self, **kwargs):
         """
@@ -1632,6 +1706,69 @@ class Object(dict):
     def brightness_contrast_saturation(self, brightness=None, contrast=None, saturation=None):
         return _brightness_contrast_saturation(self)
 
+#Deferred property setting
+class _PropertyBatch(object):
+    """
+    The PropertyBatch class is used internally to collect property changes
+    made within a Viewer.batch() block, they are applied together on exit
+    """
+    def __init__(self, parent):
+        self._parent = weakref.ref(parent)
+        self.depth = 0
+        #Pending properties per target, keyed by object id (None for the viewer)
+        self.targets = {}
+
+    @property
+    def parent(self):
+        return self._parent()
+
+    def _key(self, target):
+        return None if target is None else id(target)
+
+    def _add(self, target, key, value):
+        k = self._key(target)
+        if not k in self.targets:
+            self.targets[k] = (target, [], {})
+        #Keep every assignment in order, as well as the latest values
+        self.targets[k][1].append(key + '=' + _convert_args(value))
+        self.targets[k][2][key] = value
+
+    def _pending(self, target, key):
+        k = self._key(target)
+        return k in self.targets and key in self.targets[k][2]
+
+    def _value(self, target, key):
+        return self.targets[self._key(target)][2][key]
+
+    def _commit(self):
+        #Apply all properties for each target with a single call, then sync once
+        targets = self.targets
+        self.targets = {}
+        for k in targets:
+            target, props, values = targets[k]
+            if target is None:
+                self.parent.app.parseProperties('\n'.join(props))
+            else:
+                self.parent.app.parseProperties('\n'.join(props), target.ref)
+        if len(targets):
+            self.parent._get()
+
+    def __enter__(self):
+        #Only collect properties while inside the with block,
+        #if another batch is already active, changes are collected there
+        if self.depth == 0 and not self.parent._batch:
+            self.parent._batch = self
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.depth -= 1
+        if self.depth == 0:
+            #Changes made before any error are still applied, as when set individually
+            if self.parent._batch is self:
+                self.parent._batch = None
+            self._commit()
+
 #Wrapper dict+list of objects
 class _Objects(dict):
     """  
@@ -1644,27 +1781,32 @@ class _Objects(dict):
     def parent(self):
         return self._parent()
 
-    def _sync(self):
+    def _sync(self, changed=None):
         #Sync the object list with the viewer
+        #(changed: list of object names with modified properties, default all)
         self.list = []
         #Loop through retrieved object list
         for obj in self.parent.state["objects"]:
+            modified = changed is None or obj["name"] in changed
             #Exists in our own list?
             if obj["name"] in self:
                 #Update object with new properties
-                self[obj["name"]]._setprops(obj)
+                if modified:
+                    self[obj["name"]]._setprops(obj)
                 self.list.append(self[obj["name"]])
             else:
                 #Create a new object wrapper
                 o = Object(self.parent, **obj)
                 self[obj["name"]] = o
                 self.list.append(o)
+                modified = True
             #Flag sync
             self[obj["name"]].found = True
             #Save the object id and reference (use id # to get)
             _id = len(self.list)
-            self.list[-1].id = _id
-            self.list[-1].ref = self.parent.app.getObject(_id)
+            if modified or self.list[-1].id != _id:
+                self.list[-1].id = _id
+                self.list[-1].ref = self.parent.app.getObject(_id)
             
         #Delete any objects from stored dict that are no longer present
         for name in list(self):
@@ -2083,14 +2225,17 @@ class _LavaVuWrapper(LavaVuPython.LavaVu):
         self._thread = threaded
         self._q = []
         if threaded:
-            # Create a condition variable to synchronize resource access
+            # Create a condition variable to synchronize thread startup
             self._cv = threading.Condition()
 
             # Create the command queue
             self._q = deque()
 
-            #Safe call return value
-            self._returned = None
+            # Event to wake the render thread when commands are queued
+            self._wake = threading.Event()
+
+            # Time limit (seconds) for processing queued commands before rendering a frame
+            self.queue_time = 0.1
 
             #Thread start
             self._thread = threading.Thread(target=self._thread_run)
@@ -2286,27 +2431,59 @@ class _LavaVuWrapper(LavaVuPython.LavaVu):
         return self._thread_call(getattr(self.viewer, name), wait_return, *args, **kwargs)
 
     def _thread_call(self, method, wait_return, *args, **kwargs):
-        if not self._thread:
+        if not self._thread or threading.current_thread() is self._thread:
             return method(*args, **kwargs)
         """
         This calls a method on the render thread
         All args are placed on the queue, along with the method
 
         if wait_return is True:
-          Wait for the call to be executed with a condition variable lock
-          Returns the saved return data from render thread after woken
+          Wait for the call to be executed, each call has its own Future
+          Returns the result from the render thread when completed
         Otherwise:
           Return immediately
         """
-        #Use the thread queue to pass input args
-        self._q.append([method, wait_return, args, kwargs])
-        #print("THREAD_CALL:",method.__name__,args,kwargs)
         if wait_return:
             #Wait until the call is completed in render thread
-            with self._cv:
-                self._cv.wait()
-            #Return the saved result data
-            return self._returned
+            return self._thread_submit(method, *args, **kwargs).result()
+        #Use the thread queue to pass input args
+        #print("THREAD_CALL:",method.__name__,args,kwargs)
+        self._q.append([method, None, args, kwargs])
+        self._wake.set()
+
+    def _thread_submit(self, method, *args, **kwargs):
+        #Queue a call for the render thread, returns a Future for the result
+        future = concurrent.futures.Future()
+        if not self._thread or threading.current_thread() is self._thread:
+            #No render thread, call immediately
+            try:
+                future.set_result(method(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        self._q.append([method, future, args, kwargs])
+        self._wake.set()
+        return future
+
+    def submit(self, name, *args, **kwargs):
+        """
+        Call a LavaVu method on the render thread without waiting for it to complete
+
+        Parameters
+        ----------
+        name : str
+            Name of the method to call, eg: "imageJPEG"
+        *args, **kwargs :
+            Arguments passed to the method
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Future that receives the return value (or exception) of the call,
+            already completed if not using a render thread
+        """
+        method = getattr(super(_LavaVuWrapper, self), name)
+        return self._thread_submit(method, *args, **kwargs)
 
     def _open(self):
         """
@@ -2379,22 +2556,27 @@ class _LavaVuWrapper(LavaVuPython.LavaVu):
         if not self.viewer: return
 
         #Process commands that must be run on the render thread
-        if len(self._q):
+        #(all queued, up to the time limit, before rendering the frame)
+        start = time.time()
+        while len(self._q):
             #if not self.viewer.isopen or not self.amodel:
             #    print("NOT OPEN!")
             #    print('deferring : ' + self._q[0])
-            method, wait_return, args, kwargs = self._q.popleft()
-            #If set, must return result and notify waiting thread with condition variable
-            if wait_return:
+            method, future, args, kwargs = self._q.popleft()
+            #If set, must return result to waiting thread via the Future
+            if future:
                 #print("CALLING:",method.__name__)
-                self._returned = method(*args, **kwargs)
-                #Notify waiting thread result is ready
-                with self._cv:
-                    self._cv.notify()
-                #print("RETURNED:",type(self._returned))
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(method(*args, **kwargs))
+                    except Exception as e:
+                        future.set_exception(e)
+                #print("RETURNED:",type(future.result()))
             else:
                 method(*args, **kwargs)
             method = None
+            if time.time() - start > self.queue_time:
+                break
 
         #### moderngl_window
         if self.ctx:
@@ -2487,8 +2669,18 @@ class _LavaVuWrapper(LavaVuPython.LavaVu):
         #Render event handling loop
         while self.viewer and not self._closing:
             #Process interactive and timer events
+            delay = self.sleep_time()
+            self._wake.clear()
             self._frame()
-            time.sleep(self.sleep_time())
+            #Sleep until next frame, or until more commands are queued
+            if not len(self._q):
+                self._wake.wait(delay)
+
+        #Cancel any calls still waiting on results
+        while len(self._q):
+            method, future, args, kwargs = self._q.popleft()
+            if future:
+                future.cancel()
 
         self._close()
 
@@ -2641,9 +2833,12 @@ class Viewer(dict):
         begin in interactive mode, opens gui window and passes control to event loop immediately
     hidden : boolean
         begin hidden, for offscreen rendering or web browser control
-    cache : boolean
-        cache all model timesteps in loaded database, everything loaded into memory on startup
+    cache : boolean or str or int
+        True: cache all model timesteps in loaded database, everything loaded into memory on startup
         (assumes enough memory is available)
+        A memory size in bytes or string with units, eg: "4GB": timesteps are kept in memory
+        once loaded, releasing the least recently used when the size is exceeded
+        (sets the "cachesize" property, see also "cachepin" and Viewer.cache_info())
     quality : int
         Render sampling quality, render 2^N times larger image and downsample output
         For anti-aliasing image rendering where GPU multisample anti-aliasing is not available
@@ -2729,6 +2924,13 @@ class Viewer(dict):
         self.app = None
         self._objects = _Objects(self)
         self.state = {}
+        self._version = 0 #State change count at last sync
+        self._state_lock = threading.RLock() #Guards state import/merge
+        self._batch = None #Active property batch
+        self._frames = OrderedDict() #Encoded image cache, most recently used last
+        self._frames_lock = threading.Lock() #Guards _frames, used from server threads
+        self.frame_cache = 0 #Max images in cache, 0 to disable (servers use frame_etag() without it)
+        self._recorder = None #Active pipelined Video recorder
         self._managed = False
         self.server = None
         self._url = ""
@@ -2949,8 +3151,10 @@ class Viewer(dict):
         if hidden:
             args += ["-h"]
         #Timestep cache
-        if cache:
+        if cache is True:
             args += ["-c1"]
+        elif cache:
+            kwargs["cachesize"] = cache
         #Subsample anti-aliasing for image output
         if settings["quality_override"]:
             #Override provided setting with global setting
@@ -2996,6 +3200,8 @@ class Viewer(dict):
     #dict methods
     def __getitem__(self, key):
         #Get view/global property
+        if self._batch and self._batch._pending(None, key):
+            return self._batch._value(None, key)
         self._get()
         if not self.state:
             return None
@@ -3017,6 +3223,9 @@ class Viewer(dict):
         #Set view/global property
         if self.validate and not key in self.properties:
             raise ValueError(key + " : Invalid property name")
+        if self._batch:
+            self._batch._add(None, key, item)
+            return
         self.app.parseProperty(key + '=' + _convert_args(item))
         self._get()
 
@@ -3040,7 +3249,7 @@ class Viewer(dict):
     def __str__(self):
         #View/global props to string
         self._get()
-        properties = self.state["properties"]
+        properties = dict(self.state["properties"])
         properties.update(self.state["views"][0])
         return str('\n'.join(['    %s=%s' % (k,json.dumps(v)) for k,v in properties.items()]))
 
@@ -3203,20 +3412,59 @@ class Viewer(dict):
         self.app.viewer.output_path = value
 
     def _get(self):
-        #Import state from lavavu
-        self.state = _convert_keys(json.loads(self.app.getState()))
-        if not "properties" in self.state:
-            return
-        #Cache the validate flag
-        if "validate" in self.state["properties"]:
-            self.validate = self.state["properties"]["validate"]
-        self._objects._sync()
+        #Import state changes from lavavu
+        #(only the parts changed since the last import are returned,
+        # when the change count is unchanged the cached state is used as is)
+        with self._state_lock:
+            if self._version and self.app.getStateVersion() == self._version:
+                return
+            changes = _convert_keys(json.loads(self.app.getStateChanges(self._version)))
+            if not "version" in changes:
+                self.state = changes
+                self._version = 0
+                return
+            #Merge into a copy, readers without the lock see either the old or the new state
+            state = dict(self.state)
+            if "properties" in changes:
+                state["properties"] = changes["properties"]
+                #Cache the validate flag
+                if "validate" in state["properties"]:
+                    self.validate = state["properties"]["validate"]
+            if "views" in changes:
+                #Unchanged views are returned as null
+                views = state.get("views", [])
+                state["views"] = [v if v is not None else views[i] for i,v in enumerate(changes["views"])]
+            if "colourmaps" in changes:
+                state["colourmaps"] = changes["colourmaps"]
+            if "figure" in changes:
+                state["figure"] = changes["figure"]
+            if "objects" in changes:
+                #Unchanged objects are returned by name only
+                cached = dict([(o["name"], o) for o in state.get("objects", [])])
+                if any(not isinstance(o, dict) and not o in cached for o in changes["objects"]):
+                    #Not in the cached state, import everything
+                    self._version = 0
+                    return self._get()
+                state["objects"] = [o if isinstance(o, dict) else cached[o] for o in changes["objects"]]
+            self.state = state
+            if "objects" in changes:
+                self._objects._sync(set([o["name"] for o in changes["objects"] if isinstance(o, dict)]))
+            #Set last, so the import is only skipped once the cached state is complete
+            self._version = changes["version"]
+
+    def _scene_version(self):
+        #Current change count, increases when the state or data has been modified
+        #(can be used to check if a new frame needs to be rendered)
+        return self.app.getStateVersion()
 
     def _set(self):
         #Export state to lavavu
         #(include current object list state)
         #self.state["objects"] = [obj.dict for obj in self._objects.list]
-        self.app.setState(json.dumps(self.state))
+        with self._state_lock:
+            self.app.setState(json.dumps(self.state))
+            #Cached state was modified, force full import on next sync
+            self._version = 0
 
     def commands(self, cmds, queue=False):
         """
@@ -3554,10 +3802,14 @@ class Viewer(dict):
             obj = self.file(infile, **kwargs)
         return obj
 
-    def export(self, filepath='exported.gldb', objects=None, compress=None):
+    def export(self, filepath='exported.gldb', objects=None, compress=None, callback=None, interval=0.5):
         """
         Export model and state to a database snapshot
 
+        Data is compressed on "writethreads" threads, the compression level can be set
+        per data type or label with the "compressionlevels" property,
+        eg: lv["compressionlevels"] = {"values" : 0}
+
         Parameters
         ----------
         filepath : str
@@ -3566,6 +3818,13 @@ class Viewer(dict):
             List of object names to export
         compress : int
             Set flag override default zlib compression of database (0=None, 1=fast, 6=standard, 9=best compression)
+        callback : function
+            Progress callback, called every interval seconds while writing (from a separate thread)
+            and once on completion with a dict of:
+            active (bool), records (queued), written, bytes (uncompressed), stored (bytes written),
+            seconds (elapsed), throughput (uncompressed bytes per second)
+        interval : float
+            Seconds between progress callbacks
         """
         #Load file with this object selected (import)
         if filepath[0] != '"':
@@ -3579,10 +3838,27 @@ class Viewer(dict):
         if compress is not None and isinstance(compress, int):
             saved = self["compression"]
             self["compression"] = compress
-            self.app.commands("export " + filepath + " " + objlist)
-            self["compression"] = saved
-        else:
-            self.app.commands("export " + filepath + " " + objlist)
+
+        try:
+            if callback is None:
+                self.app.commands("export " + filepath + " " + objlist)
+            else:
+                #Report progress from another thread, export releases the GIL while writing
+                done = threading.Event()
+                def progress():
+                    while not done.wait(interval):
+                        callback(json.loads(self.app.getWriteProgress()))
+                reporter = threading.Thread(target=progress, daemon=True)
+                reporter.start()
+                try:
+                    self.app.submit('exportDatabase', filepath + " " + objlist).result()
+                finally:
+                    done.set()
+                    reporter.join()
+                callback(json.loads(self.app.getWriteProgress()))
+        finally:
+            if compress is not None and isinstance(compress, int):
+                self["compression"] = saved
 
     def colourbar(self, obj=None, **kwargs):
         """
@@ -3803,6 +4079,49 @@ class Viewer(dict):
         """
         return _convert_keys(json.loads(self.app.getTimeSteps()))
 
+    def cache_info(self):
+        """
+        Retrieve time step data cache usage
+
+        Returns
+        -------
+        info : dict
+            steps: time steps in memory, least recently used first,
+            bytes: memory used by cached time step data,
+            limit: "cachesize" in bytes (0 = no limit),
+            hits/misses: time step changes with data already in memory/loaded from the database,
+            evictions: time steps released to stay within the limit,
+            prefetch_hits/prefetch_misses: loads read in the background/read on demand (see "prefetch")
+
+        Example
+        -------
+        Limit time step memory use with a size in units
+
+        >>> import lavavu
+        >>> lv = lavavu.Viewer(cache="4GB")
+        >>> lv.cache_info()["limit"] == 4 * 1024**3
+        True
+        """
+        return _convert_keys(json.loads(self.app.getCacheInfo()))
+
+    def sort_info(self):
+        """
+        Retrieve depth sort timing for benchmarking
+
+        Returns
+        -------
+        info : dict
+            for each sorted geometry type (triangles, points, lines):
+            elements: number of elements in sort array,
+            distances: seconds to calculate eye distances on last sort,
+            path: sort method used on last sort,
+            unchanged/insertion/radix/fallback: count, seconds (total) and last (seconds) for each sort method,
+            incremental sorts start from the previous order: unchanged = already in order,
+            insertion = few elements out of order (see "sortthreshold"), radix = full sort,
+            fallback = full sort after insertion sort exceeded its budget
+        """
+        return _convert_keys(json.loads(self.app.getSortInfo()))
+
     def addstep(self, step=-1, **kwargs):
         """
         Add a new time step
@@ -3816,11 +4135,126 @@ class Viewer(dict):
         """
         self.app.addTimeStep(step, _convert_args(kwargs))
 
+    def load_arrays(self, data):
+        """
+        Load data arrays for multiple objects and time steps in a single pass
+
+        Arrays that are already float32 (uint32 for indices and colours) and
+        C-contiguous are passed to the viewer without copying, shapes are
+        checked once and the time steps are switched once each,
+        instead of per object as when loading with the individual object methods
+
+        Parameters
+        ----------
+        data : dict
+            Data to load, in the form {object: {step: {datatype: array}}}
+            object is an Object or object name, the step level may be omitted
+            to load into the current time step, missing steps are added.
+            datatype can be vertices, normals, vectors, texcoords, indices or colours,
+            other object loader methods (rgb, rgba, luminance, labels) are also accepted,
+            any other name is loaded as a value data set with that label.
+            Instead of the datatype dict, a numpy structured array can be
+            provided with field names as the data types
+
+        Example
+        -------
+
+        >>> import lavavu
+        >>> import numpy
+        >>> lv = lavavu.Viewer()
+        >>> obj = lv.points()
+        >>> verts = numpy.random.rand(2, 100, 3).astype(numpy.float32)
+        >>> lv.load_arrays({obj: {0: {"vertices": verts[0]}, 1: {"vertices": verts[1]}}})
+        >>> lv.timesteps()
+        [0, 1]
+        """
+        vectors = {"vertices" : (LavaVuPython.lucVertexData, 3),
+                   "normals" : (LavaVuPython.lucNormalData, 3),
+                   "vectors" : (LavaVuPython.lucVectorData, 3),
+                   "texcoords" : (LavaVuPython.lucTexCoordData, 2)}
+
+        def datasets(d):
+            #Structured array, field names are the data types
+            if isinstance(d, numpy.ndarray) and d.dtype.names:
+                return dict([(name, d[name]) for name in d.dtype.names])
+            return d
+
+        #Collect the data sets by step (None = current step), validating once
+        steps = {}
+        for o in data:
+            obj = self.objects[o] if isinstance(o, str) else o
+            entry = datasets(data[o])
+            if len(entry) and all([isinstance(k, (int, numpy.integer)) for k in entry]):
+                for step in entry:
+                    steps.setdefault(int(step), []).append((obj, datasets(entry[step])))
+            else:
+                steps.setdefault(None, []).append((obj, entry))
+
+        #Renderer types per object, for dims from vertex shape
+        renderers = {}
+        def dims(obj, arr):
+            if not obj.name in renderers:
+                renderer = obj["renderer"]
+                if ':' in renderer:
+                    renderer = renderer[renderer.index(':')+1:]
+                renderers[obj.name] = renderer
+            renderer = renderers[obj.name]
+            if renderer in self.renderers[LavaVuPython.lucGridType] or renderer in self.renderers[LavaVuPython.lucTriangleType]:
+                return obj._gridDimsFromShape(arr)
+            if renderer in self.renderers[LavaVuPython.lucTracerType]:
+                return obj._tracerDimsFromShape(arr)
+            return 0, 0, 0
+
+        existing = self.timesteps()
+        for step in sorted(steps, key=lambda s: -1 if s is None else s):
+            if step is not None:
+                if step in existing:
+                    self.timestep(step)
+                else:
+                    self.addstep(step)
+            for obj, entry in steps[step]:
+                for key in entry:
+                    arr = entry[key]
+                    if key in vectors:
+                        dtype, D = vectors[key]
+                        arr = numpy.asarray(arr)
+                        if arr.ndim < 2 or arr.shape[-1] != D or numpy.ma.is_masked(arr):
+                            #Not in [N,D] layout, use the standard loader to re-arrange
+                            getattr(obj, key)(arr)
+                            continue
+                        #No copy if already float32 and contiguous
+                        arr = numpy.ascontiguousarray(arr, dtype=numpy.float32)
+                        width, height, depth = dims(obj, arr) if key == "vertices" else (0, 0, 0)
+                        self.app.arrayFloat(obj.ref, arr.ravel(), dtype, width, height, depth)
+                    elif key == "indices":
+                        arr = numpy.ascontiguousarray(arr, dtype=numpy.uint32)
+                        self.app.arrayUInt(obj.ref, arr.ravel(), LavaVuPython.lucIndexData, 0, 0, 0)
+                    elif key == "colours" and isinstance(arr, numpy.ndarray) and arr.dtype == numpy.uint32:
+                        arr = numpy.ascontiguousarray(arr)
+                        self.app.arrayUInt(obj.ref, arr.ravel(), LavaVuPython.lucRGBAData, 0, 0, 0)
+                    elif key in ["colours", "rgb", "rgba", "luminance", "labels"]:
+                        getattr(obj, key)(arr)
+                    else:
+                        #Value data
+                        arr = numpy.asarray(arr)
+                        if numpy.ma.is_masked(arr):
+                            obj.values(arr, key)
+                            continue
+                        arr = numpy.ascontiguousarray(arr, dtype=numpy.float32)
+                        width, height, depth = obj._valueDimsFromShape(arr)
+                        self.app.arrayFloat(obj.ref, arr.ravel(), key, width, height, depth)
+
     def render(self):
         """        
         Render a new frame, explicit display update
+
+        If a pipelined video is recording (see: video(pipeline=N)), the frame is
+        rendered into the video instead of the window
         """
-        self.app.render()
+        if self._recorder:
+            self._recorder.capture()
+        else:
+            self.app.render()
 
     def init(self):
         """        
@@ -3877,6 +4311,18 @@ class Viewer(dict):
             return self.app.image(filename, 0, 0, quality, transparent)
         return self.app.image(filename, resolution[0], resolution[1], quality, transparent)
 
+    async def image_async(self, filename="", resolution=None, transparent=False, quality=95):
+        """
+        Awaitable version of image(), the render thread is not waited on
+        so other tasks can continue and multiple images can be requested at once
+
+        See: image()
+        """
+        if resolution is None:
+            resolution = (0, 0)
+        future = self.app.submit('image', filename, resolution[0], resolution[1], quality, transparent)
+        return await asyncio.wrap_future(future)
+
     def _getres(self, resolution):
         #Use viewer default if none provided
         if not resolution or len(resolution) < 2 or resolution[0] <= 0:
@@ -3925,8 +4371,20 @@ class Viewer(dict):
             encoded image as byte array
         """
         #Jpeg encoded frame data
-        resolution = self._getres(resolution)
-        return bytearray(self.app.imageJPEG(resolution[0], resolution[1], quality))
+        return bytearray(self._image_data('jpeg', resolution, quality))
+
+    async def jpeg_async(self, resolution=None, quality=90):
+        """
+        Awaitable version of jpeg(), the render thread is not waited on
+        so other tasks can continue and multiple images can be requested at once
+
+        See: jpeg()
+        """
+        key, data = self._cached_frame('jpeg', resolution, quality)
+        if data is None:
+            future = self.app.submit('imageJPEG', key[1][0], key[1][1], quality)
+            data = self._cache_frame(key, await asyncio.wrap_future(future))
+        return bytearray(data)
 
     def png(self, resolution=None):
         """
@@ -3943,8 +4401,80 @@ class Viewer(dict):
             encoded image as byte array
         """
         #PNG encoded frame data
-        resolution = self._getres(resolution)
-        return bytearray(self.app.imagePNG(resolution[0], resolution[1]))
+        return bytearray(self._image_data('png', resolution))
+
+    async def png_async(self, resolution=None):
+        """
+        Awaitable version of png(), the render thread is not waited on
+        so other tasks can continue and multiple images can be requested at once
+
+        See: png()
+        """
+        key, data = self._cached_frame('png', resolution)
+        if data is None:
+            future = self.app.submit('imagePNG', key[1][0], key[1][1])
+            data = self._cache_frame(key, await asyncio.wrap_future(future))
+        return bytearray(data)
+
+    def _frame_key(self, fmt, resolution=None, quality=0):
+        #Identifies the image that would be returned for the current state
+        return (self._scene_version(), tuple(self._getres(resolution)), quality, fmt)
+
+    def frame_etag(self, fmt='jpeg', resolution=None, quality=90):
+        """
+        Get an entity tag for the image jpeg() or png() would return,
+        changes whenever the viewer state, data or image settings change,
+        used by the servers to reply "304 Not Modified" without rendering
+
+        Parameters
+        ----------
+        fmt : str
+            Image format, 'jpeg' or 'png'
+        resolution : list or tuple
+            Image resolution in pixels [x,y]
+        quality : int
+            Quality for JPEG image compression, default 90%
+
+        Returns
+        -------
+        etag : str
+            quoted tag string for an HTTP ETag header
+        """
+        if fmt == 'png': quality = 0
+        return '"%d-%dx%d-%d-%s"' % self._frame_key(fmt, resolution, quality)
+
+    def _cached_frame(self, fmt, resolution=None, quality=0):
+        #Returns cache key and the previously encoded image data if nothing
+        #has changed since it was created, or None if it must be rendered
+        key = self._frame_key(fmt, resolution, quality)
+        with self._frames_lock:
+            data = self._frames.get(key)
+            if data is not None:
+                self._frames.move_to_end(key)
+        return key, data
+
+    def _cache_frame(self, key, data):
+        #Store encoded image, keyed on the state after rendering
+        #(the first render may update the view, eg: bounding box)
+        data = bytes(data)
+        if self.frame_cache > 0:
+            key = (self._scene_version(),) + key[1:]
+            with self._frames_lock:
+                self._frames[key] = data
+                while len(self._frames) > self.frame_cache:
+                    self._frames.popitem(last=False)
+        return data
+
+    def _image_data(self, fmt, resolution=None, quality=0):
+        #Get encoded image data from cache or by rendering
+        key, data = self._cached_frame(fmt, resolution, quality)
+        if data is None:
+            if fmt == 'png':
+                data = self.app.imagePNG(key[1][0], key[1][1])
+            else:
+                data = self.app.imageJPEG(key[1][0], key[1][1], quality)
+            data = self._cache_frame(key, data)
+        return data
 
     def display(self, resolution=(0,0), transparent=False, filename="*"):
         """        
@@ -4128,7 +4658,7 @@ class Viewer(dict):
         from IPython.display import display,HTML,Javascript
         display(Javascript(js + code))
 
-    def video(self, filename="", fps=30, quality=1, resolution=(0,0), **kwargs):
+    def video(self, filename="", fps=30, quality=1, resolution=(0,0), pipeline=0, **kwargs):
         """
         Record and show the generated video inline within an ipython notebook.
 
@@ -4152,6 +4682,9 @@ class Viewer(dict):
             encoding artifacts at cost of larger file size
         resolution : list or tuple
             Video resolution in pixels [x,y]
+        pipeline : int
+            Frames to queue for encoding on a separate thread, default 0 encodes in the render loop,
+            see: Video
         **kwargs :
             Any additional keyword args will be passed to lavavu.player()
 
@@ -4160,7 +4693,7 @@ class Viewer(dict):
         recorder : Video(object)
             Context manager object that controls the video recording
         """
-        return Video(self, filename, resolution, fps, quality, **kwargs)
+        return Video(self, filename, resolution, fps, quality, pipeline, **kwargs)
 
     def video_steps(self, filename="", start=0, end=0, fps=10, quality=1, resolution=(0,0), **kwargs):
         """
@@ -4219,6 +4752,17 @@ class Viewer(dict):
         self.app.imageBuffer(img.data)
         return img
 
+    async def rawimage_async(self, resolution=(640, 480), channels=3):
+        """
+        Awaitable version of rawimage(), the render thread is not waited on
+        so other tasks can continue and multiple images can be requested at once
+
+        See: rawimage()
+        """
+        img = Image(resolution, channels)
+        await asyncio.wrap_future(self.app.submit('imageBuffer', img.data))
+        return img
+
     def loadimage(self, filename):
         """
         Return raw image data from file
@@ -4449,8 +4993,10 @@ class Viewer(dict):
         view : str
             json string containing saved view settings
         """
-        self.state["views"][0] = _convert_keys(json.loads(view))
-        #self._set() #? sync
+        with self._state_lock:
+            self.state["views"][0] = _convert_keys(json.loads(view))
+            #self._set() #? sync
+            self._version = 0
 
     def events(self):
         """
@@ -4642,7 +5188,7 @@ class Viewer(dict):
     def isosurface(self, dstref, srcref, properties, clearvol):
         return self.app.isoSurface(dstref, srcref, properties, clearvol)
 
-    def get_all_vertices(self, objectlist=None, values=None):
+    def get_all_vertices(self, objectlist=None, values=None, memmap=None):
         """
         Extract all vertex data from a list of objects
 
@@ -4652,6 +5198,10 @@ class Viewer(dict):
             List of objects, defaults to all
         values : str
             Optional label of a value data set to collect alongside the vertices
+        memmap : str or bool
+            Optional, return memory mapped arrays instead of loading into memory,
+            for very large outputs. Pass a filename to write the vertices to
+            (values are written to filename + '.values') or True to use temporary files
 
         Returns
         -------
@@ -4665,24 +5215,46 @@ class Viewer(dict):
         #Get vertices from a list of lavavu objects
         if objectlist is None:
             objectlist = self.objects.list
-        pverts = None
-        pvals = None
+        objectlist = [self.objects[o] if isinstance(o, str) else o for o in objectlist]
+
+        #Collect views of all element data and bounding boxes in one pass
+        vlist = []
+        plist = []
+        bbs = []
+        for obj in objectlist:
+            bbs.append(obj.boundingbox(True))
+            data = obj.data
+            vlist += data.vertices
+            if values:
+                plist += data[values]
+        bbs = numpy.array(bbs, dtype=numpy.float64).reshape((-1,2,3))
         bb_all = [[float('Inf'), float('Inf'), float('Inf')], [float('-Inf'), float('-Inf'), float('-Inf')]]
-        for o in objectlist:
-            #Concatenate all elements
-            bb = self.objects[o].boundingbox(True)
-            for i in range(3):
-                if bb[0][i] < bb_all[0][i]: bb_all[0][i] = bb[0][i]
-                if bb[1][i] > bb_all[1][i]: bb_all[1][i] = bb[1][i]
-
-            for v in range(len(self.objects[o].data.vertices)):
-                verts = self.objects[o].data.vertices[v]
-                pverts = verts if pverts is None else numpy.concatenate([pverts, verts])
-                if values:
-                    vals = self.objects[o].data[values][v]
-                    pvals = vals if pvals is None else numpy.concatenate([pvals, vals])
+        if len(bbs):
+            bb_all = [bbs[:,0].min(axis=0).tolist(), bbs[:,1].max(axis=0).tolist()]
+
+        def allocate(arrays, suffix=''):
+            #Single output array for all elements, filled slice by slice
+            arrays = [a for a in arrays if a is not None and len(a)]
+            if not len(arrays):
+                return None
+            shape = (sum([len(a) for a in arrays]),) + arrays[0].shape[1:]
+            if memmap:
+                if isinstance(memmap, str):
+                    out = numpy.memmap(memmap + suffix, dtype=arrays[0].dtype, mode='w+', shape=shape)
+                else:
+                    import tempfile
+                    out = numpy.memmap(tempfile.TemporaryFile(), dtype=arrays[0].dtype, mode='w+', shape=shape)
+            else:
+                out = numpy.empty(shape, dtype=arrays[0].dtype)
+            offset = 0
+            for a in arrays:
+                out[offset:offset+len(a)] = a
+                offset += len(a)
+            return out
+
+        pverts = allocate(vlist)
         if values:
-            return pverts, bb_all, pvals
+            return pverts, bb_all, allocate(plist, '.values')
         else:
             return pverts, bb_all
 
@@ -4757,17 +5329,48 @@ class Viewer(dict):
         **kwargs :
             key=value property names and values to set
         """
-        if objects is None:
-            for key in kwargs:
-                self[key] = kwargs[key]
-        else:
-            for o in objects:
-                if isinstance(o, str):
-                    obj = self.objects[o]
-                else:
-                    obj = o
+        with self.batch():
+            if objects is None:
                 for key in kwargs:
-                    obj[key] = kwargs[key]
+                    self[key] = kwargs[key]
+            else:
+                for o in objects:
+                    if isinstance(o, str):
+                        obj = self.objects[o]
+                    else:
+                        obj = o
+                    for key in kwargs:
+                        obj[key] = kwargs[key]
+
+    def batch(self):
+        """
+        Batch property changes on the viewer and its objects
+
+        Returns a context manager, properties set on the viewer or any object
+        inside the with block are collected and applied together with a single
+        call per object when the block exits, instead of one call and a full
+        state sync per property. Results are the same as setting them individually.
+
+        Example
+        -------
+
+        >>> import lavavu
+        >>> lv = lavavu.Viewer()
+        >>> obj = lv.points()
+        >>> with lv.batch():
+        ...     obj["pointsize"] = 5
+        ...     obj["opacity"] = 0.5
+        ...     lv["background"] = "black"
+
+        Returns
+        -------
+        batch : context manager
+            Use in a with statement, blocks may be nested
+        """
+        #Nested blocks share the active batch
+        if self._batch:
+            return self._batch
+        return _PropertyBatch(self)
 
     def set_uniforms(self, objects=None, **kwargs):
         """
@@ -4892,13 +5495,12 @@ class Geometry(list):
             #By default all elements are returned, even if object has multiple types 
             #Filter can be set to a type name to exclude other geometry types
             if filter is None or g.type == self.obj.parent._getRendererType(filter):
-                g = DrawData(g, obj)
-                self.append(g)
-                #Add the value data set labels
-                for s in sets:
-                    g.available[s] = g.get(s).shape
+                #(available data, including the value data set labels, is found on first access)
+                self.append(DrawData(g, obj, sets))
 
         #Allows getting data by data type or value labels using Descriptors
+        #(table of attribute name => (data type or label, copy), looked up per instance)
+        labels = {}
         #Data by type name
         for key in datatypes:
             typename = key
@@ -4907,13 +5509,41 @@ class Geometry(list):
                 if len(sets) == 0: continue
                 typename = list(sets.keys())[0]
             #Access by type name to get a view
-            setattr(Geometry, key, _GeomDataListView(self.obj, self.timestep, typename))
+            labels[key] = (typename, False)
             #Access by type name + _copy to get a copy
-            setattr(Geometry, key + '_copy', _GeomDataListView(self.obj, self.timestep, typename, copy=True))
+            labels[key + '_copy'] = (typename, True)
 
         #Data by label
         for key in sets:
-            setattr(Geometry, key, _GeomDataListView(self.obj, self.timestep, key))
+            labels[key] = (key, False)
+        self._labels = labels
+
+    def _view(self, attr):
+        #Get the descriptor for a data type/label attribute
+        labels = self.__dict__.get('_labels', {})
+        if attr in labels:
+            typename, copy = labels[attr]
+            return _GeomDataListView(self.obj, self.timestep, typename, copy)
+        return None
+
+    def __getattr__(self, attr):
+        #Data by type name or label
+        view = self._view(attr)
+        if view is None:
+            raise AttributeError(attr)
+        return view.__get__(self, Geometry)
+
+    def __setattr__(self, attr, value):
+        #Data by type name or label
+        view = self._view(attr)
+        if view is None:
+            super(Geometry, self).__setattr__(attr, value)
+        else:
+            view.__set__(self, value)
+
+    def __dir__(self):
+        #Include the data type/label attributes for tab completion
+        return sorted(set(super(Geometry, self).__dir__()) | set(self.__dict__.get('_labels', {})))
 
     def __getitem__(self, key):
         if isinstance(key, str):
@@ -5028,21 +5658,54 @@ class DrawData(object):
     [array([4., 5.], dtype=float32)]
 
     """
-    def __init__(self, data, obj):
+    def __init__(self, data, obj, sets=None):
         self.data = data
         self._obj = obj
         self._parent = weakref.ref(obj.parent)
-        self.available = {}
-        #Get available data types
-        for key in datatypes:
-            dat = self.get(key)
-            if len(dat):
-                self.available[key] = dat.shape
+        self._sets = sets
+        #Cached array views and shape info, valid while the data version is unchanged
+        self._version = None
+        self._dimsprop = None
+        self._dims = None
+        self._views = {}
+        self._available = None
 
     @property
     def parent(self):
         return self._parent()
 
+    @property
+    def available(self):
+        """
+        available : dict
+            Shapes of the data sets available in this element, by data type or value label
+        """
+        self._validate()
+        if self._available is None:
+            self._available = {}
+            #Get available data types
+            for key in datatypes:
+                dat = self.get(key)
+                if len(dat):
+                    self._available[key] = dat.shape
+            #Add the value data set labels
+            if self._sets is None:
+                self._sets = self._obj.datasets
+            for s in self._sets:
+                self._available[s] = self.get(s).shape
+        return self._available
+
+    def _validate(self):
+        #Clear cached views if data modified or object dims changed
+        version = self.data.version
+        dimsprop = self._obj.dict.get("dims")
+        if version != self._version or dimsprop != self._dimsprop:
+            self._version = version
+            self._dimsprop = copy.copy(dimsprop)
+            self._dims = None
+            self._views = {}
+            self._available = None
+
     @property
     def type(self):
         return geomnames[self.data.type]
@@ -5083,20 +5746,28 @@ class DrawData(object):
         data : array
             Numpy array view of the data set requested
         """
+        #Return the cached view if data unchanged
+        self._validate()
+        if typename in self._views:
+            return self._views[typename]
+
         array = None
         #Attempt to return an array with the correct shape
-        dims = [0.,0.,0.]
-        if "dims" in self._obj.dict:
-            dims = self._obj.dict["dims"]
-            if isinstance(dims, list) or isinstance(dims, tuple):
-                dims = dims[::-1] #Reversed
-            else:
-                dims = [dims] #Scalar to list
-        if self.data.width > 1:
-            #print("OBJECT W,H,D: ",self.data.width, self.data.height, self.data.depth)
-            #dims = [self.data.depth, self.data.height, self.data.width]
-            dims = [self.data.width, self.data.height, self.data.depth]
-        #print("FINALDIMS",self._obj["dims"],dims)
+        if self._dims is None:
+            dims = [0.,0.,0.]
+            if self._dimsprop is not None:
+                dims = self._dimsprop
+                if isinstance(dims, list) or isinstance(dims, tuple):
+                    dims = dims[::-1] #Reversed
+                else:
+                    dims = [dims] #Scalar to list
+            if self.data.width > 1:
+                #print("OBJECT W,H,D: ",self.data.width, self.data.height, self.data.depth)
+                #dims = [self.data.depth, self.data.height, self.data.width]
+                dims = [self.data.width, self.data.height, self.data.depth]
+            #print("FINALDIMS",self._obj["dims"],dims)
+            self._dims = list(dims)
+        dims = list(self._dims)
 
         if typename in datatypes and typename != 'values':
             dims += [dimensions[typename]]
@@ -5144,7 +5815,8 @@ class DrawData(object):
                     #Didn't work out, just reshape to element size
                     array = array.reshape((-1, dims[-1]))
             #print(typename,"DIMS:",dims,"SHAPE:",array.shape)
-        
+
+        self._views[typename] = array
         return array
 
     def copy(self, typename):
@@ -5315,7 +5987,7 @@ class Video(object):
     ...         lv.rotate('y', 10) # doctest: +SKIP
     ...         lv.render()        # doctest: +SKIP
     """
-    def __init__(self, viewer=None, filename="", resolution=(0,0), framerate=30, quality=1, **kwargs):
+    def __init__(self, viewer=None, filename="", resolution=(0,0), framerate=30, quality=1, pipeline=0, **kwargs):
         """
         Record and show the generated video inline within an ipython notebook.
 
@@ -5339,6 +6011,13 @@ class Video(object):
             encoding artifacts at cost of larger file size
         resolution : list or tuple
             Video resolution in pixels [x,y]
+        pipeline : int
+            Maximum number of frames queued for encoding, if > 0 frames are converted and encoded
+            on a worker thread while new frames are rendered/written, so the frame rate is
+            limited by the slower of the two rather than the sum of both.
+            When recording from a viewer, each viewer.render() call renders the frame directly
+            into a reusable buffer for the encoder.
+            Default 0 encodes each frame as it is rendered/written
         **kwargs :
             Any additional keyword args will be passed to lavavu.player()
         """
@@ -5347,9 +6026,11 @@ class Video(object):
         self.quality = quality
         self.viewer = viewer
         self.filename = filename
+        self.pipeline = pipeline
         self.kwargs = kwargs
-        if not viewer:
-            self.encoder = LavaVuPython.VideoEncoder(filename, framerate, quality);
+        self._worker = None
+        if not viewer or pipeline > 0:
+            self.encoder = LavaVuPython.VideoEncoder(filename or "video", framerate, quality);
         else:
             self.encoder = None
 
@@ -5358,9 +6039,18 @@ class Video(object):
         Start recording, all rendered frames will be added to the video
         """
         if self.encoder:
-            if self.resolution[0] <= 0: self.resolution[0] = 1280
-            if self.resolution[1] <= 0: self.resolution[1] = 720
+            if self.viewer:
+                self.resolution = list(self.viewer._getres(self.resolution))
+            else:
+                self.resolution = list(self.resolution)
+                if self.resolution[0] <= 0: self.resolution[0] = 1280
+                if self.resolution[1] <= 0: self.resolution[1] = 720
             self.encoder.open(self.resolution[0], self.resolution[1])
+            self.filename = self.encoder.filename
+            if self.pipeline > 0:
+                self._start_worker()
+                if self.viewer:
+                    self.viewer._recorder = self
         else:
             self.filename = self.viewer.app.encodeVideo(self.filename, self.framerate, self.quality, self.resolution[0], self.resolution[1])
         #Clear existing image frames
@@ -5368,11 +6058,94 @@ class Video(object):
             for f in glob.glob(self.filename + "/frame_*.jpg"):
                 os.remove(f)
 
+    def _start_worker(self):
+        #Frames waiting to be encoded, with a pool of reusable frame buffers,
+        #allows one frame being filled and one being encoded outside the queue
+        self._queue = queue.Queue(self.pipeline)
+        self._free = queue.Queue()
+        self._buffers = self.pipeline + 2
+        self._error = None
+        self._worker = threading.Thread(target=self._encode_frames, daemon=True)
+        self._worker.start()
+
+    def _stop_worker(self):
+        self._queue.put(None)
+        self._worker.join()
+        self._worker = None
+        if self.viewer and self.viewer._recorder is self:
+            self.viewer._recorder = None
+        self._check()
+
+    def _check(self):
+        #Raise any error from the encoder thread in the calling thread
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _buffer(self, shape):
+        #Get a free frame buffer, waits for the encoder when all are in use
+        try:
+            buf = self._free.get_nowait()
+        except (queue.Empty) as e:
+            if self._buffers > 0:
+                self._buffers -= 1
+                buf = None
+            else:
+                buf = self._free.get()
+        if buf is None or buf.shape != shape:
+            buf = numpy.empty(shape, dtype=numpy.uint8)
+        return buf
+
+    def _encode(self, image):
+        #Encode a frame, converting to contiguous RGB in a reused buffer if required
+        if image.ndim == 3 and image.shape[2] == 4:
+            if getattr(self, '_rgb', None) is None or self._rgb.shape[:2] != image.shape[:2]:
+                self._rgb = numpy.empty(image.shape[:2] + (3,), dtype=numpy.uint8)
+            numpy.copyto(self._rgb, image[:,:,:3]) #Remove alpha channel
+            image = self._rgb
+        self.encoder.copyframe(image.reshape(-1))
+
+    def _encode_frames(self):
+        #Encoder thread, runs until the None frame is queued
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            buf, future = item
+            try:
+                if future is not None:
+                    #Wait for the frame to be rendered
+                    future.result()
+                if self._error is None:
+                    self._encode(buf)
+            except (Exception) as e:
+                self._error = e
+            self._free.put(buf)
+
+    def capture(self):
+        """
+        Render a frame from the viewer into the video (pipelined recording only)
+
+        This is called by viewer.render() while recording, the frame is rendered
+        into a free buffer on the render thread and queued for the encoder thread
+        without waiting for it to complete
+        """
+        self._check()
+        buf = self._buffer((self.resolution[1], self.resolution[0], 3))
+        future = self.viewer.app.submit('imageBuffer', buf)
+        self._queue.put((buf, future))
+
     def pause(self):
         """
         Pause/resume recording, no rendered frames will be added to the video while paused
         """
-        if self.encoder:
+        if self._worker and self.viewer:
+            #Viewer renders to the window while paused
+            if self.viewer._recorder is self:
+                self.viewer._recorder = None
+            else:
+                self.viewer._recorder = self
+        elif self.encoder:
             self.encoder.render = not self.encoder.render
         else:
             self.viewer.app.pauseVideo()
@@ -5382,11 +6155,16 @@ class Video(object):
         Stop recording, final frames will be written and file closed, ready to play. 
         No further frames will be added to the video
         """
-        if self.encoder:
-            self.encoder.close()
-            self.filename = self.encoder.filename
-        else:
-            self.viewer.app.encodeVideo()
+        try:
+            if self._worker:
+                #Encode any queued frames
+                self._stop_worker()
+        finally:
+            if self.encoder:
+                self.encoder.close()
+                self.filename = self.encoder.filename
+            else:
+                self.viewer.app.encodeVideo()
         #Check if encoded video is a directory (not built with video encoding support)
         #if so attempt to encode with ffmpeg
         if os.path.isdir(self.filename):
@@ -5409,6 +6187,9 @@ class Video(object):
         """
         Add a frame to the video (when writing custom video frames rather than rendering them within lavavu)
 
+        When pipelined, the frame is copied and queued for the encoder thread,
+        so the passed array can be reused for the next frame immediately
+
         Parameters
         ----------
         image : list or array or Image
@@ -5420,10 +6201,18 @@ class Video(object):
                 image = image.data
             else:
                 image = _convert(image, numpy.uint8)
-            if image.size == self.resolution[0] * self.resolution[1] * 4:
-                image = image.reshape(self.resolution[0], self.resolution[1], 4)
-                image = image[::,::,:3] #Remove alpha channel
-            self.encoder.copyframe(image.ravel())
+            w, h = self.resolution[0], self.resolution[1]
+            if image.size == w * h * 4:
+                image = image.reshape(h, w, 4)
+            elif image.size == w * h * 3:
+                image = image.reshape(h, w, 3)
+            if self._worker:
+                self._check()
+                buf = self._buffer(image.shape)
+                numpy.copyto(buf, image)
+                self._queue.put((buf, None))
+            else:
+                self._encode(image)
 
     def play(self):
         """
@@ -5444,6 +6233,30 @@ class Video(object):
             print('Recording failed: ', exc_value)
         return True
 
+def _blend_over(dst, src, premultiplied=False):
+    """
+    Alpha blend uint8 RGBA image src over dst in place ("over" operator),
+    all channels at once with 16 bit integer arithmetic, no float copies
+    """
+    sa = src[:,:,3:4].astype(numpy.uint16)
+    da = dst[:,:,3:4].astype(numpy.uint16)
+    #Destination alpha remaining under the source
+    ia = 255 - sa
+    if premultiplied:
+        rgb = src[:,:,0:3] + (dst[:,:,0:3] * ia + 127) // 255
+        dst[:,:,0:3] = numpy.minimum(rgb, 255)
+        dst[:,:,3:4] = sa + (da * ia + 127) // 255
+    else:
+        #Premultiply, blend, then divide by the output alpha
+        #(max value 255 * outalpha, always fits in 16 bits)
+        da = (da * ia + 127) // 255
+        outalpha = sa + da
+        rgb = src[:,:,0:3] * sa + dst[:,:,0:3] * da
+        rgb += outalpha // 2
+        rgb //= numpy.maximum(outalpha, 1)
+        dst[:,:,0:3] = rgb
+        dst[:,:,3:4] = outalpha
+
 #Wrapper class for raw image data
 class Image(object):
     """  
@@ -5514,13 +6327,13 @@ class Image(object):
                 source = source[:,:,:N]
             elif self.data.shape[2] == 4 and source.shape[2] == 3:
                 #Add alpha channel
-                source = numpy.dstack((source, numpy.full(source.shape[:-1], 255)))
+                source = numpy.dstack((source, numpy.full(source.shape[:-1], 255, dtype=source.dtype)))
             elif self.data.shape[2] == 3 and source.shape[2] == 1:
                 #Greyscale to RGB
                 source = numpy.dstack((source, source, source))
             elif self.data.shape[2] == 4 and source.shape[2] == 1:
                 #Greyscale to RGBA
-                source = numpy.dstack((source, source, source, numpy.full(source.shape[:-1], 255)))
+                source = numpy.dstack((source, source, source, numpy.full(source.shape[:-1], 255, dtype=source.dtype)))
             elif self.data.shape[2] == 3 and source.shape[2] == 2:
                 #Greyscale+Alpha to RGB
                 L = source[:,:,0]
@@ -5534,26 +6347,15 @@ class Image(object):
                 print("Base image and source image have incompatible bit depth!" + str(self.data.shape[2]) + " < " + str(source.shape[2]))
         return source
 
-    def paste(self, source, resolution=None, position=(0,0)):
-        """
-        Render another image to a specified position with this image
-
-        Parameters
-        ----------
-        source : array or lavavu.Viewer
-            Numpy array containing raw image data to paste or a Viewer instance to source the frame from
-        resolution : tuple(int,int)
-            Sub-image width and height in pixels, if not provided and source is a numpy array will get dimensions from shape,
-            otherwise will use default viewer dimensions
-        position : tuple(int,int)
-            Sub-image x,y offset in pixels
-
-        """
+    def _source(self, source, resolution=None):
+        #Get raw image data from an array, Image, PIL image or Viewer
+        if isinstance(source, Image):
+            return source.data
         try:
             #Get array from PIL images
             from PIL import Image as PILImage
             if isinstance(source, PILImage.Image):
-                source = numpy.array(source)
+                return numpy.array(source)
         except (ImportError) as e:
             pass
 
@@ -5561,7 +6363,11 @@ class Image(object):
         if not isinstance(source, numpy.ndarray):
             if not resolution: resolution = source.resolution
             source = source.rawimage(resolution, self.data.shape[2]).data
+        return source
 
+    def _region(self, source, position):
+        #Crop the source to fit and convert to the same pixel format,
+        #returns the source and the destination region of this image
         resolution = (source.shape[1], source.shape[0])
         dest = (resolution[0] + position[0], resolution[1] + position[1])
 
@@ -5577,58 +6383,91 @@ class Image(object):
             source = self.convert(source)
         if self.data.shape[2] != source.shape[2]:
             raise ValueError("Base image and pasted image have incompatible bit depth!" + str(self.data.shape[2]) + " < " + str(source.shape[2]))
-        
-        self.data[position[1]:dest[1], position[0]:dest[0]] = source
 
-    def blend(self, source, resolution=None, position=(0,0)):
+        return source, self.data[position[1]:dest[1], position[0]:dest[0]]
+
+    def paste(self, source, resolution=None, position=(0,0)):
         """
-        Render another image to a specified position with this image with alpha blending
+        Render another image to a specified position with this image
 
         Parameters
         ----------
         source : array or lavavu.Viewer
             Numpy array containing raw image data to paste or a Viewer instance to source the frame from
         resolution : tuple(int,int)
-            Sub-image width and height in pixels, if not provided source must be a numpy array of the correct dimensions
+            Sub-image width and height in pixels, if not provided and source is a numpy array will get dimensions from shape,
+            otherwise will use default viewer dimensions
         position : tuple(int,int)
             Sub-image x,y offset in pixels
 
         """
-        if not isinstance(source, numpy.ndarray):
-            source = source.rawimage(resolution, self.data.shape[2]).data
+        source = self._source(source, resolution)
+        source, dst = self._region(source, position)
+        dst[...] = source
 
+    def blend(self, source, resolution=None, position=(0,0), premultiplied=False):
+        """
+        Render another image to a specified position with this image with alpha blending
+
+        Parameters
+        ----------
+        source : array or lavavu.Viewer
+            Numpy array containing raw image data to paste or a Viewer instance to source the frame from
+        resolution : tuple(int,int)
+            Sub-image width and height in pixels, if not provided and source is a numpy array will get dimensions from shape,
+            otherwise will use default viewer dimensions
+        position : tuple(int,int)
+            Sub-image x,y offset in pixels
+        premultiplied : bool
+            Set if the colour values have been premultiplied by alpha, default False
+
+        """
         channels = self.data.shape[2]
         if channels < 4:
             print("Require alpha channel to blend")
             return
 
-        if len(source.shape) == 3:
-            if resolution is None:
-                resolution = (source.shape[1], source.shape[0])
-
-            if self.data.shape[2] != source.shape[2]:
-                #Attempt conversion
-                source = self.convert(source)
-
-        #Alpha blending, assumes not premultiplied alpha
-        src = source.astype(numpy.float32)
-        dst = self.data[position[1]:resolution[1] + position[1], position[0]:resolution[0] + position[0]].astype(numpy.float32)
-        srcalpha = src[:, :, 3] / 255.0
-        dstalpha = dst[:, :, 3] / 255.0
-        outalpha = srcalpha + dstalpha * (1.0 - srcalpha)
-        #Ignore divide by zero if outalpha is zero
-        with numpy.errstate(divide='ignore',invalid='ignore'):
-            for c in range(3):
-                #Premultiplied blend:
-                #dst[:, :, c] = src[:, :, c] + dst[:, :, c] * (1.0 - srcalpha)
-                #Not premultiplied: premultiply, then blend
-                src[:, :, c] *= srcalpha
-                dst[:, :, c] *= dstalpha
-                dst[:, :, c] = (src[:, :, c] + dst[:, :, c] * (1.0 - srcalpha)) / outalpha
-        dst[:, :, 3] = outalpha * 255
-
-        self.paste(dst, resolution, position)
-        #self.data[position[1]:dest[0], position[0]:dest[1]] = dst
+        source = self._source(source, resolution)
+        source, dst = self._region(source, position)
+        _blend_over(dst, source, premultiplied)
+
+    def composite(self, layers, resolution=None, premultiplied=False):
+        """
+        Alpha blend a list of layers over this image, in order, bottom layer first
+
+        Any Viewer layers are rendered concurrently before blending (see: grab()),
+        each layer is then blended directly into this image
+
+        Parameters
+        ----------
+        layers : list
+            Layers to composite, each a numpy array, Image or Viewer,
+            or a tuple of (layer, position) to place at an x,y offset in pixels
+        resolution : tuple(int,int)
+            Resolution for Viewer layers, default is each viewer's output resolution
+        premultiplied : bool
+            Set if the colour values have been premultiplied by alpha, default False
+
+        Example
+        -------
+        Build a 2x2 panel frame from four viewers
+
+        >>> import lavavu
+        >>> viewers = [lavavu.Viewer() for i in range(4)]            # doctest: +SKIP
+        >>> frame = lavavu.Image((1280, 960), value=[0, 0, 0, 255])  # doctest: +SKIP
+        >>> layers = [(lv, (640 * (i % 2), 480 * (i // 2))) for i,lv in enumerate(viewers)] # doctest: +SKIP
+        >>> frame.composite(layers, resolution=(640, 480))           # doctest: +SKIP
+        """
+        layers = [l if isinstance(l, tuple) else (l, (0,0)) for l in layers]
+        viewers = [l[0] for l in layers if isinstance(l[0], Viewer)]
+        frames = dict(zip([id(v) for v in viewers], grab(viewers, resolution, self.data.shape[2])))
+        for source, position in layers:
+            if isinstance(source, Viewer):
+                source = frames[id(source)]
+            if self.data.shape[2] < 4:
+                self.paste(source, position=position)
+            else:
+                self.blend(source, position=position, premultiplied=premultiplied)
 
     def save(self, filename):
         """
@@ -5657,6 +6496,38 @@ class Image(object):
             img = self.save("")
             display(HTML("<img src='%s'>" % img))
 
+def grab(viewers, resolution=None, channels=4):
+    """
+    Get raw image frames from multiple viewers at once
+
+    The image requests are submitted to every viewer before waiting for any,
+    so viewers using their own render threads render concurrently
+
+    Parameters
+    ----------
+    viewers : list
+        List of lavavu.Viewer
+    resolution : tuple(int,int)
+        Image width and height in pixels, default is each viewer's output resolution
+    channels : int
+        colour channels/depth in bytes (1=luminance, 3=RGB, 4=RGBA(default))
+
+    Returns
+    -------
+    images : list
+        List of Image, one per viewer
+    """
+    images = []
+    futures = []
+    for lv in viewers:
+        res = lv._getres(resolution)
+        img = Image(res, channels)
+        futures.append(lv.app.submit('imageBuffer', img.data))
+        images.append(img)
+    for future in futures:
+        future.result()
+    return images
+
 def loadCPT(fn, positions=True):
     """
     Create a colourmap from a CPT colour table file
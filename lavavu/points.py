@@ -15,6 +15,7 @@ More tools can be found there, including a ptx reader which handles transformati
 """
 import numpy
 import os
+import itertools
 import convert
 
 def loadpointcloud(filename, subsample=1, dtype=numpy.float32, components=['x', 'y', 'z', 'red', 'green', 'blue', 'alpha']):
@@ -42,70 +43,16 @@ def loadpointcloud(filename, subsample=1, dtype=numpy.float32, components=['x',
     """
     fn, ext = os.path.splitext(filename)
     ext = ext.lower()
-    if ext == '.xyz':
-        #Loop over lines in input file
-        count = 0
+    if ext == '.xyz' or ext == '.xyzb':
         V = []
         C = []
-        with open(filename, 'r') as file:
-            for line in file:
-                #Subsample?
-                count += 1
-                if subsample > 1 and count % subsample != 1: continue
-
-                if count % 10000 == 0:
-                  print(count)
-                  sys.stdout.flush()
-
-                #Read particle position
-                data = re.split(r'[,;\s]+', line.rstrip())
-                if len(data) < 3: continue
-                x = float(data[0])
-                y = float(data[1])
-                z = float(data[2])
-
-                V.append((x, y, z))
-
-                #R,G,B[,A] colour if provided
-                if len(data) >= 7:
-                    C.append((int(data[3]), int(data[4]), int(data[5]), int(data[6])))
-                elif len(data) == 6:
-                    C.append((int(data[3]), int(data[4]), int(data[5]), 255))
-
-        V = numpy.array(V)
-        C = numpy.array(C)
-
-    elif ext == '.xyzb':
-        inbytes = os.path.getsize(filename)
-        #All floats
-        #num = inbytes / (4 * 6) # x y z r g b
-        #All floats, rgba
-        #num = inbytes / (4 * 7) # x y z r g b a
-        #All doubles, rgba
-        #num = inbytes / (8 * 7) # x y z r g b a
-        #Float vert, byte colour
-        #num = inbytes / (4 * 3 + 4) # x y z r g b a
-        sz = numpy.dtype(dtype).itemsize
-        num = inbytes // (sz * len(components))
-
-        with open(filename, 'rb') as infile:
-            print("Importing " + str(num//subsample) + " points")
-            arr = numpy.fromfile(infile, dtype='float64')
-            infile.close()
-
-            arr = arr.astype(dtype).reshape(len(arr)//len(components), len(components))
-            if subsample > 1:
-                arr = arr[::subsample]
-
-            #Convert float rgba to uint32 colour
-            colours = None
-            if len(components) > 6:
-                colours = arr[:,3:len(components)]
-                colours *= 255
-                colours = colours.astype('uint8').ravel()
-                colours = colours.view(dtype='uint32')
-
-            return (arr[:,0:3], colours)
+        for verts, colours in readpointcloud(filename, subsample=subsample, dtype=dtype, components=components):
+            V.append(verts)
+            if colours is not None:
+                C.append(colours)
+        V = numpy.concatenate(V) if len(V) else numpy.zeros((0,3), dtype=numpy.float32)
+        C = numpy.concatenate(C) if len(C) else None
+        return (V, C)
 
     elif ext == '.obj':
         print("Loading OBJ")
@@ -189,3 +136,431 @@ def loadpointcloud(filename, subsample=1, dtype=numpy.float32, components=['x',
     else:
         print("Unknown point cloud format, extension: ", ext)
 
+def _rgba(colours, scale=1):
+    """
+    Pack (N,3) or (N,4) r,g,b[,a] colour components into uint32 colour values
+    """
+    rgba = numpy.full((len(colours), 4), 255, dtype=numpy.uint8)
+    ncomp = min(4, colours.shape[1])
+    if scale != 1:
+        rgba[:,0:ncomp] = colours[:,0:ncomp] * scale
+    else:
+        rgba[:,0:ncomp] = colours[:,0:ncomp]
+    return rgba.view(numpy.uint32).ravel()
+
+def readpointcloud(filename, chunksize=1000000, subsample=1, dtype=numpy.float32, components=['x', 'y', 'z', 'red', 'green', 'blue', 'alpha']):
+    """
+    Read a point cloud file in blocks, a generator that yields
+    (vertices, colours) for every chunksize points read,
+    so large files can be loaded incrementally without holding
+    the whole cloud in memory
+
+    .xyz text files are parsed with numpy.loadtxt a block of lines at a time,
+    .xyzb binary files are memory mapped and only the sampled rows are read,
+    other formats are loaded in full with loadpointcloud() then yielded in blocks
+
+    Parameters
+    ----------
+    filename, str
+        Full path to file to load
+    chunksize, int
+        Number of points in each block
+    subsample, int
+        Subsample factor, sample every Nth point
+    dtype, numpy.dtype
+        Type of data in binary (.xyzb) files
+    components, list
+        List of components per point in binary (.xyzb) files,
+        colour components are floating point [0,1]
+
+    Yields
+    ------
+    vertices : array
+        numpy float32 array x,y,z
+    colours : array
+        numpy uint32 array of packed r,g,b,a colours, or None
+
+    Raises
+    ------
+    ValueError
+        If a line in a .xyz file has fewer columns than the first data line
+
+    Example
+    -------
+    Load a large point cloud into an object a block at a time
+
+    >>> import lavavu, points
+    >>> lv = lavavu.Viewer()
+    >>> pts = lv.points()
+    >>> for verts, colours in points.readpointcloud('cloud.xyz'):
+    ...     pts.vertices(verts)
+    ...     if colours is not None: pts.colours(colours)
+    """
+    subsample = max(1, int(subsample))
+    fn, ext = os.path.splitext(filename)
+    ext = ext.lower()
+    if ext == '.xyz':
+        #Separators: comma, semicolon or whitespace
+        table = str.maketrans(',;', '  ')
+        with open(filename, 'r') as file:
+            #Skip any header lines without at least x,y,z
+            lines = itertools.islice(file, 0, None, subsample)
+            first = None
+            for line in lines:
+                if len(line.translate(table).split()) >= 3:
+                    first = line
+                    break
+            if first is None:
+                return
+            #Read x,y,z and up to 4 colour components, as found in the first line
+            ncols = min(7, len(first.translate(table).split()))
+            lines = itertools.chain([first], lines)
+            while True:
+                block = [l.translate(table) for l in itertools.islice(lines, chunksize)]
+                if not len(block):
+                    break
+                try:
+                    data = numpy.loadtxt(block, dtype=numpy.float64, usecols=range(ncols), ndmin=2)
+                except (ValueError, IndexError):
+                    #Find the offending line to report, only checked on failure to keep parsing fast
+                    for l in block:
+                        n = len(l.split())
+                        if 0 < n < ncols:
+                            raise ValueError("Line in " + filename + " has " + str(n) + " columns, expected "
+                                             + str(ncols) + " as found in the first data line: " + l.strip())
+                    raise
+                colours = None
+                if ncols >= 6:
+                    colours = _rgba(data[:,3:])
+                yield (data[:,0:3].astype(numpy.float32), colours)
+
+    elif ext == '.xyzb':
+        #Memory map, only the pages containing sampled rows are read
+        ncomp = len(components)
+        arr = numpy.memmap(filename, dtype=dtype, mode='r')
+        arr = arr[0:len(arr) - len(arr) % ncomp].reshape((-1, ncomp))
+        print("Importing " + str(-(-len(arr) // subsample)) + " points")
+        step = chunksize * subsample
+        for start in range(0, len(arr), step):
+            block = arr[start:start+step:subsample]
+            colours = None
+            if ncomp >= 6:
+                colours = _rgba(block[:,3:], 255)
+            yield (numpy.array(block[:,0:3], dtype=numpy.float32), colours)
+
+    else:
+        V, C = loadpointcloud(filename, subsample=subsample, dtype=dtype, components=components)
+        if V.ndim == 2 and V.shape[0] == 3 and V.shape[1] != 3:
+            #Loaded as columns (LAS)
+            V = V.T
+            C = C.T if C is not None else None
+        for start in range(0, len(V), chunksize):
+            colours = None
+            if C is not None:
+                colours = C[start:start+chunksize]
+                #Pack r,g,b[,a] components (PLY, LAS, OBJ) into uint32
+                if colours.ndim == 2:
+                    colours = _rgba(colours)
+            yield (numpy.asarray(V[start:start+chunksize], dtype=numpy.float32), colours)
+
+
+#Point record for level of detail files: position and packed r,g,b,a colour
+_lod_dtype = numpy.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('rgba', '<u4')])
+
+def buildlod(source, filename, nodesize=65536, chunksize=1000000, seed=None):
+    """
+    Preprocess a point cloud into a level of detail octree stored on disk,
+    for datasets too large to load or render in full, see: LODPointCloud
+
+    Every point is assigned to one octree level at random, weighted so
+    nodes at each level hold a similar number of points, the lower levels
+    forming an even subsample of the whole cloud. Points are then grouped
+    into nodes at their level and written out node by node.
+
+    Only one chunk or partition is held in memory at once:
+    the points are spooled to a temporary file while finding the bounds,
+    then split by coarse octree cell into partition files and each
+    partition is sorted into nodes in turn.
+
+    Writes two files:
+     - filename : point records, float32 x,y,z + uint32 colour, grouped by node
+     - filename + '.idx.npz' : bounds, depth and node table
+       (level, x, y, z, offset, count) for each non-empty node
+
+    Parameters
+    ----------
+    source : str or iterable
+        Point cloud file to read with readpointcloud() or an iterable
+        yielding (vertices, colours) blocks, colours may be None
+    filename : str
+        Output file to write
+    nodesize : int
+        Target number of points per octree node, used to choose the depth
+    chunksize : int
+        Number of points to process at once
+    seed : int
+        Random seed for level assignment
+
+    Example
+    -------
+    Convert a coloured PLY point cloud, colours are packed into the point records
+
+    >>> import numpy, points
+    >>> from plyfile import PlyData, PlyElement
+    >>> v = numpy.zeros(1000, dtype=[('x','f4'), ('y','f4'), ('z','f4'), ('red','u1'), ('green','u1'), ('blue','u1')])
+    >>> v['x'] = numpy.arange(1000)
+    >>> v['red'] = 255
+    >>> PlyData([PlyElement.describe(v, 'vertex')]).write('cloud.ply')
+    >>> points.buildlod('cloud.ply', 'cloud.lod')
+    Loading PLY
+    Processing 1000 points, octree depth 0
+    Wrote 1000 points in 1 nodes
+    >>> rec = numpy.fromfile('cloud.lod', dtype=points._lod_dtype)
+    >>> bool(numpy.all(rec['rgba'] == points._rgba(numpy.array([[255, 0, 0]]))[0]))
+    True
+    """
+    import tempfile
+    if isinstance(source, str):
+        source = readpointcloud(source, chunksize=chunksize)
+    tmpdir = os.path.dirname(os.path.abspath(filename))
+    rng = numpy.random.default_rng(seed)
+
+    #Pass 1: spool all points to a single temporary file and get bounds
+    count = 0
+    bmin = numpy.full(3, numpy.inf)
+    bmax = numpy.full(3, -numpy.inf)
+    colour = False
+    with tempfile.TemporaryFile(dir=tmpdir) as spool:
+        for verts, colours in source:
+            verts = numpy.asarray(verts, dtype=numpy.float32).reshape((-1,3))
+            if len(verts) == 0:
+                continue
+            rec = numpy.empty(len(verts), dtype=_lod_dtype)
+            rec['x'] = verts[:,0]
+            rec['y'] = verts[:,1]
+            rec['z'] = verts[:,2]
+            rec['rgba'] = 0xffffffff
+            if colours is not None and len(colours) == len(verts):
+                rec['rgba'] = colours
+                colour = True
+            rec.tofile(spool)
+            bmin = numpy.minimum(bmin, verts.min(axis=0))
+            bmax = numpy.maximum(bmax, verts.max(axis=0))
+            count += len(verts)
+        if count == 0:
+            print("No points to process")
+            return
+        spool.flush()
+
+        #Depth chosen so the deepest level averages nodesize points per node
+        depth = max(0, int(numpy.ceil(numpy.log(max(1.0, count / nodesize)) / numpy.log(8))))
+        extent = numpy.maximum(bmax - bmin, 1e-30)
+        weights = 8.0 ** numpy.arange(depth+1)
+        cumulative = numpy.cumsum(weights / weights.sum())
+        cumulative[-1] = 1.0
+        #Partition on cells at this level, levels above go in one extra file
+        plevel = min(2, depth)
+        print("Processing %d points, octree depth %d" % (count, depth))
+
+        #Pass 2: assign levels and cells, split into partition files
+        points = numpy.memmap(spool, dtype=_lod_dtype, mode='r', shape=(count,))
+        parts = [tempfile.TemporaryFile(dir=tmpdir) for p in range(8 ** plevel + 1)]
+        try:
+            for start in range(0, count, chunksize):
+                rec = numpy.array(points[start:start+chunksize])
+                level = numpy.searchsorted(cumulative, rng.random(len(rec)), side='right')
+                level = numpy.minimum(level, depth)
+                cells = _lod_cells(rec, bmin, extent, plevel)
+                #Partition index: coarse cell, or last file for top levels
+                pindex = (cells[:,0] * (1 << plevel) + cells[:,1]) * (1 << plevel) + cells[:,2]
+                pindex[level < plevel] = len(parts) - 1
+                order = numpy.argsort(pindex, kind='stable')
+                rec = rec[order]
+                level = level[order].astype(numpy.uint8)
+                bounds = numpy.searchsorted(pindex[order], numpy.arange(len(parts)+1))
+                for p in range(len(parts)):
+                    if bounds[p+1] > bounds[p]:
+                        rec[bounds[p]:bounds[p+1]].tofile(parts[p])
+                        level[bounds[p]:bounds[p+1]].tofile(parts[p])
+                        #Block header stored after data: record count
+                        numpy.array([bounds[p+1]-bounds[p]], dtype='<i8').tofile(parts[p])
+            del points
+
+            #Pass 3: sort each partition into nodes and write output
+            nodes = []
+            offset = 0
+            with open(filename, 'wb') as out:
+                for part in [parts[-1]] + parts[:-1]:
+                    rec, level = _lod_read_partition(part)
+                    if len(rec) == 0:
+                        continue
+                    cells = _lod_cells(rec, bmin, extent, depth)
+                    cells >>= (depth - level.astype(numpy.int64))[:,None]
+                    order = numpy.lexsort((cells[:,2], cells[:,1], cells[:,0], level))
+                    rec = rec[order]
+                    key = numpy.column_stack((level[order], cells[order]))
+                    starts = numpy.flatnonzero(numpy.r_[True, numpy.any(key[1:] != key[:-1], axis=1)])
+                    counts = numpy.diff(numpy.r_[starts, len(rec)])
+                    nodes.append(numpy.column_stack((key[starts], offset + starts, counts)))
+                    rec.tofile(out)
+                    offset += len(rec)
+        finally:
+            for p in parts:
+                p.close()
+
+    numpy.savez(filename + '.idx.npz', bounds=numpy.array([bmin, bmax]), depth=depth,
+                colour=colour, nodes=numpy.concatenate(nodes).astype(numpy.int64))
+    print("Wrote %d points in %d nodes" % (offset, sum(len(n) for n in nodes)))
+
+def _lod_cells(rec, bmin, extent, level):
+    """
+    Integer octree cell coordinates of each point at given level
+    """
+    dim = 1 << level
+    pos = numpy.column_stack((rec['x'], rec['y'], rec['z']))
+    cells = ((pos - bmin) / extent * dim).astype(numpy.int64)
+    return numpy.clip(cells, 0, dim-1)
+
+def _lod_read_partition(part):
+    """
+    Read all blocks written to a partition file, returns records and levels
+    """
+    part.flush()
+    part.seek(0, os.SEEK_END)
+    end = part.tell()
+    recs = []
+    levels = []
+    #Blocks are read back to front using the count stored after each
+    while end > 0:
+        part.seek(end - 8)
+        n = int(numpy.fromfile(part, dtype='<i8', count=1)[0])
+        start = end - 8 - n * (_lod_dtype.itemsize + 1)
+        part.seek(start)
+        recs.append(numpy.fromfile(part, dtype=_lod_dtype, count=n))
+        levels.append(numpy.fromfile(part, dtype=numpy.uint8, count=n))
+        end = start
+    if not len(recs):
+        return numpy.empty(0, dtype=_lod_dtype), numpy.empty(0, dtype=numpy.uint8)
+    return numpy.concatenate(recs), numpy.concatenate(levels)
+
+class LODPointCloud(object):
+    """
+    Streams the visible parts of a level of detail point cloud
+    created by buildlod() into a points object
+
+    Octree nodes are chosen by their projected size from the current
+    camera position, largest first, skipping nodes outside the field
+    of view, until the point budget is reached. Only the selected node
+    records are read from the memory mapped point file, so navigation
+    cost depends on the budget rather than the total dataset size
+
+    Call update() after the view changes to load a new selection
+
+    Example
+    -------
+
+    >>> import lavavu, points
+    >>> points.buildlod('survey.xyzb', 'survey.lod')
+    >>> lv = lavavu.Viewer()
+    >>> pts = lv.points(pointsize=2)
+    >>> cloud = points.LODPointCloud(pts, 'survey.lod', budget=2000000)
+    >>> cloud.update()
+    """
+    def __init__(self, obj, filename, budget=1000000):
+        self.obj = obj
+        self.budget = budget
+        idx = numpy.load(filename + '.idx.npz')
+        self.bounds = idx['bounds']
+        self.depth = int(idx['depth'])
+        self.colour = bool(idx['colour'])
+        self.nodes = idx['nodes']
+        self.data = numpy.memmap(filename, dtype=_lod_dtype, mode='r')
+        self.lookup = {tuple(n[0:4]) : i for i,n in enumerate(self.nodes.tolist())}
+        extent = self.bounds[1] - self.bounds[0]
+        #Node centres and bounding radius
+        size = extent / (1 << self.nodes[:,0:1])
+        self.centres = self.bounds[0] + (self.nodes[:,1:4] + 0.5) * size
+        self.radii = 0.5 * numpy.linalg.norm(size, axis=1)
+        self.loaded = None
+
+    def _camera(self):
+        #Eye position, view direction and field of view in model coordinates
+        lv = self.obj.parent
+        lv._get()
+        view = lv.state["views"][0]
+        x, y, z, w = view.get("rotate", [0, 0, 0, 1])
+        R = numpy.array([[1-2*(y*y+z*z), 2*(x*y-z*w), 2*(x*z+y*w)],
+                         [2*(x*y+z*w), 1-2*(x*x+z*z), 2*(y*z-x*w)],
+                         [2*(x*z-y*w), 2*(y*z+x*w), 1-2*(x*x+y*y)]])
+        translate = numpy.array(view.get("translate", [0, 0, 0]), dtype=numpy.float64)
+        focus = numpy.array(view.get("focus", [0, 0, 0]), dtype=numpy.float64)
+        eye = focus - R.T.dot(translate)
+        direction = R.T.dot([0, 0, -1])
+        fov = numpy.radians(view.get("fov", 45))
+        width, height = lv.state["properties"].get("resolution", lv.output_resolution)[0:2]
+        aspect = width / float(max(height, 1))
+        return eye, direction, fov, aspect
+
+    def select(self):
+        """
+        Get the nodes to display for the current view
+
+        Returns
+        -------
+        nodes : list
+            indices into the node table of the selected nodes
+        """
+        import heapq
+        eye, direction, fov, aspect = self._camera()
+        #Field of view is vertical, widen to the horizontal half-angle for the window aspect ratio
+        halfangle = numpy.arctan(numpy.tan(fov / 2) * max(aspect, 1.0))
+        delta = self.centres - eye
+        dist = numpy.maximum(numpy.linalg.norm(delta, axis=1), 1e-30)
+        #Visible if any part of the bounding sphere is inside the view cone
+        angle = numpy.arccos(numpy.clip(delta.dot(direction) / dist, -1, 1))
+        margin = numpy.arcsin(numpy.clip(self.radii / dist, 0, 1))
+        visible = (dist <= self.radii) | (angle - margin <= halfangle)
+        priority = self.radii / dist
+
+        root = self.lookup.get((0, 0, 0, 0))
+        if root is None:
+            return []
+        selected = []
+        total = 0
+        heap = [(-priority[root], root)]
+        while heap:
+            p, i = heapq.heappop(heap)
+            level, x, y, z, offset, count = self.nodes[i]
+            if total + count > self.budget:
+                continue
+            selected.append(i)
+            total += count
+            for c in range(8):
+                child = self.lookup.get((level+1, 2*x + (c & 1), 2*y + ((c >> 1) & 1), 2*z + (c >> 2)))
+                if child is not None and visible[child]:
+                    heapq.heappush(heap, (-priority[child], child))
+        return sorted(selected)
+
+    def update(self):
+        """
+        Load the points for the current view into the object,
+        if the selection has changed since the last update
+
+        Returns
+        -------
+        changed : boolean
+            True if new data was loaded
+        """
+        selected = self.select()
+        if selected == self.loaded:
+            return False
+        self.loaded = selected
+        if len(selected):
+            rec = numpy.concatenate([self.data[o:o+n] for o,n in self.nodes[selected][:,4:6]])
+        else:
+            rec = numpy.empty(0, dtype=_lod_dtype)
+        self.obj.clear()
+        self.obj.vertices(numpy.column_stack((rec['x'], rec['y'], rec['z'])))
+        if self.colour:
+            self.obj.colours(numpy.ascontiguousarray(rec['rgba']))
+        return True
@@ -18,6 +18,10 @@ from urllib.parse import parse_qs
 """
 HTTP Server interface
 """
+#Default settings for /stream frames, can be overridden by query: /stream?fps=5&width=800&quality=80
+stream_fps = 10
+stream_quality = 90
+
 class LVRequestHandler(SimpleHTTPRequestHandler, object):
 
     def __init__(self, viewer_weakref, *args, **kwargs):
@@ -36,13 +40,17 @@ class LVRequestHandler(SimpleHTTPRequestHandler, object):
             else:
                 raise e
 
-    def serveResponse(self, data, datatype):
+    def serveResponse(self, data, datatype, etag=None, status=200):
         try:
             #Serve provided data, with error check for SIGPIPE (broken connection)
-            self.send_response(200)
+            self.send_response(status)
             self.send_header('Content-type', datatype)
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('x-colab-notebook-cache-control', 'no-cache') #Colab: disable offline access cache      
+            if etag:
+                #Clients revalidate with If-None-Match, see img_response()
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
             self.end_headers()
             if data:
                 self.wfile.write(data)
@@ -58,6 +66,44 @@ class LVRequestHandler(SimpleHTTPRequestHandler, object):
             else:
                 raise e
 
+    def serveStream(self, query):
+        """
+        Serve a multipart/x-mixed-replace stream of JPEG frames,
+        a new frame is only sent when the viewer state has changed
+        """
+        fps = float(query['fps'][0]) if 'fps' in query else stream_fps
+        quality = int(query['quality'][0]) if 'quality' in query else stream_quality
+        resolution = None
+        if 'width' in query:
+            resolution = (int(query['width'][0]), int(query['height'][0]) if 'height' in query else 0)
+        try:
+            self.send_response(200)
+            self.send_header('Content-type', 'multipart/x-mixed-replace; boundary=frame')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            version = None
+            while True:
+                start = time.time()
+                #(viewer reference is not held between frames)
+                lv = self._lv()
+                if not lv or not lv.server or lv.server._closing:
+                    break
+                current = lv._scene_version()
+                if current != version:
+                    version = current
+                    frame = lv.jpeg(resolution=resolution, quality=quality)
+                    self.wfile.write(b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: ' + str(len(frame)).encode() + b'\r\n\r\n')
+                    self.wfile.write(frame)
+                    self.wfile.write(b'\r\n')
+                    self.wfile.flush()
+                lv = None
+                #Limit to max frame rate
+                time.sleep(max(0, 1.0 / fps - (time.time() - start)))
+        except (IOError,ConnectionError) as e:
+            #Client disconnected
+            pass
+
     def do_HEAD(self):
         self.serveResponse(None, 'text/html')
 
@@ -84,20 +130,32 @@ class LVRequestHandler(SimpleHTTPRequestHandler, object):
 
         def img_response():
             resp = None
+            resolution = None
             if 'width' in query and 'height' in query:
-                resp = lv.jpeg(resolution=(int(query['width'][0]), int(query['height'][0])))
+                resolution = (int(query['width'][0]), int(query['height'][0]))
             elif 'width' in query:
-                resp = lv.jpeg(resolution=(int(query['width'][0]), 0))
-            else:
-                resp = lv.jpeg()
+                resolution = (int(query['width'][0]), 0)
+
+            #Client already has this frame (If-None-Match), nothing changed
+            etag = self.headers.get('If-None-Match')
+            if etag and etag == lv.frame_etag('jpeg', resolution):
+                self.serveResponse(None, 'image/jpeg', etag, 304)
+                return
+
+            resp = lv.jpeg(resolution=resolution)
 
             #Ensure the response is valid before serving
             if resp is not None:
-                self.serveResponse(resp, 'image/jpeg')
+                self.serveResponse(resp, 'image/jpeg', lv.frame_etag('jpeg', resolution))
 
         if self.path.find('image') > 0:
             img_response()
 
+        elif self.path.startswith('/stream'):
+            #Release our reference, the stream looks the viewer up for each frame
+            del lv
+            self.serveStream(query)
+
         elif self.path.find('command=') > 0:
             pos1 = self.path.find('=')
             pos2 = self.path.find('?')
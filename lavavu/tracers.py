@@ -11,30 +11,107 @@ Uses a KDTree to find nearest vector to advect the particles
 import numpy
 import os
 import sys
-import random
-import math
+from concurrent.futures import ThreadPoolExecutor
 from scipy import spatial
 
 #Necessary? for large trees, detect?
 #sys.setrecursionlimit(10000)
 
 class TracerState(object):
-    def __init__(self, verts, N=5000):
+    """
+    Holds the tracer positions, velocities, values and step counts,
+    and optionally a history of the last H positions and values of every
+    tracer, kept in a ring buffer of contiguous (H,N,3) and (H,N) arrays
+    """
+    def __init__(self, verts, N=5000, seed=None, history=0):
         self.tree = spatial.cKDTree(verts)
+        self.rng = numpy.random.default_rng(seed)
         self.tracers = None
-        self.steps = [0]*N
+        self.steps = numpy.zeros(N, dtype=numpy.int64)
         self.values = None
         self.positions = None
         self.velocities = None
+        self.history = history
+        self.trail = None
+        self.trail_values = None
+        self.head = 0     #Next slot to write in the ring buffer
+        self.recorded = 0 #Number of steps stored
+
+    def record(self):
+        """
+        Store the current positions and values in the history ring buffer,
+        overwriting the oldest step when full
+        """
+        if not self.history or self.positions is None:
+            return
+        if self.trail is None:
+            N = len(self.positions)
+            self.trail = numpy.zeros((self.history, N, 3), dtype=numpy.float32)
+            self.trail_values = numpy.zeros((self.history, N), dtype=numpy.float32)
+        self.trail[self.head] = self.positions
+        self.trail_values[self.head] = self.values
+        self.head = (self.head + 1) % self.history
+        self.recorded = min(self.recorded + 1, self.history)
 
-def trace_particles(state, verts, vecs, N=5000, limit=0.5, speed=1.0, noise=0.0, height=None):
+    def trails(self):
+        """
+        Get the recorded history, oldest step first
+
+        Returns
+        -------
+        positions : array
+            (S,N,3) float32 positions for the S recorded steps
+        values : array
+            (S,N) float32 values for the S recorded steps
+        """
+        if not self.recorded:
+            return numpy.zeros((0, 0, 3), dtype=numpy.float32), numpy.zeros((0, 0), dtype=numpy.float32)
+        order = (self.head - self.recorded + numpy.arange(self.recorded)) % self.history
+        return self.trail[order], self.trail_values[order]
+
+def _trilinear(verts, vecs, dims, positions):
+    """
+    Interpolate vectors at given positions from a structured grid,
+    verts/vecs ordered with x varying fastest, dims = [nx, ny, nz],
+    positions outside the grid take the values at the boundary
+    """
+    dims = numpy.array(dims[0:3], dtype=numpy.int64)
+    grid = numpy.asarray(vecs).reshape((dims[0] * dims[1] * dims[2], -1))
+    origin = numpy.asarray(verts[0], dtype=numpy.float64)
+    spacing = (numpy.asarray(verts[-1], dtype=numpy.float64) - origin) / numpy.maximum(dims - 1, 1)
+    spacing[spacing == 0] = 1.0
+    #Fractional grid index, lower corner and weights
+    f = (positions - origin) / spacing
+    f = numpy.clip(f, 0, dims - 1)
+    i0 = numpy.minimum(f.astype(numpy.int64), numpy.maximum(dims - 2, 0))
+    w1 = f - i0
+    w0 = 1.0 - w1
+    #Flat index of lower corner, offsets to the other corners (zero if a dimension is flat)
+    stride = numpy.array([1, dims[0], dims[0] * dims[1]])
+    base = i0.dot(stride)
+    step = numpy.where(dims > 1, stride, 0)
+    result = numpy.zeros((len(positions), grid.shape[1]))
+    for cz in (0,1):
+        wz = (w0, w1)[cz][:,2]
+        for cy in (0,1):
+            wzy = wz * (w0, w1)[cy][:,1]
+            for cx in (0,1):
+                w = wzy * (w0, w1)[cx][:,0]
+                offset = cx * step[0] + cy * step[1] + cz * step[2]
+                result += numpy.take(grid, base + offset, axis=0) * w[:,None]
+    return result
+
+def trace_particles(state, verts, vecs, N=5000, limit=0.5, speed=1.0, noise=0.0, height=None, seed=None, dims=None,
+                    steps=1, method='euler', history=0, threads=None, chunksize=65536):
     """
     Take a list of tracer vertices and matching velocity grid points (verts) & vectors (vecs)
     For each tracer
 
-    - find the nearest velocity grid point
-    - if within max dist: Multiply position by velocity vector
-    - otherwise: Generate a new start position for tracer
+    - find the nearest velocity grid point (or interpolate on a structured grid)
+    - Add the velocity vector to the position
+    - with increasing chance as the step count grows: Generate a new start position for tracer
+
+    All tracers are processed at once with array operations
 
     Parameters
     ----------
@@ -53,11 +130,30 @@ def trace_particles(state, verts, vecs, N=5000, limit=0.5, speed=1.0, noise=0.0,
         connected when passing through the boundary
     speed : float
         Speed multiplier, scaling factor for the velocity taken from the vector values
+        (the integration time step)
     noise : float
         A noise factor, if set a random value is generated, multiplied by noise factor
         and added to each new position
     height : float
         A fixed height value, all positions will be given this height as their Z component
+    seed : int
+        Seed for the random number generator, used on first pass only
+    dims : list or tuple
+        If the vector field is a structured grid, provide its dimensions [nx, ny, nz]
+        (verts ordered with x varying fastest) to use trilinear interpolation
+        instead of the nearest grid point
+    steps : int
+        Number of steps to advance
+    method : str
+        Integration method, 'euler', 'rk2' (midpoint) or 'rk4'
+    history : int
+        Number of steps of history to keep for every tracer, used on first pass only,
+        see: TracerState.trails() and load_tracers()
+    threads : int
+        Number of threads to integrate with, particles are split into chunks
+        processed in parallel, default is the cpu count
+    chunksize : int
+        Number of particles in each chunk
 
     Returns
     -------
@@ -68,57 +164,116 @@ def trace_particles(state, verts, vecs, N=5000, limit=0.5, speed=1.0, noise=0.0,
 
     #KDstate.tree for finding nearest velocity grid point
     if state is None:
-        state = TracerState(verts, N)
+        state = TracerState(verts, N, seed, history)
+    verts = numpy.asarray(verts)
+    vecs = numpy.asarray(vecs)
+    rng = state.rng
+    if threads is None:
+        threads = os.cpu_count() or 1
 
-    lastid = 0
-    def rand_vert():
-        #Get a random velocity grid point
-        lastid = random.randint(0, len(verts)-1)
-        pos = verts[lastid]
+    def rand_verts(count):
+        #Get random velocity grid points and their indices
+        ids = rng.integers(0, len(verts), count)
+        pos = verts[ids].astype(numpy.float64)
         #Generate some random noise to offset
-        noise3 = numpy.array((0.,0.,0.))
+        offset = numpy.zeros((count,3))
         if noise > 0.0:
-            noise3 = numpy.random.rand(3) * noise
+            offset = rng.random((count,3)) * noise
         #Fixed height?
         if height:
-            noise3[2] = height
+            offset[:,2] = height
         #Return the sum
-        return pos + noise3
+        return pos + offset, ids
+
+    def velocity(positions, workers):
+        #Lookup vector at each position
+        if dims is not None:
+            return _trilinear(verts, vecs, dims, positions)
+        #Index of nearest grid point
+        d, nearest = state.tree.query(positions, k=1, workers=workers)
+        return vecs[nearest]
+
+    def integrate(idx, workers=1):
+        #Advance the tracers in idx one step, add the velocity to the position
+        x = state.positions[idx]
+        h = speed
+        k1 = velocity(x, workers)
+        if method == 'rk4':
+            k2 = velocity(x + 0.5 * h * k1, workers)
+            k3 = velocity(x + 0.5 * h * k2, workers)
+            k4 = velocity(x + h * k3, workers)
+            dx = (k1 + 2.0 * k2 + 2.0 * k3 + k4) / 6.0
+        elif method == 'rk2':
+            dx = velocity(x + 0.5 * h * k1, workers)
+        else:
+            dx = k1
+        state.velocities[idx] = k1 #Store velocity
+        state.positions[idx] = x + h * dx
+        state.values[idx] = numpy.linalg.norm(k1, axis=1)
 
     if state.positions is None:
-        state.positions = numpy.zeros(shape=(N,3))
+        state.positions, ids = rand_verts(N)
         state.velocities = numpy.zeros(shape=(N,3))
-        state.values = numpy.zeros(shape=(N))
-        for i in range(N):
-            state.positions[i] = rand_vert()
-            state.steps[i] = 0
-            state.values[i] = numpy.linalg.norm(vecs[lastid])
-
-    #Query all tracer state.positions
-    q = state.tree.query(state.positions, k=1)
-    for r in range(len(q[0])):
-        #print("result, distance, point")
-        #print(r, q[0][r], state.tree.data[q[1][r]], state.positions[r])
-
-        #Increasing random chance as steps exceed 5 of a new start pos
-        if random.randint(0,state.steps[r]) > 5:
+        state.steps[:] = 0
+        state.values = numpy.linalg.norm(vecs[ids], axis=1)
+        state.record()
+
+    pool = ThreadPoolExecutor(threads) if threads > 1 and len(state.positions) > chunksize else None
+    try:
+        for step in range(steps):
+            #Increasing random chance as steps exceed 5 of a new start pos
+            respawn = rng.integers(0, state.steps + 1) > 5
+
             #Pick a new random grid vertex to start from
-            #(Must be farther away than distance criteria)
-            old = numpy.array(state.positions[r])
-            while True:
-                state.positions[r] = rand_vert() 
-                if numpy.linalg.norm(state.positions[r]-old) > limit:
+            #(Must be farther away than distance criteria, retry those that are not)
+            idx = numpy.flatnonzero(respawn)
+            old = state.positions[idx]
+            for attempt in range(100):
+                if not len(idx):
                     break
-            state.steps[r] = 0
-            state.values[r] = numpy.linalg.norm(vecs[lastid])
-        else:
-            #Index of nearest grid point is in q[1][r]
-            #Lookup vector at this index, multiply by position to get delta and add
-            state.velocities[r] = vecs[q[1][r]] #Store velocity
-            state.positions[r] += speed * vecs[q[1][r]]
+                pos, ids = rand_verts(len(idx))
+                state.positions[idx] = pos
+                state.values[idx] = numpy.linalg.norm(vecs[ids], axis=1)
+                retry = numpy.linalg.norm(pos - old, axis=1) <= limit
+                idx = idx[retry]
+                old = old[retry]
+            state.steps[respawn] = 0
+
+            #Advect the rest, in chunks across the thread pool
+            idx = numpy.flatnonzero(~respawn)
+            if pool:
+                chunks = [idx[i:i+chunksize] for i in range(0, len(idx), chunksize)]
+                list(pool.map(integrate, chunks))
+            else:
+                integrate(idx, -1)
             #Increment step tracking
-            state.steps[r] += 1
-            state.values[r] = numpy.linalg.norm(vecs[q[1][r]])
+            state.steps[idx] += 1
+            state.record()
+    finally:
+        if pool:
+            pool.shutdown()
 
     return state
 
+def load_tracers(state, obj):
+    """
+    Load the recorded tracer history into a tracers object,
+    one time step per recorded step, oldest first, replacing any existing data.
+    All steps are loaded in a single Viewer.load_arrays() call
+    and the viewer is moved to the latest step
+
+    Parameters
+    ----------
+    state : TracerState
+        Tracer state created with history > 0
+    obj : lavavu.Object
+        Tracers object to load
+    """
+    positions, values = state.trails()
+    lv = obj.parent
+    obj.clear()
+    if not len(positions):
+        return
+    lv.load_arrays({obj : {s : {"vertices" : positions[s], "values" : values[s]} for s in range(len(positions))}})
+    obj["steps"] = len(positions)
+    lv.commands("timestep %d" % (len(positions) - 1))
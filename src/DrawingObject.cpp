@@ -62,6 +62,7 @@ DrawingObject::DrawingObject(Session& session, std::string name, std::string pro
   opacityIdx = MAX_DATA_ARRAYS+1;
   colourMap = opacityMap = textureMap = NULL;
   setup();
+  touch();
 }
 
 DrawingObject::~DrawingObject()
@@ -81,7 +82,11 @@ void DrawingObject::updateRange(const std::string& label, const Range& newRange)
 
   //Replace if data modified
   if (range.update(newRange.minimum, newRange.maximum))
+  {
     ranges[label] = range;
+    //Data min/max are exported with the object
+    touch();
+  }
 }
 
 ColourMap* DrawingObject::getColourMap(const std::string propname, ColourMap* current)
@@ -99,6 +104,7 @@ ColourMap* DrawingObject::getColourMap(const std::string propname, ColourMap* cu
       ColourMap* cmap = session.colourMaps[cmapid];
       //Replace integer props with names
       properties.data[propname] = cmap->name;
+      touch();
       return cmap;
     }
   }
@@ -141,12 +147,29 @@ ColourMap* DrawingObject::getColourMap(const std::string propname, ColourMap* cu
     return NULL;
 
   if (current)
+  {
     //Replace property data with name of loaded map
     properties.data[propname] = current->name;
+    touch();
+  }
 
   return valid ? current : NULL;
 }
 
+void DrawingObject::touch()
+{
+  //Flag properties or data modified, for incremental state export (Model::jsonChanges)
+  version = ++session.changes;
+}
+
+void DrawingObject::setProperty(const std::string& key, const json& value)
+{
+  //Set a property internally, only flagged as modified if the value changed
+  if (properties.data.count(key) && properties.data[key] == value) return;
+  properties.data[key] = value;
+  touch();
+}
+
 void DrawingObject::setup()
 {
   //Cache values for faster lookups during draw calls
@@ -297,6 +320,7 @@ TextureData* DrawingObject::useTexture(Texture_Ptr tex)
 #if not defined(__EMSCRIPTEN__)
         //If load failed, skip from now on
         properties.data["texture"] = "";
+        touch();
 #endif
       }
     }
@@ -71,6 +71,8 @@ public:
 
   //Object properties data...
   Properties properties;
+  //Change counter when properties or data were last modified (see touch())
+  unsigned int version = 0;
   //Default texture
   Texture_Ptr texture;
   //Additional textures (stored by label / uniform name)
@@ -83,6 +85,8 @@ public:
   void updateRange(const std::string& label, const Range& newRange);
   ColourMap* getColourMap(const std::string propname="colourmap", ColourMap* current=NULL);
   void setup();
+  void touch();
+  void setProperty(const std::string& key, const json& value);
   TextureData* useTexture(Texture_Ptr tex=nullptr);
   std::string name() {return properties["name"];}
 };
@@ -337,10 +337,12 @@ unsigned int GeomData::valuesLookup(const json& by)
         //Ensure any manual range removed
         //draw->properties.data.erase("range");
         draw->properties.data["range"] = NULL;
+        draw->touch();
       }
       else if (rangestr.length())
       {
         draw->properties.data["range"] = json::parse(rangestr);
+        draw->touch();
       }
     }
 
@@ -722,6 +724,7 @@ void Geometry::remove(DrawingObject* draw)
 {
   //Same as clear but for specific drawing object
   reload = true;
+  if (draw) draw->touch();
   for (int i = records.size()-1; i>=0; i--)
   {
     if (draw == records[i]->draw)
@@ -735,6 +738,48 @@ void Geometry::remove(DrawingObject* draw)
   geom.clear();
 }
 
+void Geometry::clearStep(int step)
+{
+  //Same as clear but for time varying data at a specific step
+  reload = true;
+  for (int i = records.size()-1; i>=0; i--)
+  {
+    if (records[i]->step == step && records[i]->type != lucTracerType)
+    {
+      //Now using shared_ptr so no need to delete
+      records.erase(records.begin()+i);
+    }
+  }
+
+  //Ensure cache cleared
+  cached = NULL;
+  //Ensure temporal data gets reloaded
+  geom.clear();
+}
+
+bool Geometry::stepStored(int step)
+{
+  //Check all time varying data at a specific step was loaded from the database and not modified since
+  for (auto g : records)
+  {
+    if (g->step == step && g->type != lucTracerType && !g->stored)
+      return false;
+  }
+  return true;
+}
+
+unsigned long Geometry::stepBytes(int step)
+{
+  //Memory used by time varying data at a specific step
+  unsigned long bytes = 0;
+  for (auto g : records)
+  {
+    if (g->step == step && g->type != lucTracerType)
+      bytes += g->bytes();
+  }
+  return bytes;
+}
+
 void Geometry::clearValues(DrawingObject* draw, std::string label)
 {
   reload = true;
@@ -742,6 +787,9 @@ void Geometry::clearValues(DrawingObject* draw, std::string label)
   {
     if (!draw || draw == g->draw)
     {
+      g->version++;
+      g->stored = false;
+      g->draw->touch();
       if (label == "labels")
       {
         //Also used to clear labels
@@ -764,6 +812,9 @@ void Geometry::clearData(DrawingObject* draw, lucGeometryDataType dtype)
     if (draw == g->draw)
     {
       g->dataContainer(dtype)->clear();
+      g->version++;
+      g->stored = false;
+      g->draw->touch();
     }
   }
   //std::cout << "CLEARED " << dtype << std::endl;
@@ -973,6 +1024,7 @@ void Geometry::showObj(DrawingObject* draw, bool state)
     {
       if (draw) hidden[i] = !state;
       geom[i]->draw->properties.data["visible"] = state;
+      geom[i]->draw->touch();
     }
   }
 }
@@ -1739,6 +1791,7 @@ void Geometry::colourMapTexture(DrawingObject* obj)
       records[index]->draw->properties.data["texturefilter"] = 0;
       records[index]->draw->properties.data["fliptexture"] = false;
       records[index]->draw->properties.data["repeat"] = false;
+      records[index]->draw->touch();
 
       //Calibrate colour maps on range for this object
       unsigned int hasColours = records[index]->colourCount();
@@ -2180,6 +2233,9 @@ void Geometry::read(Geom_Ptr geomdata, unsigned int n, lucGeometryDataType dtype
   //Read the data
   if (n > 0)
     geomdata->dataContainer(dtype)->read(n, data);
+  geomdata->version++;
+  geomdata->stored = false;
+  geomdata->draw->touch();
 
   if (dtype == lucVertexData)
   {
@@ -2224,6 +2280,9 @@ Geom_Ptr Geometry::read(Geom_Ptr geom, unsigned int n, const void* data, std::st
 
   //Read the data
   if (n > 0) store->read(n, data);
+  geom->version++;
+  geom->stored = false;
+  geom->draw->touch();
 
   //printf("%d (VALS %s FINAL) WIDTH %d HEIGHT %d DEPTH %d\n", n, label.c_str(), geom->width, geom->height, geom->depth);
   return geom; //Return data store pointer
@@ -2371,6 +2430,7 @@ void Geometry::label(DrawingObject* draw, const char* labels)
   //Get passed object's most recently added data store and add vertex labels (newline separated)
   Geom_Ptr geomdata = getObjectStore(draw);
   if (!geomdata) return;
+  geomdata->stored = false;
 
   //Clear if NULL
   if (labels == NULL)
@@ -2392,6 +2452,7 @@ void Geometry::label(DrawingObject* draw, std::vector<std::string> labels)
   //Get passed object's most recently added data store and add vertex labels (newline separated)
   Geom_Ptr geomdata = getObjectStore(draw);
   if (!geomdata) return;
+  geomdata->stored = false;
 
   //Load from vector 
   for (auto line : labels)
@@ -135,6 +135,16 @@ void radix_sort(T *source, long N, char bytes)
   free(temp);
 }
 
+//Depth sort paths, incremental sorts start from the previous order
+typedef enum
+{
+  lucSortUnchanged,  //Still in order, nothing to do
+  lucSortInsertion,  //Few elements out of order, insertion sort
+  lucSortRadix,      //Full radix sort
+  lucSortFallback,   //Insertion sort exceeded its budget, radix sort
+  lucMaxSortPath
+} lucSortPath;
+
 template <class T>
 class SortData
 {
@@ -146,6 +156,13 @@ class SortData
     std::vector<unsigned int> indices;
     bool changed;
 
+    //Sort timing for benchmarking, count/total/last seconds per path
+    lucSortPath path = lucSortRadix;
+    unsigned int counts[lucMaxSortPath] = {0};
+    double seconds[lucMaxSortPath] = {0};
+    double last[lucMaxSortPath] = {0};
+    double distances = 0; //Seconds to calculate distances on last sort
+
     SortData() {}
     ~SortData() {clear();}
 
@@ -173,12 +190,76 @@ class SortData
       changed = true;
     }
 
-    void sort(unsigned int N)
+    bool insertion(unsigned int N, unsigned long budget)
+    {
+      //Stable insertion sort, linear when already nearly in order
+      //Gives up if element moves exceed budget, buffer is then still a valid (partially sorted) order
+      unsigned long moves = 0;
+      for (unsigned int i=1; i<N; i++)
+      {
+        if (buffer[i].distance >= buffer[i-1].distance) continue;
+        T item = buffer[i];
+        unsigned int j = i;
+        while (j > 0 && buffer[j-1].distance > item.distance)
+        {
+          buffer[j] = buffer[j-1];
+          j--;
+        }
+        buffer[j] = item;
+        moves += i - j;
+        if (moves > budget) return false;
+      }
+      return true;
+    }
+
+    void sort(unsigned int N, float threshold=0.0)
     {
       if (N > size) abort_program("Sort count out of range");
-      //Sort by each byte of 2 byte index
-      radix<T>(0, N, buffer, swap);
-      radix<T>(1, N, swap, buffer);
+      auto t0 = std::chrono::steady_clock::now();
+      path = lucSortRadix;
+      if (threshold > 0.0)
+      {
+        //Buffer is still in the order of the previous sort with updated distances,
+        //after a small view change only a few elements will be out of place
+        unsigned int descents = 0;
+        for (unsigned int i=1; i<N; i++)
+          if (buffer[i].distance < buffer[i-1].distance) descents++;
+        if (descents == 0)
+          path = lucSortUnchanged;
+        else if (descents <= threshold * N)
+          //Limit moves to roughly the cost of the radix sort
+          path = insertion(N, 2*(unsigned long)N) ? lucSortInsertion : lucSortFallback;
+      }
+
+      if (path == lucSortRadix || path == lucSortFallback)
+      {
+        //Sort by each byte of 2 byte index
+        radix<T>(0, N, buffer, swap);
+        radix<T>(1, N, swap, buffer);
+      }
+
+      std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - t0;
+      counts[path]++;
+      seconds[path] += elapsed.count();
+      last[path] = elapsed.count();
+    }
+
+    static const char* pathName(lucSortPath p)
+    {
+      static const char* names[lucMaxSortPath] = {"unchanged", "insertion", "radix", "fallback"};
+      return names[p];
+    }
+
+    json info()
+    {
+      //Sort path timing
+      json info;
+      info["elements"] = size;
+      info["distances"] = distances;
+      if (counts[path]) info["path"] = pathName(path);
+      for (int p=0; p<lucMaxSortPath; p++)
+        info[pathName((lucSortPath)p)] = {{"count", counts[p]}, {"seconds", seconds[p]}, {"last", last[p]}};
+      return info;
     }
 };
 
@@ -317,6 +398,8 @@ public:
   unsigned int width;
   unsigned int height;
   unsigned int depth;
+  unsigned int version = 0; //Change counter, incremented when data modified
+  bool stored = false; //Data loaded unmodified from the database, can be released and reloaded
   bool opaque;   //Flag for opaque geometry, render first, don't depth sort
   Texture_Ptr texture;               //Default texture
   lucGeometryType type;   //Holds the object type
@@ -355,6 +438,7 @@ public:
   {
     //Shortcut to read single vertex and with bounding box update
     _vertices->read(1, data);
+    version++;
     checkPointMinMax(data);
   }
 
@@ -392,6 +476,16 @@ public:
 
   unsigned int count() {return render->vertices.count();}  //Number of vertices
 
+  unsigned long bytes()
+  {
+    //Memory used by all data stores
+    unsigned long total = _vertices->bytes() + _vectors->bytes() + _normals->bytes() + _indices->bytes()
+                        + _colours->bytes() + _texCoords->bytes() + _luminance->bytes() + _rgb->bytes();
+    for (auto vals : values)
+      total += vals->bytes();
+    return total;
+  }
+
   void vertexColours(Colour* colour, unsigned int startcount)
   {
     //Load per vertex colours given initial count before vertices generated
@@ -589,6 +683,9 @@ public:
 
   void clear(bool fixed=false); //Called before new data loaded
   virtual void remove(DrawingObject* draw);
+  void clearStep(int step);
+  unsigned long stepBytes(int step);
+  bool stepStored(int step);
   void clearValues(DrawingObject* draw=NULL, std::string label="");
   void clearData(DrawingObject* draw, lucGeometryDataType dtype);
   virtual void close(); //Called on quit & before gl context recreated
@@ -617,6 +714,7 @@ public:
   virtual void update();  //Implementation should create geometry here...
   virtual void draw();    //Implementation should draw geometry here...
   virtual void sort();    //Threaded sort function
+  virtual json sortInfo() {return json();}
   void labels();  //Draw labels
   std::vector<Geom_Ptr> getAllObjects(DrawingObject* draw);
   std::vector<Geom_Ptr> getAllObjectsAt(DrawingObject* draw, int step);
@@ -710,6 +808,7 @@ public:
   void smoothMesh(int index, std::vector<Vertex> &verts, std::vector<Vec3d> &normals, bool optimise=true);
   void calcCentroids();
   virtual void sort();    //Threaded sort function
+  virtual json sortInfo();
   void loadList();
   virtual void render();
   virtual void draw();
@@ -743,6 +842,7 @@ public:
   virtual void update();
   void loadLines();
   virtual void sort();    //Threaded sort function
+  virtual json sortInfo();
   void loadList();
   virtual void render();
   virtual void draw();
@@ -760,6 +860,7 @@ public:
   void loadVertices();
   void loadList();
   virtual void sort();    //Threaded sort function
+  virtual json sortInfo();
   void render();
   int getPointType(int index=-1);
   virtual void draw();
@@ -31,6 +31,8 @@
 #include <climits>
 #include <typeinfo>
 #include <thread>
+#include <atomic>
+#include <chrono>
 #include <mutex>
 #include <condition_variable>
 #include <random>
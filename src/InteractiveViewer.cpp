@@ -905,6 +905,7 @@ bool LavaVu::parseCommand(std::string cmd, bool gethelp)
       if (props.length() > 0)
       {
         aobject->properties.data["texture"] = props;
+        aobject->touch();
         printMessage("Set texture on object: %s to %s", aobject->name().c_str(), props.c_str());
       }
       else
@@ -1686,6 +1687,7 @@ bool LavaVu::parseCommand(std::string cmd, bool gethelp)
               g->showObj(list[c], vis);
           }
           list[c]->properties.data["visible"] = vis; //This allows hiding of objects without geometry (colourbars)
+          list[c]->touch();
           printMessage("%s object %s", action.c_str(), list[c]->name().c_str());
         }
       }
@@ -1733,6 +1735,7 @@ bool LavaVu::parseCommand(std::string cmd, bool gethelp)
     {
       bool current = aobject->properties[what];
       aobject->properties.data[what] = !current;
+      aobject->touch();
       printMessage("Property '%s' set to %s", what.c_str(), !current ? "ON" : "OFF");
     }
     else if (aview->properties.has(what) && aview->properties[what].is_boolean())
@@ -2170,7 +2173,10 @@ bool LavaVu::parseCommand(std::string cmd, bool gethelp)
       DrawingObject* cbar = colourBar(aobject);
       std::string align = parsed["colourbar"];
       if (align.length())
+      {
         cbar->properties.data["align"] = align;
+        cbar->touch();
+      }
     }
   }
   else if (parsed.exists("palette"))
@@ -2273,6 +2279,7 @@ bool LavaVu::parseCommand(std::string cmd, bool gethelp)
           obj->properties.data["pointtype"] = (pt-1) % 5;
         else if (parsed.get("pointtype", next) == "down")
           obj->properties.data["pointtype"] = (pt+1) % 5;
+        obj->touch();
         printMessage("%s point type set to %d", obj->name().c_str(), (int)obj->properties["pointtype"]);
         //Full object reload as data changed
         amodel->reload(obj);
@@ -2530,6 +2537,7 @@ bool LavaVu::parseCommand(std::string cmd, bool gethelp)
             obj->properties.data["scaling"] = sc * 1.5;
           else if (parsed.get("scale", next) == "down")
             obj->properties.data["scaling"] = sc / 1.5;
+          obj->touch();
           printMessage("%s scaling set to %f", obj->name().c_str(), (float)obj->properties["scaling"]);
           //Reload required for per-object scaling
           amodel->reload();
@@ -2993,6 +3001,7 @@ bool LavaVu::parseCommand(std::string cmd, bool gethelp)
       if (name.length() > 0)
       {
         obj->properties.data["name"] = name;
+        obj->touch();
         printMessage("Renamed object: %s", obj->name().c_str());
       }
     }
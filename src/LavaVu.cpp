@@ -597,7 +597,10 @@ void LavaVu::clearAll(bool objects, bool colourmaps)
 
   //Delete all objects? only works for active view/model
   if (objects)
+  {
     amodel->objects.clear();
+    amodel->objects_version = ++session.changes;
+  }
 
   if (colourmaps)
     amodel->colourMaps.clear();
@@ -818,7 +821,7 @@ std::string LavaVu::exportData(lucExportType type, std::vector<DrawingObject*> l
 
 //Property containers now using json
 //Parse lines with delimiter, ie: key=value
-void LavaVu::parseProperties(std::string& properties, DrawingObject* obj)
+void LavaVu::parseProperties(std::string properties, DrawingObject* obj)
 {
   //Process all lines
   std::stringstream ss(properties);
@@ -877,6 +880,7 @@ bool LavaVu::parseProperty(std::string data, DrawingObject* obj)
       if (verbose) std::cerr << "OBJECT " << std::setw(2) << obj->name()
                              << ", DATA: " << obj->properties.data << std::endl;
       obj->setup();
+      obj->touch();
     }
   }
   else
@@ -1057,6 +1061,7 @@ void LavaVu::readVolumeCube(const FilePath& fn, GLubyte* data, int width, int he
       float volmax[3];
       Properties::toArray<float>(vobj->properties["volmax"], volmax, 3);
       vobj->properties.data["volmax"] = json::array({scale[0]*volmax[0], scale[1]*volmax[0], scale[1]*volmax[2]});
+      vobj->touch();
       //std::cout << vobj->properties["volmax"] << std::endl;
     }
 
@@ -1460,7 +1465,10 @@ void LavaVu::readOBJ(const FilePath& fn)
     if (!geom)
     {
       if (!tobj->properties.has("renderer"))
+      {
         tobj->properties.data["renderer"] = renderer;
+        tobj->touch();
+      }
       geom = amodel->lookupObjectRenderer(tobj);
       if (!geom) return;
     }
@@ -2452,11 +2460,11 @@ void LavaVu::drawRulers()
   rulers->setup(aview);
   if (!aview->hasObject(obj)) aview->addObject(obj);
   rulers->add(obj);
-  obj->properties.data["linewidth"] = (float)aview->properties["rulerwidth"];
-  obj->properties.data["scalelines"] = 1.0;
-  obj->properties.data["fontscale"] = (float)obj->properties["fontscale"] * (float)aview->properties["rulerscale"];
+  obj->setProperty("linewidth", (float)aview->properties["rulerwidth"]);
+  obj->setProperty("scalelines", 1.0);
+  obj->setProperty("fontscale", (float)obj->properties["fontscale"] * (float)aview->properties["rulerscale"]);
   //Colour for labels
-  obj->properties.data["colour"] = aview->textColour.toJson();
+  obj->setProperty("colour", aview->textColour.toJson());
 
   int ticks = aview->properties["rulerticks"];
   json labels = aview->properties["rulerlabels"];
@@ -2647,7 +2655,7 @@ void LavaVu::drawBorder()
                                {"link", true}, {"loop", true}, {"depthtest", false},
                                {"linewidth" , 1.0}, {"scalelines" , 1.0}});
     }
-    obj->properties.data["colour"] = aview->properties["bordercolour"];
+    obj->setProperty("colour", aview->properties["bordercolour"]);
     // The 2d bounding box of model
     GLfloat minw[3], maxw[3];
     int viewport[4];
@@ -2700,10 +2708,17 @@ void LavaVu::drawBorder()
         border->setup(aview);
       }
 
-      obj->properties.replace({{"clip", false}, {"opacity", 1.0}, {"alpha", 1.0}, {"scalelines" , 1.0},
-                               {"fixed", true},
-                               {"flat", true}, {"cullface", true}, {"wireframe", false}, {"depthtest", true},
-                               {"link", true}, {"loop", true}, {"tubes", true}, {"lit", false}});
+      json props = {{"clip", false}, {"opacity", 1.0}, {"alpha", 1.0}, {"scalelines" , 1.0},
+                    {"fixed", true},
+                    {"flat", true}, {"cullface", true}, {"wireframe", false}, {"depthtest", true},
+                    {"link", true}, {"loop", true}, {"tubes", true}, {"lit", false},
+                    {"colour", aview->properties["bordercolour"]}, {"linewidth", bordersize}};
+      //Only flag as modified when the border settings change, not on every redraw
+      if (obj->properties.data != props)
+      {
+        obj->properties.replace(props);
+        obj->touch();
+      }
       border->primitive = GL_LINE_LOOP; //Has no effect except changing the vertices generated by drawCuboid
     }
     else
@@ -2721,8 +2736,8 @@ void LavaVu::drawBorder()
       border->primitive = GL_TRIANGLE_STRIP;
     }
 
-    obj->properties.data["colour"] = aview->properties["bordercolour"];
-    obj->properties.data["linewidth"] = bordersize;
+    obj->setProperty("colour", aview->properties["bordercolour"]);
+    obj->setProperty("linewidth", bordersize);
 
     // Draw model bounding box with optional filled background surface
     Quaternion qrot;
@@ -3387,6 +3402,22 @@ std::string LavaVu::getState()
   return amodel->jsonWrite();
 }
 
+std::string LavaVu::getStateChanges(unsigned int since)
+{
+  if (!amodel) return "{}";
+  //Export state changed since previous change count
+  std::ostringstream json;
+  amodel->jsonChanges(json, since);
+  return json.str();
+}
+
+unsigned int LavaVu::getStateVersion()
+{
+  //Change count, only increases when the state has been modified
+  if (!amodel) return 0;
+  return amodel->stateVersion();
+}
+
 std::string LavaVu::getTimeSteps()
 {
   if (!amodel) return "[]";
@@ -3400,6 +3431,44 @@ std::string LavaVu::getTimeSteps()
   return ss.str();
 }
 
+std::string LavaVu::getCacheInfo()
+{
+  if (!amodel) return "{}";
+  std::stringstream ss;
+  ss << amodel->cacheInfo();
+  return ss.str();
+}
+
+bool LavaVu::exportDatabase(std::string args)
+{
+  //Run the export command (python binding releases the GIL, so progress can be polled while writing)
+  return parseCommands("export " + args);
+}
+
+std::string LavaVu::getWriteProgress()
+{
+  if (!amodel) return "{}";
+  std::stringstream ss;
+  ss << amodel->writeProgress();
+  return ss.str();
+}
+
+std::string LavaVu::getSortInfo()
+{
+  //Depth sort timing of each renderer by geometry type
+  if (!amodel) return "{}";
+  json info = json::object();
+  for (auto g : amodel->geometry)
+  {
+    json gi = g->sortInfo();
+    if (!gi.is_null())
+      info[GeomData::names[g->type]] = gi;
+  }
+  std::stringstream ss;
+  ss << info;
+  return ss.str();
+}
+
 void LavaVu::addTimeStep(int step, std::string properties)
 {
   if (!amodel) return;
@@ -3432,6 +3501,7 @@ void LavaVu::setObject(DrawingObject* target, std::string properties)
   //Parse and merge property strings
   session.parseSet(target->properties, properties);
   target->setup();
+  target->touch();
 }
 
 DrawingObject* LavaVu::createObject(std::string properties)
@@ -3960,6 +4030,7 @@ DrawingObject* LavaVu::contour(DrawingObject* target, DrawingObject* source, std
   if (grids && lines)
     grids->contour(lines, source, target, clearsurf);
   target->properties.data["renderer"] = "lines";
+  target->touch();
   return target;
 }
 
@@ -3985,6 +4056,7 @@ DrawingObject* LavaVu::isoSurface(DrawingObject* target, DrawingObject* source,
   if (volumes && tris)
     volumes->isosurface(tris, source, target, clearvol);
   target->properties.data["renderer"] = "triangles";
+  target->touch();
   return target;
 }
 
@@ -135,7 +135,7 @@ public:
   void gui_sync();
   std::string exportData(lucExportType type, std::vector<DrawingObject*> list, std::string filename="exported.gldb");
 
-  void parseProperties(std::string& properties, DrawingObject* obj=NULL);
+  void parseProperties(std::string properties, DrawingObject* obj=NULL);
   bool parseProperty(std::string data, DrawingObject* obj=NULL);
   void applyReload(DrawingObject*, int reload);
   void printProperties();
@@ -233,7 +233,13 @@ public:
   DrawingObject* colourBar(DrawingObject* obj=NULL);
   void setState(std::string state);
   std::string getState();
+  std::string getStateChanges(unsigned int since=0);
+  unsigned int getStateVersion();
   std::string getTimeSteps();
+  std::string getCacheInfo();
+  bool exportDatabase(std::string args);
+  std::string getWriteProgress();
+  std::string getSortInfo();
   void addTimeStep(int step, std::string properties="");
   void addViewport(float x, float y, float w, float h, bool replace, std::string properties);
 
@@ -132,6 +132,7 @@ public:
   unsigned int width;
   unsigned int height;
   unsigned int depth;
+  unsigned int version; //Change counter, incremented when data modified
   int step; //Timestep
   lucGeometryType type;   //Holds the object type
   GeomData(DrawingObject* draw, lucGeometryType type);
@@ -160,6 +161,7 @@ public:
   void printall(const std::string& str);
   bool loadFile(const std::string& file);
   bool parseProperty(std::string data, DrawingObject* obj=NULL);
+  void parseProperties(std::string properties, DrawingObject* obj=NULL);
   bool parseCommands(std::string cmd);
   std::string gl_version();
   std::string image(std::string filename="", int width=0, int height=0, int jpegquality=0, bool transparent=false);
@@ -176,7 +178,13 @@ public:
   DrawingObject* colourBar(DrawingObject* obj=NULL);
   void setState(std::string state);
   std::string getState();
+  std::string getStateChanges(unsigned int since=0);
+  unsigned int getStateVersion();
   std::string getTimeSteps();
+  std::string getCacheInfo();
+  bool exportDatabase(std::string args);
+  std::string getWriteProgress();
+  std::string getSortInfo();
   void addTimeStep(int step, std::string properties="");
 
   void resetViews(bool autozoom=false);
@@ -245,6 +253,35 @@ public:
 
 std::string rawImageWrite(unsigned char* array, int height, int width, int depth, std::string path, int jpegquality=0);
 
+//Export without holding the GIL so write progress can be read from another thread
+%exception LavaVu::exportDatabase {
+  std::string error;
+  Py_BEGIN_ALLOW_THREADS
+  try {
+    $action
+  } catch (const std::runtime_error& e) {
+    error = e.what();
+  }
+  Py_END_ALLOW_THREADS
+  if (error.length())
+    SWIG_exception(SWIG_RuntimeError, error.c_str());
+}
+
+//Encode without holding the GIL so frames can be encoded on a worker thread
+//while the render thread continues
+%exception VideoEncoder::copyframe {
+  std::string error;
+  Py_BEGIN_ALLOW_THREADS
+  try {
+    $action
+  } catch (const std::runtime_error& e) {
+    error = e.what();
+  }
+  Py_END_ALLOW_THREADS
+  if (error.length())
+    SWIG_exception(SWIG_RuntimeError, error.c_str());
+}
+
 class VideoEncoder
 {
 public:
@@ -21320,6 +21320,84 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_GeomData_version_set(PyObject *self, PyObject *args) {
+  PyObject *resultobj = 0;
+  GeomData *arg1 = (GeomData *) 0 ;
+  unsigned int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  std::shared_ptr< GeomData > tempshared1 ;
+  std::shared_ptr< GeomData > *smartarg1 = 0 ;
+  unsigned int val2 ;
+  int ecode2 = 0 ;
+  PyObject *swig_obj[2] ;
+  
+  (void)self;
+  if (!SWIG_Python_UnpackTuple(args, "GeomData_version_set", 2, 2, swig_obj)) SWIG_fail;
+  {
+    int newmem = 0;
+    res1 = SWIG_ConvertPtrAndOwn(swig_obj[0], &argp1, SWIGTYPE_p_std__shared_ptrT_GeomData_t, 0 |  0 , &newmem);
+    if (!SWIG_IsOK(res1)) {
+      SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GeomData_version_set" "', argument " "1"" of type '" "GeomData *""'");
+    }
+    if (newmem & SWIG_CAST_NEW_MEMORY) {
+      tempshared1 = *reinterpret_cast< std::shared_ptr<  GeomData > * >(argp1);
+      delete reinterpret_cast< std::shared_ptr<  GeomData > * >(argp1);
+      arg1 = const_cast< GeomData * >(tempshared1.get());
+    } else {
+      smartarg1 = reinterpret_cast< std::shared_ptr<  GeomData > * >(argp1);
+      arg1 = const_cast< GeomData * >((smartarg1 ? smartarg1->get() : 0));
+    }
+  }
+  ecode2 = SWIG_AsVal_unsigned_SS_int(swig_obj[1], &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GeomData_version_set" "', argument " "2"" of type '" "unsigned int""'");
+  } 
+  arg2 = static_cast< unsigned int >(val2);
+  if (arg1) (arg1)->version = arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GeomData_version_get(PyObject *self, PyObject *args) {
+  PyObject *resultobj = 0;
+  GeomData *arg1 = (GeomData *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  std::shared_ptr< GeomData > tempshared1 ;
+  std::shared_ptr< GeomData > *smartarg1 = 0 ;
+  PyObject *swig_obj[1] ;
+  unsigned int result;
+  
+  (void)self;
+  if (!args) SWIG_fail;
+  swig_obj[0] = args;
+  {
+    int newmem = 0;
+    res1 = SWIG_ConvertPtrAndOwn(swig_obj[0], &argp1, SWIGTYPE_p_std__shared_ptrT_GeomData_t, 0 |  0 , &newmem);
+    if (!SWIG_IsOK(res1)) {
+      SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GeomData_version_get" "', argument " "1"" of type '" "GeomData *""'");
+    }
+    if (newmem & SWIG_CAST_NEW_MEMORY) {
+      tempshared1 = *reinterpret_cast< std::shared_ptr<  GeomData > * >(argp1);
+      delete reinterpret_cast< std::shared_ptr<  GeomData > * >(argp1);
+      arg1 = const_cast< GeomData * >(tempshared1.get());
+    } else {
+      smartarg1 = reinterpret_cast< std::shared_ptr<  GeomData > * >(argp1);
+      arg1 = const_cast< GeomData * >((smartarg1 ? smartarg1->get() : 0));
+    }
+  }
+  result = (unsigned int) ((arg1)->version);
+  resultobj = SWIG_From_unsigned_SS_int(static_cast< unsigned int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_GeomData_step_set(PyObject *self, PyObject *args) {
   PyObject *resultobj = 0;
   GeomData *arg1 = (GeomData *) 0 ;
@@ -22462,6 +22540,116 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_LavaVu_parseProperties__SWIG_0(PyObject *self, Py_ssize_t nobjs, PyObject **swig_obj) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  std::string arg2 ;
+  DrawingObject *arg3 = (DrawingObject *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp3 = 0 ;
+  int res3 = 0 ;
+  
+  (void)self;
+  if ((nobjs < 3) || (nobjs > 3)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_parseProperties" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  {
+    std::string *ptr = (std::string *)0;
+    int res = SWIG_AsPtr_std_string(swig_obj[1], &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "LavaVu_parseProperties" "', argument " "2"" of type '" "std::string""'"); 
+    }
+    arg2 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  res3 = SWIG_ConvertPtr(swig_obj[2], &argp3,SWIGTYPE_p_DrawingObject, 0 |  0 );
+  if (!SWIG_IsOK(res3)) {
+    SWIG_exception_fail(SWIG_ArgError(res3), "in method '" "LavaVu_parseProperties" "', argument " "3"" of type '" "DrawingObject *""'"); 
+  }
+  arg3 = reinterpret_cast< DrawingObject * >(argp3);
+  {
+    try {
+      (arg1)->parseProperties(arg2,arg3);
+    } catch (const std::runtime_error& e) {
+      SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+  }
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_LavaVu_parseProperties__SWIG_1(PyObject *self, Py_ssize_t nobjs, PyObject **swig_obj) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  std::string arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  
+  (void)self;
+  if ((nobjs < 2) || (nobjs > 2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_parseProperties" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  {
+    std::string *ptr = (std::string *)0;
+    int res = SWIG_AsPtr_std_string(swig_obj[1], &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "LavaVu_parseProperties" "', argument " "2"" of type '" "std::string""'"); 
+    }
+    arg2 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  {
+    try {
+      (arg1)->parseProperties(arg2);
+    } catch (const std::runtime_error& e) {
+      SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+  }
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_LavaVu_parseProperties(PyObject *self, PyObject *args) {
+  Py_ssize_t argc;
+  PyObject *argv[4] = {
+    0
+  };
+  
+  if (!(argc = SWIG_Python_UnpackTuple(args, "LavaVu_parseProperties", 0, 3, argv))) SWIG_fail;
+  --argc;
+  if (argc == 2) {
+    PyObject *retobj = _wrap_LavaVu_parseProperties__SWIG_1(self, argc, argv);
+    if (!SWIG_Python_TypeErrorOccurred(retobj)) return retobj;
+    SWIG_fail;
+  }
+  if (argc == 3) {
+    PyObject *retobj = _wrap_LavaVu_parseProperties__SWIG_0(self, argc, argv);
+    if (!SWIG_Python_TypeErrorOccurred(retobj)) return retobj;
+    SWIG_fail;
+  }
+  
+fail:
+  SWIG_Python_RaiseOrModifyTypeError("Wrong number or type of arguments for overloaded function 'LavaVu_parseProperties'.\n"
+    "  Possible C/C++ prototypes are:\n"
+    "    LavaVu::parseProperties(std::string,DrawingObject *)\n"
+    "    LavaVu::parseProperties(std::string)\n");
+  return 0;
+}
+
+
 SWIGINTERN PyObject *_wrap_LavaVu_parseCommands(PyObject *self, PyObject *args) {
   PyObject *resultobj = 0;
   LavaVu *arg1 = (LavaVu *) 0 ;
@@ -24495,6 +24683,128 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_LavaVu_getStateChanges__SWIG_0(PyObject *self, Py_ssize_t nobjs, PyObject **swig_obj) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  unsigned int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  unsigned int val2 ;
+  int ecode2 = 0 ;
+  std::string result;
+  
+  (void)self;
+  if ((nobjs < 2) || (nobjs > 2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_getStateChanges" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  ecode2 = SWIG_AsVal_unsigned_SS_int(swig_obj[1], &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "LavaVu_getStateChanges" "', argument " "2"" of type '" "unsigned int""'");
+  } 
+  arg2 = static_cast< unsigned int >(val2);
+  {
+    try {
+      result = (arg1)->getStateChanges(arg2);
+    } catch (const std::runtime_error& e) {
+      SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+  }
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_LavaVu_getStateChanges__SWIG_1(PyObject *self, Py_ssize_t nobjs, PyObject **swig_obj) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  std::string result;
+  
+  (void)self;
+  if ((nobjs < 1) || (nobjs > 1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_getStateChanges" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  {
+    try {
+      result = (arg1)->getStateChanges();
+    } catch (const std::runtime_error& e) {
+      SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+  }
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_LavaVu_getStateChanges(PyObject *self, PyObject *args) {
+  Py_ssize_t argc;
+  PyObject *argv[3] = {
+    0
+  };
+  
+  if (!(argc = SWIG_Python_UnpackTuple(args, "LavaVu_getStateChanges", 0, 2, argv))) SWIG_fail;
+  --argc;
+  if (argc == 1) {
+    PyObject *retobj = _wrap_LavaVu_getStateChanges__SWIG_1(self, argc, argv);
+    if (!SWIG_Python_TypeErrorOccurred(retobj)) return retobj;
+    SWIG_fail;
+  }
+  if (argc == 2) {
+    PyObject *retobj = _wrap_LavaVu_getStateChanges__SWIG_0(self, argc, argv);
+    if (!SWIG_Python_TypeErrorOccurred(retobj)) return retobj;
+    SWIG_fail;
+  }
+  
+fail:
+  SWIG_Python_RaiseOrModifyTypeError("Wrong number or type of arguments for overloaded function 'LavaVu_getStateChanges'.\n"
+    "  Possible C/C++ prototypes are:\n"
+    "    LavaVu::getStateChanges(unsigned int)\n"
+    "    LavaVu::getStateChanges()\n");
+  return 0;
+}
+
+
+SWIGINTERN PyObject *_wrap_LavaVu_getStateVersion(PyObject *self, PyObject *args) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *swig_obj[1] ;
+  unsigned int result;
+  
+  (void)self;
+  if (!args) SWIG_fail;
+  swig_obj[0] = args;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_getStateVersion" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  {
+    try {
+      result = (arg1)->getStateVersion();
+    } catch (const std::runtime_error& e) {
+      SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+  }
+  resultobj = SWIG_From_unsigned_SS_int(static_cast< unsigned int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_LavaVu_getTimeSteps(PyObject *self, PyObject *args) {
   PyObject *resultobj = 0;
   LavaVu *arg1 = (LavaVu *) 0 ;
@@ -24525,6 +24835,140 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_LavaVu_getCacheInfo(PyObject *self, PyObject *args) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *swig_obj[1] ;
+  std::string result;
+  
+  (void)self;
+  if (!args) SWIG_fail;
+  swig_obj[0] = args;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_getCacheInfo" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  {
+    try {
+      result = (arg1)->getCacheInfo();
+    } catch (const std::runtime_error& e) {
+      SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+  }
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_LavaVu_exportDatabase(PyObject *self, PyObject *args) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  std::string arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *swig_obj[2] ;
+  bool result;
+  
+  (void)self;
+  if (!SWIG_Python_UnpackTuple(args, "LavaVu_exportDatabase", 2, 2, swig_obj)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_exportDatabase" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  {
+    std::string *ptr = (std::string *)0;
+    int res = SWIG_AsPtr_std_string(swig_obj[1], &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "LavaVu_exportDatabase" "', argument " "2"" of type '" "std::string""'"); 
+    }
+    arg2 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  {
+    std::string error;
+    Py_BEGIN_ALLOW_THREADS
+    try {
+      result = (bool)(arg1)->exportDatabase(arg2);
+    } catch (const std::runtime_error& e) {
+      error = e.what();
+    }
+    Py_END_ALLOW_THREADS
+    if (error.length())
+    SWIG_exception(SWIG_RuntimeError, error.c_str());
+  }
+  resultobj = SWIG_From_bool(static_cast< bool >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_LavaVu_getWriteProgress(PyObject *self, PyObject *args) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *swig_obj[1] ;
+  std::string result;
+  
+  (void)self;
+  if (!args) SWIG_fail;
+  swig_obj[0] = args;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_getWriteProgress" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  {
+    try {
+      result = (arg1)->getWriteProgress();
+    } catch (const std::runtime_error& e) {
+      SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+  }
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_LavaVu_getSortInfo(PyObject *self, PyObject *args) {
+  PyObject *resultobj = 0;
+  LavaVu *arg1 = (LavaVu *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject *swig_obj[1] ;
+  std::string result;
+  
+  (void)self;
+  if (!args) SWIG_fail;
+  swig_obj[0] = args;
+  res1 = SWIG_ConvertPtr(swig_obj[0], &argp1,SWIGTYPE_p_LavaVu, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "LavaVu_getSortInfo" "', argument " "1"" of type '" "LavaVu *""'"); 
+  }
+  arg1 = reinterpret_cast< LavaVu * >(argp1);
+  {
+    try {
+      result = (arg1)->getSortInfo();
+    } catch (const std::runtime_error& e) {
+      SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+  }
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_LavaVu_addTimeStep__SWIG_0(PyObject *self, Py_ssize_t nobjs, PyObject **swig_obj) {
   PyObject *resultobj = 0;
   LavaVu *arg1 = (LavaVu *) 0 ;
@@ -32111,11 +32555,16 @@ SWIGINTERN PyObject *_wrap_VideoEncoder_copyframe(PyObject *self, PyObject *args
     arg3 = (int) array_size(array2,0);
   }
   {
+    std::string error;
+    Py_BEGIN_ALLOW_THREADS
     try {
       (arg1)->copyframe(arg2,arg3);
     } catch (const std::runtime_error& e) {
-      SWIG_exception(SWIG_RuntimeError, e.what());
+      error = e.what();
     }
+    Py_END_ALLOW_THREADS
+    if (error.length())
+    SWIG_exception(SWIG_RuntimeError, error.c_str());
   }
   resultobj = SWIG_Py_Void();
   {
@@ -32442,6 +32891,8 @@ static PyMethodDef SwigMethods[] = {
 	 { "GeomData_height_get", _wrap_GeomData_height_get, METH_O, NULL},
 	 { "GeomData_depth_set", _wrap_GeomData_depth_set, METH_VARARGS, NULL},
 	 { "GeomData_depth_get", _wrap_GeomData_depth_get, METH_O, NULL},
+	 { "GeomData_version_set", _wrap_GeomData_version_set, METH_VARARGS, NULL},
+	 { "GeomData_version_get", _wrap_GeomData_version_get, METH_O, NULL},
 	 { "GeomData_step_set", _wrap_GeomData_step_set, METH_VARARGS, NULL},
 	 { "GeomData_step_get", _wrap_GeomData_step_get, METH_O, NULL},
 	 { "GeomData_type_set", _wrap_GeomData_type_set, METH_VARARGS, NULL},
@@ -32472,6 +32923,7 @@ static PyMethodDef SwigMethods[] = {
 	 { "LavaVu_printall", _wrap_LavaVu_printall, METH_VARARGS, NULL},
 	 { "LavaVu_loadFile", _wrap_LavaVu_loadFile, METH_VARARGS, NULL},
 	 { "LavaVu_parseProperty", _wrap_LavaVu_parseProperty, METH_VARARGS, NULL},
+	 { "LavaVu_parseProperties", _wrap_LavaVu_parseProperties, METH_VARARGS, NULL},
 	 { "LavaVu_parseCommands", _wrap_LavaVu_parseCommands, METH_VARARGS, NULL},
 	 { "LavaVu_gl_version", _wrap_LavaVu_gl_version, METH_O, NULL},
 	 { "LavaVu_image", _wrap_LavaVu_image, METH_VARARGS, NULL},
@@ -32487,7 +32939,13 @@ static PyMethodDef SwigMethods[] = {
 	 { "LavaVu_colourBar", _wrap_LavaVu_colourBar, METH_VARARGS, NULL},
 	 { "LavaVu_setState", _wrap_LavaVu_setState, METH_VARARGS, NULL},
 	 { "LavaVu_getState", _wrap_LavaVu_getState, METH_O, NULL},
+	 { "LavaVu_getStateChanges", _wrap_LavaVu_getStateChanges, METH_VARARGS, NULL},
+	 { "LavaVu_getStateVersion", _wrap_LavaVu_getStateVersion, METH_O, NULL},
 	 { "LavaVu_getTimeSteps", _wrap_LavaVu_getTimeSteps, METH_O, NULL},
+	 { "LavaVu_getCacheInfo", _wrap_LavaVu_getCacheInfo, METH_O, NULL},
+	 { "LavaVu_exportDatabase", _wrap_LavaVu_exportDatabase, METH_VARARGS, NULL},
+	 { "LavaVu_getWriteProgress", _wrap_LavaVu_getWriteProgress, METH_O, NULL},
+	 { "LavaVu_getSortInfo", _wrap_LavaVu_getSortInfo, METH_O, NULL},
 	 { "LavaVu_addTimeStep", _wrap_LavaVu_addTimeStep, METH_VARARGS, NULL},
 	 { "LavaVu_resetViews", _wrap_LavaVu_resetViews, METH_VARARGS, NULL},
 	 { "LavaVu_addViewport", _wrap_LavaVu_addViewport, METH_VARARGS, NULL},
@@ -32847,6 +33305,8 @@ static PyMethodDef SwigMethods_proxydocs[] = {
 	 { "GeomData_height_get", _wrap_GeomData_height_get, METH_O, NULL},
 	 { "GeomData_depth_set", _wrap_GeomData_depth_set, METH_VARARGS, NULL},
 	 { "GeomData_depth_get", _wrap_GeomData_depth_get, METH_O, NULL},
+	 { "GeomData_version_set", _wrap_GeomData_version_set, METH_VARARGS, NULL},
+	 { "GeomData_version_get", _wrap_GeomData_version_get, METH_O, NULL},
 	 { "GeomData_step_set", _wrap_GeomData_step_set, METH_VARARGS, NULL},
 	 { "GeomData_step_get", _wrap_GeomData_step_get, METH_O, NULL},
 	 { "GeomData_type_set", _wrap_GeomData_type_set, METH_VARARGS, NULL},
@@ -32877,6 +33337,7 @@ static PyMethodDef SwigMethods_proxydocs[] = {
 	 { "LavaVu_printall", _wrap_LavaVu_printall, METH_VARARGS, NULL},
 	 { "LavaVu_loadFile", _wrap_LavaVu_loadFile, METH_VARARGS, NULL},
 	 { "LavaVu_parseProperty", _wrap_LavaVu_parseProperty, METH_VARARGS, NULL},
+	 { "LavaVu_parseProperties", _wrap_LavaVu_parseProperties, METH_VARARGS, NULL},
 	 { "LavaVu_parseCommands", _wrap_LavaVu_parseCommands, METH_VARARGS, NULL},
 	 { "LavaVu_gl_version", _wrap_LavaVu_gl_version, METH_O, NULL},
 	 { "LavaVu_image", _wrap_LavaVu_image, METH_VARARGS, NULL},
@@ -32892,7 +33353,13 @@ static PyMethodDef SwigMethods_proxydocs[] = {
 	 { "LavaVu_colourBar", _wrap_LavaVu_colourBar, METH_VARARGS, NULL},
 	 { "LavaVu_setState", _wrap_LavaVu_setState, METH_VARARGS, NULL},
 	 { "LavaVu_getState", _wrap_LavaVu_getState, METH_O, NULL},
+	 { "LavaVu_getStateChanges", _wrap_LavaVu_getStateChanges, METH_VARARGS, NULL},
+	 { "LavaVu_getStateVersion", _wrap_LavaVu_getStateVersion, METH_O, NULL},
 	 { "LavaVu_getTimeSteps", _wrap_LavaVu_getTimeSteps, METH_O, NULL},
+	 { "LavaVu_getCacheInfo", _wrap_LavaVu_getCacheInfo, METH_O, NULL},
+	 { "LavaVu_exportDatabase", _wrap_LavaVu_exportDatabase, METH_VARARGS, NULL},
+	 { "LavaVu_getWriteProgress", _wrap_LavaVu_getWriteProgress, METH_O, NULL},
+	 { "LavaVu_getSortInfo", _wrap_LavaVu_getSortInfo, METH_O, NULL},
 	 { "LavaVu_addTimeStep", _wrap_LavaVu_addTimeStep, METH_VARARGS, NULL},
 	 { "LavaVu_resetViews", _wrap_LavaVu_resetViews, METH_VARARGS, NULL},
 	 { "LavaVu_addViewport", _wrap_LavaVu_addViewport, METH_VARARGS, NULL},
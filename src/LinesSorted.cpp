@@ -256,7 +256,8 @@ void LinesSorted::sort()
       opaqueCount++;
   }
   t2 = clock();
-  debug_print("  %.4lf seconds to calculate distances\n", (t2-t1)/(double)CLOCKS_PER_SEC);
+  sorter.distances = (t2-t1)/(double)CLOCKS_PER_SEC;
+  debug_print("  %.4lf seconds to calculate distances\n", sorter.distances);
   t1 = clock();
 
   //Skip sort if all opaque
@@ -276,9 +277,9 @@ void LinesSorted::sort()
   if (view->is3d)
   {
     //Depth sort using 2-byte key radix sort, 10 times faster than equivalent quicksort
-    sorter.sort(linecount);
-    t2 = clock();
-    debug_print("  %.4lf seconds to sort %d lines\n", (t2-t1)/(double)CLOCKS_PER_SEC, linecount);
+    //Incremental, starts from the previous order, falls back to radix sort if too many are out of place
+    sorter.sort(linecount, session.global("sortthreshold"));
+    debug_print("  %.4lf seconds to sort %d lines (%s)\n", sorter.last[sorter.path], linecount, sorter.pathName(sorter.path));
   }
 
   //Lock the update mutex, to allow updating the indexlist and prevent access while drawing
@@ -301,6 +302,13 @@ void LinesSorted::sort()
   sorter.changed = true;
 }
 
+json LinesSorted::sortInfo()
+{
+  //Depth sort timing per path, see SortData
+  LOCK_GUARD(sortmutex);
+  return sorter.info();
+}
+
 //Reloads triangle indices, required after data update and depth sort
 void LinesSorted::render()
 {
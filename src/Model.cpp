@@ -201,6 +201,366 @@ bool Database::issue(const char* fmt, ...)
   return true;
 }
 
+//Select geometry records from db matching filter
+static sqlite3_stmt* selectGeometry(Database& db, const char* prefix, const char* filter)
+{
+  //object (id, name, colourmap_id, colour, opacity, wireframe, cullface, scaling, lineWidth, arrowHead, flat, steps, time)
+  //geometry (id, object_id, timestep, rank, idx, type, data_type, size, count, width, minimum, maximum, dim_factor, units, labels,
+  //minX, minY, minZ, maxX, maxY, maxZ, data)
+  sqlite3_stmt* statement = db.select("SELECT id,object_id,timestep,rank,idx,type,data_type,size,count,width,minimum,maximum,dim_factor,units,labels,minX,minY,minZ,maxX,maxY,maxZ,data FROM %sgeometry WHERE %s ORDER BY timestep,object_id", prefix, filter);
+
+  //Old database compatibility
+  if (statement == NULL)
+  {
+    //object (id, name, colourmap_id, colour, opacity, wireframe, cullface, scaling, lineWidth, arrowHead, flat, steps, time)
+    //geometry (id, object_id, timestep, rank, idx, type, data_type, size, count, width, minimum, maximum, dim_factor, units, data)
+    statement = db.select("SELECT id,object_id,timestep,rank,idx,type,data_type,size,count,width,minimum,maximum,dim_factor,units,labels,NULL,NULL,NULL,NULL,NULL,NULL,data FROM %sgeometry WHERE %s ORDER BY timestep,object_id", prefix, filter);
+    printf("Using legacy GLDB format\n");
+  }
+
+  return statement;
+}
+
+void GeometryRecord::fetch(sqlite3_stmt* statement)
+{
+  //Copy the record fields and data out of the current result row
+  object_id = sqlite3_column_int(statement, 1);
+  timestep = sqlite3_column_int(statement, 2);
+  height = sqlite3_column_int(statement, 3);  //unused - was rank, now height
+  depth = sqlite3_column_int(statement, 4); //unused - was idx, now depth
+  type = (lucGeometryType)sqlite3_column_int(statement, 5);
+  data_type = (lucGeometryDataType)sqlite3_column_int(statement, 6);
+  size = sqlite3_column_int(statement, 7);
+  count = sqlite3_column_int(statement, 8);
+  width = sqlite3_column_int(statement, 9);
+  minimum = (float)sqlite3_column_double(statement, 10);
+  maximum = (float)sqlite3_column_double(statement, 11);
+  //Units field repurposed for data label
+  const char *label = (const char*)sqlite3_column_text(statement, 13);
+  data_label = label ? label : "";
+  const char *text = (const char*)sqlite3_column_text(statement, 14);
+  haslabels = text != NULL;
+  labels = text ? text : "";
+
+  //Min/max vertex if provided
+  hasbounds = sqlite3_column_type(statement, 15) != SQLITE_NULL;
+  for (int i=0; i<3; i++)
+  {
+    min[i] = hasbounds ? (float)sqlite3_column_double(statement, 15+i) : 0.0;
+    max[i] = hasbounds ? (float)sqlite3_column_double(statement, 18+i) : 0.0;
+  }
+
+  const unsigned char *blob = (const unsigned char*)sqlite3_column_blob(statement, 21);
+  unsigned int bytes = sqlite3_column_bytes(statement, 21);
+  data.assign(blob, blob + bytes);
+}
+
+void GeometryRecord::decode()
+{
+  //Decompress the data if stored compressed
+  unsigned long dst_len = (unsigned long)(count * GeomData::byteSize(data_type));
+  if (data.size() == dst_len) return;
+
+  unsigned long uncomp_len = dst_len;
+  unsigned long cmp_len = data.size();
+  std::vector<unsigned char> buffer(dst_len);
+
+#ifdef USE_ZLIB
+  int res = uncompress(buffer.data(), &uncomp_len, data.data(), cmp_len);
+  if (res != Z_OK || dst_len != uncomp_len)
+#else
+  int res = tinfl_decompress_mem_to_mem(buffer.data(), uncomp_len, data.data(), cmp_len, TINFL_FLAG_PARSE_ZLIB_HEADER);
+  if (!res)
+#endif
+  {
+    abort_program("uncompress() failed! error code %d\n", res);
+    //abort_program("uncompress() failed! error code %d expected size %d actual size %d\n", res, dst_len, uncomp_len);
+  }
+  data.swap(buffer);
+}
+
+void GeometryRecord::encode()
+{
+  //Compress the source data if enabled and > 1kb, only kept if smaller
+  data.clear();
+  if (compression == Z_NO_COMPRESSION || srclen <= 1000) return;
+  unsigned long cmp_len = compressBound(srclen);
+  data.resize(cmp_len);
+  if (compress2(data.data(), &cmp_len, (const unsigned char *)source, srclen, compression) != Z_OK)
+    abort_program("Compress database buffer failed!\n");
+  if (cmp_len >= srclen)
+    data.clear();
+  else
+    data.resize(cmp_len);
+}
+
+void GeometryRecord::insert(sqlite3_stmt* statement)
+{
+  //Bind the record fields and data to a prepared insert statement and execute
+  sqlite3_bind_int(statement, 1, object_id);
+  sqlite3_bind_int(statement, 2, timestep);
+  sqlite3_bind_int(statement, 3, height);
+  sqlite3_bind_int(statement, 4, depth);
+  sqlite3_bind_int(statement, 5, type);
+  sqlite3_bind_int(statement, 6, data_type);
+  sqlite3_bind_int(statement, 7, size);
+  sqlite3_bind_int(statement, 8, count);
+  sqlite3_bind_int(statement, 9, width);
+  sqlite3_bind_double(statement, 10, minimum);
+  sqlite3_bind_double(statement, 11, maximum);
+  sqlite3_bind_double(statement, 12, 0.0);
+  sqlite3_bind_text(statement, 13, data_label.c_str(), data_label.length(), SQLITE_STATIC);
+  for (int c=0; c<3; c++)
+  {
+    sqlite3_bind_double(statement, 14+c, min[c]);
+    sqlite3_bind_double(statement, 17+c, max[c]);
+  }
+
+  /* Setup text data for insert (on vertex block only) */
+  if (haslabels)
+    sqlite3_bind_text(statement, 20, labels.c_str(), labels.length(), SQLITE_STATIC);
+  else
+    sqlite3_bind_null(statement, 20);
+
+  /* Setup blob data for insert, compressed if smaller */
+  if (data.size())
+    sqlite3_bind_blob(statement, 21, data.data(), data.size(), SQLITE_STATIC);
+  else
+    sqlite3_bind_blob(statement, 21, source, srclen, SQLITE_STATIC);
+
+  /* Execute statement */
+  if (sqlite3_step(statement) != SQLITE_DONE)
+    abort_program("SQL step error: %s\n", sqlite3_errmsg(sqlite3_db_handle(statement)));
+  sqlite3_reset(statement);
+  sqlite3_clear_bindings(statement);
+}
+
+void TimeStepPrefetch::request(const FilePath& fn, std::vector<TimeStep*>& timesteps, std::vector<int>& steps, int threads)
+{
+  //Replace the queued steps, any data already read for steps no longer requested is released
+  {
+    std::unique_lock<std::mutex> lk(mutex);
+    if (fn.full != file.full)
+    {
+      //Database changed, discard everything
+      queued.clear();
+      cv.wait(lk, [&]{return loading < 0;});
+      ready.clear();
+    }
+    file = fn;
+    this->threads = threads;
+    queued.clear();
+    std::map<int, std::shared_ptr<GeometryRecords> > keep;
+    for (auto idx : steps)
+    {
+      if (ready.count(idx))
+        keep[idx] = ready[idx];
+      else if (idx != loading)
+        queued.push_back({idx, timesteps[idx]->step, timesteps[idx]->path});
+    }
+    ready.swap(keep);
+    if (queued.size() == 0) return;
+  }
+
+  if (!worker.joinable())
+  {
+    quit = false;
+    worker = std::thread(&TimeStepPrefetch::run, this);
+  }
+  cv.notify_one();
+}
+
+bool TimeStepPrefetch::take(int idx, GeometryRecords& records)
+{
+  //Get the records for a step if read already or being read now
+  std::unique_lock<std::mutex> lk(mutex);
+  cv.wait(lk, [&]{return loading != idx;});
+  auto it = ready.find(idx);
+  if (it == ready.end())
+  {
+    misses++;
+    return false;
+  }
+  records.swap(*it->second);
+  ready.erase(it);
+  hits++;
+  return true;
+}
+
+void TimeStepPrefetch::clear()
+{
+  //Discard all queued and read data, waits for any read in progress
+  std::unique_lock<std::mutex> lk(mutex);
+  queued.clear();
+  cv.wait(lk, [&]{return loading < 0;});
+  ready.clear();
+}
+
+void TimeStepPrefetch::stop()
+{
+  if (!worker.joinable()) return;
+  {
+    LOCK_GUARD(mutex);
+    quit = true;
+    queued.clear();
+  }
+  cv.notify_all();
+  worker.join();
+  ready.clear();
+}
+
+void TimeStepPrefetch::run()
+{
+  //Worker thread, opens its own read only connection to the database
+  std::unique_ptr<Database> db;
+  std::string current;
+  while (true)
+  {
+    Request request;
+    FilePath fn;
+    int nthreads;
+    {
+      std::unique_lock<std::mutex> lk(mutex);
+      cv.wait(lk, [&]{return quit || queued.size() > 0;});
+      if (quit) return;
+      request = queued.front();
+      queued.pop_front();
+      loading = request.idx;
+      fn = file;
+      nthreads = threads;
+    }
+
+    std::shared_ptr<GeometryRecords> records;
+    try
+    {
+      if (!db || current != fn.full)
+      {
+        db.reset(new Database(fn));
+        db->open();
+        current = fn.full;
+      }
+      records = read(*db, request, nthreads);
+    }
+    catch (std::exception& e)
+    {
+      //Failed steps will be loaded as usual when requested
+      debug_print("Prefetch of step %d failed: %s\n", request.step, e.what());
+    }
+
+    {
+      LOCK_GUARD(mutex);
+      if (records) ready[request.idx] = records;
+      loading = -1;
+    }
+    cv.notify_all();
+  }
+}
+
+std::shared_ptr<GeometryRecords> TimeStepPrefetch::read(Database& db, const Request& request, int threads)
+{
+  clock_t t1 = clock();
+  char filter[256];
+  std::shared_ptr<GeometryRecords> records;
+  sqlite3_stmt* statement = NULL;
+  //Step data in a separate database file? read all geometry from that file
+  FilePath steppath(request.path);
+  Database stepdb(steppath);
+  if (request.step > 0 && request.path.length() > 0)
+  {
+    if (!stepdb.open()) return records;
+    sprintf(filter, "type != %d", lucTracerType);
+    statement = selectGeometry(stepdb, "", filter);
+  }
+  else if (db)
+  {
+    sprintf(filter, "type != %d AND timestep BETWEEN %d AND %d", lucTracerType, request.step, request.step);
+    statement = selectGeometry(db, "", filter);
+  }
+  if (!statement) return records;
+
+  records = std::make_shared<GeometryRecords>();
+  int rc;
+  while ((rc = sqlite3_step(statement)) == SQLITE_ROW)
+  {
+    records->push_back(GeometryRecord());
+    records->back().fetch(statement);
+  }
+  sqlite3_finalize(statement);
+
+  //Busy or other error before all rows were read, discard the partial step
+  //(it will be loaded as usual when requested)
+  if (rc != SQLITE_DONE)
+  {
+    debug_print("Prefetch of step %d incomplete, SQL step returned %d\n", request.step, rc);
+    return nullptr;
+  }
+
+  decodeRecords(*records, threads);
+
+  debug_print("Prefetched step %d, %d records, %.4lf seconds\n", request.step, (int)records->size(), (clock()-t1)/(double)CLOCKS_PER_SEC);
+  return records;
+}
+
+//Run a function on every record using a pool of threads, 0 = one per core
+static void processRecords(GeometryRecords& records, int threads, void (GeometryRecord::*process)())
+{
+  if (threads <= 0)
+    threads = std::thread::hardware_concurrency();
+  if (threads > (int)records.size())
+    threads = records.size();
+  if (threads <= 1)
+  {
+    for (auto& r : records)
+      (r.*process)();
+    return;
+  }
+
+  //Each thread takes the next record until none left
+  std::atomic<unsigned int> next(0);
+  std::atomic<bool> failed(false);
+  std::string error;
+  std::mutex mutex;
+  auto worker = [&]()
+  {
+    unsigned int i;
+    while (!failed && (i = next++) < records.size())
+    {
+      try
+      {
+        (records[i].*process)();
+      }
+      catch (std::exception& e)
+      {
+        LOCK_GUARD(mutex);
+        error = e.what();
+        failed = true;
+      }
+    }
+  };
+
+  std::vector<std::thread> pool;
+  for (int t=1; t<threads; t++)
+    pool.push_back(std::thread(worker));
+  worker();
+  for (auto& t : pool)
+    t.join();
+
+  if (failed)
+    throw std::runtime_error(error);
+}
+
+void decodeRecords(GeometryRecords& records, int threads)
+{
+  //Decompress records using a pool of threads
+  processRecords(records, threads, &GeometryRecord::decode);
+}
+
+void encodeRecords(GeometryRecords& records, int threads)
+{
+  //Compress records using a pool of threads
+  processRecords(records, threads, &GeometryRecord::encode);
+}
+
 Model::Model(Session& session) : now(-1), session(session), figure(-1)
 {
 }
@@ -450,7 +810,10 @@ bool Model::loadFigure(int fig, bool preserveGlobals)
   if (figures.size() > 1)
   {
     for (unsigned int i=0; i < objects.size(); i++)
+    {
       objects[i]->properties.data["visible"] = false;
+      objects[i]->touch();
+    }
   }
 
   jsonRead(figures[figure]);
@@ -560,9 +923,11 @@ void Model::addObject(DrawingObject* obj)
   } while (found);
 
   obj->properties.data["name"] = name;
+  obj->touch();
 
   //Create master drawing object list entry
   objects.push_back(obj);
+  objects_version = ++session.changes;
 }
 
 //Adds colourmap
@@ -1060,6 +1425,7 @@ void Model::loadLinks()
         draw->properties.data["colourmap"] = colourMaps[colourmap_id-1]->name;
       if (data_type == lucOpacityValueData)
         draw->properties.data["opacitymap"] = colourMaps[colourmap_id-1]->name;
+      draw->touch();
     }
   }
   sqlite3_finalize(statement);
@@ -1093,6 +1459,7 @@ void Model::loadLinks(DrawingObject* obj)
         abort_program("Invalid colourmap id %d\n", colourmap_id);
       //Add colourmap to drawing object by index
       obj->properties.data["colourmap"] = colourMaps[colourmap_id-1]->name;
+      obj->touch();
     }
   }
   sqlite3_finalize(statement);
@@ -1100,6 +1467,8 @@ void Model::loadLinks(DrawingObject* obj)
 
 void Model::clearTimeSteps()
 {
+  prefetch.clear();
+  cacheClear();
   for (unsigned int idx=0; idx < timesteps.size(); idx++)
     delete timesteps[idx];
   timesteps.clear();
@@ -1354,6 +1723,111 @@ void Model::cacheLoad()
   std::cout << std::endl;
 }
 
+//Parse a memory size, number of bytes or string with units, eg: "512MB", "4GB"
+static unsigned long parseBytes(json& value)
+{
+  if (value.is_number())
+    return value;
+  if (!value.is_string())
+    return 0;
+  std::string str = value;
+  std::stringstream ss(str);
+  double size = 0;
+  std::string units;
+  ss >> size >> units;
+  std::transform(units.begin(), units.end(), units.begin(), ::toupper);
+  const char* prefixes = "KMGT";
+  if (units.length() > 0)
+  {
+    const char* p = strchr(prefixes, units[0]);
+    if (p)
+      size *= pow(1024.0, (int)(p - prefixes) + 1);
+  }
+  return (unsigned long)size;
+}
+
+void Model::cacheStep(int idx, bool loaded)
+{
+  //Update the time step data cache after changing to step idx
+  //Least recently used steps are released when the "cachesize" limit is exceeded
+  if (loaded)
+    cache_misses++;
+  else
+    cache_hits++;
+
+  //Move to most recently used
+  auto it = std::find(cached.begin(), cached.end(), idx);
+  if (it != cached.end())
+    cached.erase(it);
+  cached.push_back(idx);
+
+  //Update memory used by the step
+  if (loaded)
+  {
+    unsigned long bytes = 0;
+    for (auto g : geometry)
+      bytes += g->stepBytes(idx);
+    cachetotal = cachetotal - cachebytes[idx] + bytes;
+    cachebytes[idx] = bytes;
+  }
+
+  //Only data that can be reloaded from the database is released,
+  //steps with data added or modified since loading are kept
+  unsigned long limit = parseBytes(session.global("cachesize"));
+  if (limit == 0 || !database) return;
+  json pinned = session.global("cachepin");
+  for (auto c = cached.begin(); c != cached.end() && cachetotal > limit; )
+  {
+    int e = *c;
+    //Keep current, pinned and modified steps
+    bool keep = e == idx;
+    for (auto g : geometry)
+      if (!keep && !g->stepStored(e)) keep = true;
+    if (pinned.is_array())
+    {
+      for (auto& p : pinned)
+        if (p.is_number() && (int)p == timesteps[e]->step) keep = true;
+    }
+    if (keep)
+    {
+      c++;
+      continue;
+    }
+
+    for (auto g : geometry)
+      g->clearStep(e);
+    timesteps[e]->loaded = false;
+    cachetotal -= cachebytes[e];
+    cachebytes.erase(e);
+    c = cached.erase(c);
+    cache_evictions++;
+    debug_print("Released step %d from cache, %lu bytes cached\n", timesteps[e]->step, cachetotal);
+  }
+}
+
+void Model::cacheClear()
+{
+  cached.clear();
+  cachebytes.clear();
+  cachetotal = 0;
+}
+
+json Model::cacheInfo()
+{
+  json info;
+  info["steps"] = json::array();
+  for (auto idx : cached)
+    info["steps"].push_back(timesteps[idx]->step);
+  info["bytes"] = cachetotal;
+  info["limit"] = parseBytes(session.global("cachesize"));
+  info["hits"] = cache_hits;
+  info["misses"] = cache_misses;
+  info["evictions"] = cache_evictions;
+  info["prefetch_hits"] = prefetch.hits;
+  info["prefetch_misses"] = prefetch.misses;
+  return info;
+}
+
 //Set time step if available, otherwise return false and leave unchanged
 bool Model::hasTimeStep(int ts)
 {
@@ -1438,6 +1912,7 @@ int Model::setTimeStep(int stepidx)
     //  return -1;
     if (now < 0 || stepidx != now || session.now != now)
     {
+      int previous = now;
       //Create new geometry containers if required
       init(false);
       //Clear and tell all geometry objects they need to reload data
@@ -1460,15 +1935,23 @@ int Model::setTimeStep(int stepidx)
       session.globals["timestep"] = step(); //Save property for read access
       debug_print("TimeStep set to: %d (%d)\n", step(), stepidx);
 
+      //Data sets of all objects change with the step
+      for (auto o : objects)
+        o->touch();
+
       reload();
       
       bool clear = session.global("clearstep");
       if (clear)
+      {
         //Not caching timesteps from database, clear current step data
         clearObjects();
+        cacheClear();
+      }
 
       //Load the new step data if it isn't already in memory
-      if (clear || !timesteps[now]->loaded)
+      bool load = clear || !timesteps[now]->loaded;
+      if (load)
       {
         //Flag loaded
         timesteps[now]->loaded = true;
@@ -1479,12 +1962,20 @@ int Model::setTimeStep(int stepidx)
           //Detach any attached db file and attach n'th timestep database if available
           database.attach(timesteps[session.now]);
 
+          GeometryRecords records;
           if (session.global("cache"))
           {
             //Attempt caching all geometry from database at start
             rows += loadGeometry(0, 0, timesteps[timesteps.size()-1]->step);
             std::cout << '.' << std::flush;
           }
+          else if ((int)session.global("prefetch") > 0 && prefetch.take(now, records))
+          {
+            //Already read in background, just load (only checked when prefetching, counts hits/misses)
+            for (auto& r : records)
+              loadRecord(r);
+            rows += records.size();
+          }
           else
             rows += loadGeometry();
 
@@ -1493,6 +1984,13 @@ int Model::setTimeStep(int stepidx)
       }
       else
         debug_print("Step already cached\n");
+
+      //Track step data in memory, except when all cached on initial load
+      if (!session.global("cache"))
+        cacheStep(now, load);
+
+      //Start reading the following steps
+      prefetchSteps(stepidx, previous);
     }
   }
 
@@ -1503,6 +2001,26 @@ int Model::setTimeStep(int stepidx)
   return rows;
 }
 
+void Model::prefetchSteps(int stepidx, int previous)
+{
+  //Queue the next "prefetch" steps for reading in the background,
+  //in the direction set by "prefetchdir", or the direction of the last step change if 0
+  int count = session.global("prefetch");
+  if (count <= 0 || !database || database.memory || session.global("cache")) return;
+  int dir = session.global("prefetchdir");
+  if (dir == 0) dir = previous > stepidx ? -1 : 1;
+  bool clear = session.global("clearstep");
+  std::vector<int> steps;
+  for (int i=1; i<=count; i++)
+  {
+    int idx = stepidx + i * (dir > 0 ? 1 : -1);
+    if (idx < 0 || idx >= (int)timesteps.size()) break;
+    if (clear || !timesteps[idx]->loaded)
+      steps.push_back(idx);
+  }
+  prefetch.request(database.file, timesteps, steps, session.global("loadthreads"));
+}
+
 int Model::loadGeometry(int obj_id, int time_start, int time_stop)
 {
   if (!database)
@@ -1538,19 +2056,7 @@ int Model::loadGeometry(int obj_id, int time_start, int time_stop)
   else
     strcpy(filter, objfilter);
 
-  //object (id, name, colourmap_id, colour, opacity, wireframe, cullface, scaling, lineWidth, arrowHead, flat, steps, time)
-  //geometry (id, object_id, timestep, rank, idx, type, data_type, size, count, width, minimum, maximum, dim_factor, units, labels,
-  //minX, minY, minZ, maxX, maxY, maxZ, data)
-  sqlite3_stmt* statement = database.select("SELECT id,object_id,timestep,rank,idx,type,data_type,size,count,width,minimum,maximum,dim_factor,units,labels,minX,minY,minZ,maxX,maxY,maxZ,data FROM %sgeometry WHERE %s ORDER BY timestep,object_id", database.prefix, filter);
-
-  //Old database compatibility
-  if (statement == NULL)
-  {
-    //object (id, name, colourmap_id, colour, opacity, wireframe, cullface, scaling, lineWidth, arrowHead, flat, steps, time)
-    //geometry (id, object_id, timestep, rank, idx, type, data_type, size, count, width, minimum, maximum, dim_factor, units, data)
-    statement = database.select("SELECT id,object_id,timestep,rank,idx,type,data_type,size,count,width,minimum,maximum,dim_factor,units,labels,NULL,NULL,NULL,NULL,NULL,NULL,data FROM %sgeometry WHERE %s ORDER BY timestep,object_id", database.prefix, filter);
-    printf("Using legacy GLDB format\n");
-  }
+  sqlite3_stmt* statement = selectGeometry(database, database.prefix, filter);
 
   if (!statement) return 0;
 
@@ -1589,199 +2095,201 @@ int Model::loadFixedGeometry(int obj_id)
 
 int Model::readGeometryRecords(sqlite3_stmt* statement, bool cache)
 {
-  clock_t t1 = clock();
+  //Records are read in batches: blobs copied out of sqlite (fetch),
+  //decompressed in parallel (decode), then loaded in their original order
+  const unsigned long batchbytes = 256*1024*1024;
+  std::chrono::duration<double> fetchtime(0), decodetime(0), loadtime(0);
+  int threads = session.global("loadthreads");
   int rows = 0;
-  int tbytes = 0;
+  unsigned long tbytes = 0;
   int ret;
-  Geometry* active = NULL;
+  GeometryRecords records;
   do
   {
-    ret = sqlite3_step(statement);
-    if (ret == SQLITE_ROW)
+    //Fetch
+    auto t0 = std::chrono::steady_clock::now();
+    unsigned long bytes = 0;
+    records.clear();
+    while (bytes < batchbytes)
     {
+      ret = sqlite3_step(statement);
+      if (ret != SQLITE_ROW) break;
       rows++;
-      int object_id = sqlite3_column_int(statement, 1);
-      int timestep = sqlite3_column_int(statement, 2);
-      int height = sqlite3_column_int(statement, 3);  //unused - was rank, now height
-      int depth = sqlite3_column_int(statement, 4); //unused - was idx, now depth
-      lucGeometryType type = (lucGeometryType)sqlite3_column_int(statement, 5);
-      lucGeometryDataType data_type = (lucGeometryDataType)sqlite3_column_int(statement, 6);
-      int size = sqlite3_column_int(statement, 7);
-      int count = sqlite3_column_int(statement, 8);
-      int items = count / size;
-      int width = sqlite3_column_int(statement, 9);
-      if (height == 0) height = width > 0 ? items / width : 0;
-      float minimum = (float)sqlite3_column_double(statement, 10);
-      float maximum = (float)sqlite3_column_double(statement, 11);
-      //Clear if default
-      if (maximum - minimum == 1.0) maximum = minimum = 0.0;
-      //Units field repurposed for data label
-      const char *data_label = (const char*)sqlite3_column_text(statement, 13);
-      const char *labels = (const char*)sqlite3_column_text(statement, 14);
-
-      //printf("%d] OBJ %d STEP %d TYPE %d DTYPE %d DIMS (%d x %d x %d) COUNT %d ITEMS %d LABELS %s\n", 
-      //       rows, object_id, timestep, type, data_type, width, height, depth, count, items, labels);
-
-      const void *data = sqlite3_column_blob(statement, 21);
-      unsigned int bytes = sqlite3_column_bytes(statement, 21);
-
-      DrawingObject* obj = findObject(object_id);
 
       //Deleted or Skip object? (When noload enabled)
+      DrawingObject* obj = findObject(sqlite3_column_int(statement, 1));
       if (!obj || obj->skip) continue;
 
-      //Bulk load: switch timestep and cache if timestep changes!
-      // - disabled when using attached databases (cached in loop via cacheLoad())
-      if (cache && step() != timestep && !database.attached)
-      {
-        std::cout << '~' << std::flush;
-        if (timestep > 0 && timestep%10==0) std::cout << std::setw(4) << timestep << " " << std::flush;
-        if (timestep > 0 && timestep%50==0) std::cout << std::endl;
-        //Change active timestep
-        session.now = now = nearestTimeStep(timestep);
-        //Flag all data loaded at this step
-        timesteps[now]->loaded = true;
-      }
-      // Similar required when loading tracers in loadFixedData
-      if (type == lucTracerType && step() != timestep)
-      {
-        //Change active timestep
-        session.now = now = nearestTimeStep(timestep);
-      }
+      records.push_back(GeometryRecord());
+      records.back().fetch(statement);
+      //Limit the batch by decompressed size, blobs are expanded in place when decoded
+      GeometryRecord& r = records.back();
+      bytes += std::max((unsigned long)r.data.size(), (unsigned long)r.count * GeomData::byteSize(r.data_type));
+    }
+    if (ret != SQLITE_ROW && ret != SQLITE_DONE)
+      fprintf(stderr, "Database file problem, sqlite_step returned: %d (%d)\n", ret, (ret>>8));
 
-      if (type == lucTracerType)
-      {
-        height = 0;
-        //Default particle count:
-        if (width == 0) width = items;
-      }
+    //Decode
+    auto t1 = std::chrono::steady_clock::now();
+    decodeRecords(records, threads);
 
-      //Create object and set parameters
-      active = lookupObjectRenderer(obj, type);
+    //Load
+    auto t2 = std::chrono::steady_clock::now();
+    for (auto& r : records)
+    {
+      tbytes += r.data.size();   //Byte counter
+      loadRecord(r, cache);
+    }
+    auto t3 = std::chrono::steady_clock::now();
+    fetchtime += t1 - t0;
+    decodetime += t2 - t1;
+    loadtime += t3 - t2;
+  }
+  while (ret == SQLITE_ROW);
 
-      if (!active) continue; //Can't render this data
+  sqlite3_finalize(statement);
+  debug_print("... loaded %d rows, %lu bytes, fetch %.4lf decode %.4lf load %.4lf seconds\n", rows, tbytes, fetchtime.count(), decodetime.count(), loadtime.count());
 
-      unsigned char* buffer = NULL;
-      if (bytes != (unsigned int)(count * GeomData::byteSize(data_type)))
-      {
-        //Decompress!
-        unsigned long dst_len = (unsigned long)(count * GeomData::byteSize(data_type));
-        unsigned long uncomp_len = dst_len;
-        unsigned long cmp_len = bytes;
-        buffer = new unsigned char[dst_len];
-        if (!buffer)
-          abort_program("Out of memory!\n");
+  return rows;
+}
 
-#ifdef USE_ZLIB
-        int res = uncompress(buffer, &uncomp_len, (const unsigned char *)data, cmp_len);
-        if (res != Z_OK || dst_len != uncomp_len)
-#else
-        int res = tinfl_decompress_mem_to_mem(buffer, uncomp_len, (const unsigned char *)data, cmp_len, TINFL_FLAG_PARSE_ZLIB_HEADER);
-        if (!res)
-#endif
-        {
-          abort_program("uncompress() failed! error code %d\n", res);
-          //abort_program("uncompress() failed! error code %d expected size %d actual size %d\n", res, dst_len, uncomp_len);
-        }
-        data = buffer; //Replace data pointer
-        bytes = uncomp_len;
-      }
+int Model::loadRecord(GeometryRecord& record, bool cache)
+{
+  //Load a decompressed geometry record into the renderers, returns 1 if loaded
+  int height = record.height;
+  int width = record.width;
+  int depth = record.depth;
+  int timestep = record.timestep;
+  lucGeometryType type = record.type;
+  lucGeometryDataType data_type = record.data_type;
+  int items = record.count / record.size;
+  if (height == 0) height = width > 0 ? items / width : 0;
+  float minimum = record.minimum;
+  float maximum = record.maximum;
+  //Clear if default
+  if (maximum - minimum == 1.0) maximum = minimum = 0.0;
+  const char *data_label = record.data_label.c_str();
+  const void *data = record.data.data();
 
-      tbytes += bytes;   //Byte counter
+  //printf("OBJ %d STEP %d TYPE %d DTYPE %d DIMS (%d x %d x %d) COUNT %d ITEMS %d LABELS %s\n", 
+  //       record.object_id, timestep, type, data_type, width, height, depth, record.count, items, record.labels.c_str());
 
-      //Always add a new element for each new vertex geometry record
-      //not suitable if writing db on multiple procs!
-      if (data_type == lucVertexData) active->add(obj);
+  DrawingObject* obj = findObject(record.object_id);
 
-      //Read data block
-      Geom_Ptr g;
-      //Convert legacy value types to use data labels
-      switch (data_type)
-      {
-        case lucColourValueData:
-        case lucOpacityValueData:
-        case lucRedValueData:
-        case lucGreenValueData:
-        case lucBlueValueData:
-        case lucXWidthData:
-        case lucYHeightData:
-        case lucZLengthData:
-        case lucSizeData:
-        case lucMaxDataType:
-        {
-          json by;
-          if (data_label && strlen(data_label) > 0)
-          {
-            //Use provided label from units field
-            g = active->read(obj, items, data, data_label);
-            by = data_label;
-          }
-          else //Use default/legacy label
-          {
-            g = active->read(obj, items, data, GeomData::datalabels[data_type]);
-            by = GeomData::datalabels[data_type];
-          }
+  //Deleted or Skip object? (When noload enabled)
+  if (!obj || obj->skip) return 0;
 
-          //Set as the opacity/size data if in these categories
-          if (data_type == lucOpacityValueData)
-            obj->properties.data["opacityby"] = by;
-          if (data_type == lucSizeData)
-            obj->properties.data["sizeby"] = by;
+  //Bulk load: switch timestep and cache if timestep changes!
+  // - disabled when using attached databases (cached in loop via cacheLoad())
+  if (cache && step() != timestep && !database.attached)
+  {
+    std::cout << '~' << std::flush;
+    if (timestep > 0 && timestep%10==0) std::cout << std::setw(4) << timestep << " " << std::flush;
+    if (timestep > 0 && timestep%50==0) std::cout << std::endl;
+    //Change active timestep
+    session.now = now = nearestTimeStep(timestep);
+    //Flag all data loaded at this step
+    timesteps[now]->loaded = true;
+  }
+  // Similar required when loading tracers in loadFixedData
+  if (type == lucTracerType && step() != timestep)
+  {
+    //Change active timestep
+    session.now = now = nearestTimeStep(timestep);
+  }
 
-          //copy max/min fields
-          unsigned int valueIdx = g->valuesLookup(by);
-          if (valueIdx < g->values.size())
-          {
-            g->values[valueIdx]->minimum = minimum;
-            g->values[valueIdx]->maximum = maximum;
-          }
-          break;
-        }
-        default:
-          //Non-value data
-          g = active->read(obj, items, data_type, data, width, height, depth);
-
-          //copy max/min fields
-          Data_Ptr container = g->dataContainer(data_type);
-          container->minimum = minimum;
-          container->maximum = maximum;
-      }
+  if (type == lucTracerType)
+  {
+    height = 0;
+    //Default particle count:
+    if (width == 0) width = items;
+  }
 
-      //Set geom labels if any
-      if (labels) active->label(obj, labels);
+  //Create object and set parameters
+  Geometry* active = lookupObjectRenderer(obj, type);
 
-      //Where min/max vertex provided, load
-      if (data_type == lucVertexData && type != lucLabelType)
-      {
-        float min[3] = {0,0,0}, max[3] = {0,0,0};
-        if (sqlite3_column_type(statement, 15) != SQLITE_NULL)
-        {
-          for (int i=0; i<3; i++)
-          {
-            min[i] = (float)sqlite3_column_double(statement, 15+i);
-            max[i] = (float)sqlite3_column_double(statement, 18+i);
-          }
-        }
+  if (!active) return 0; //Can't render this data
 
-        //Apply dims if provided
-        if (min[0] != max[0] || min[1] != max[1] || min[2] != max[2])
-        {
-          g->checkPointMinMax(min);
-          g->checkPointMinMax(max);
-        }
+  //Always add a new element for each new vertex geometry record
+  //not suitable if writing db on multiple procs!
+  if (data_type == lucVertexData) active->add(obj);
+
+  //Read data block
+  Geom_Ptr g;
+  //Convert legacy value types to use data labels
+  switch (data_type)
+  {
+    case lucColourValueData:
+    case lucOpacityValueData:
+    case lucRedValueData:
+    case lucGreenValueData:
+    case lucBlueValueData:
+    case lucXWidthData:
+    case lucYHeightData:
+    case lucZLengthData:
+    case lucSizeData:
+    case lucMaxDataType:
+    {
+      json by;
+      if (strlen(data_label) > 0)
+      {
+        //Use provided label from units field
+        g = active->read(obj, items, data, data_label);
+        by = data_label;
+      }
+      else //Use default/legacy label
+      {
+        g = active->read(obj, items, data, GeomData::datalabels[data_type]);
+        by = GeomData::datalabels[data_type];
       }
 
-      if (buffer) delete[] buffer;
+      //Set as the opacity/size data if in these categories
+      if (data_type == lucOpacityValueData)
+        obj->properties.data["opacityby"] = by;
+      if (data_type == lucSizeData)
+        obj->properties.data["sizeby"] = by;
+      obj->touch();
+
+      //copy max/min fields
+      unsigned int valueIdx = g->valuesLookup(by);
+      if (valueIdx < g->values.size())
+      {
+        g->values[valueIdx]->minimum = minimum;
+        g->values[valueIdx]->maximum = maximum;
+      }
+      break;
     }
-    else if (ret != SQLITE_DONE)
-      fprintf(stderr, "Database file problem, sqlite_step returned: %d (%d)\n", ret, (ret>>8));
+    default:
+      //Non-value data
+      g = active->read(obj, items, data_type, data, width, height, depth);
+
+      //copy max/min fields
+      Data_Ptr container = g->dataContainer(data_type);
+      container->minimum = minimum;
+      container->maximum = maximum;
   }
-  while (ret == SQLITE_ROW);
 
-  sqlite3_finalize(statement);
-  debug_print("... loaded %d rows, %d bytes, %.4lf seconds\n", rows, tbytes, (clock()-t1)/(double)CLOCKS_PER_SEC);
+  //Set geom labels if any
+  if (record.haslabels) active->label(obj, record.labels.c_str());
 
-  return rows;
+  //Flag as database data, can be released from the cache and reloaded
+  g->stored = true;
+
+  //Where min/max vertex provided, load
+  if (data_type == lucVertexData && type != lucLabelType)
+  {
+    float* min = record.min;
+    float* max = record.max;
+
+    //Apply dims if provided
+    if (min[0] != max[0] || min[1] != max[1] || min[2] != max[2])
+    {
+      g->checkPointMinMax(min);
+      g->checkPointMinMax(max);
+    }
+  }
+
+  return 1;
 }
 
 void Model::mergeDatabases()
@@ -1810,8 +2318,10 @@ void Model::mergeRecords(Model* other)
   for (auto o : other->objects)
   {
     o->dbid = 0;
+    o->touch();
     objects.push_back(o);
   }
+  objects_version = ++session.changes;
 
   //Colourmaps
   for (auto c : other->colourMaps)
@@ -1858,6 +2368,7 @@ void Model::mergeRecords(Model* other)
 void Model::updateObject(DrawingObject* target, lucGeometryType type)
 {
   database.reopen(true); //Ensure opened writable
+  writeprogress.reset();
   database.issue("BEGIN EXCLUSIVE TRANSACTION");
   if (type == lucMaxType)
     writeObjects(database, target, step());
@@ -1866,6 +2377,8 @@ void Model::updateObject(DrawingObject* target, lucGeometryType type)
     Geometry* g = getRenderer(type);
     if (g) writeGeometry(database, g, target, step());
   }
+  writeRecords(database);
+  writeprogress.finish();
 
   //Update object
   database.issue("UPDATE OBJECT set properties = '%s' WHERE name = '%s'", target->properties.data.dump().c_str(), target->name().c_str());
@@ -1915,6 +2428,10 @@ void Model::writeDatabase(const char* path, DrawingObject* obj, bool overwrite)
 
 void Model::writeDatabase(Database& outdb, DrawingObject* obj)
 {
+  //Any data read ahead may be replaced
+  prefetch.clear();
+  writeprogress.reset();
+
   // Remove existing static data
   //outdb.issue("drop table IF EXISTS object");
   //outdb.issue("drop table IF EXISTS state");
@@ -1965,7 +2482,9 @@ void Model::writeDatabase(Database& outdb, DrawingObject* obj)
     writeObjects(outdb, obj, i);
   }
 
+  writeRecords(outdb);
   outdb.issue("COMMIT");
+  writeprogress.finish();
 }
 
 void Model::writeState()
@@ -2075,85 +2594,109 @@ void Model::writeGeometry(Database& outdb, Geometry* g, DrawingObject* obj, int
 
 void Model::writeGeometryRecord(Database& outdb, lucGeometryType type, lucGeometryDataType dtype, unsigned int objid, Geom_Ptr data, DataContainer* block, int step)
 {
-  int compression = session.global("compression");
-  char SQL[SQL_QUERY_MAX];
-  sqlite3_stmt* statement;
-  unsigned char* buffer = (unsigned char*)block->ref(0);
-  unsigned long src_len = block->bytes();
-  // Compress the data if enabled and > 1kb
-  unsigned long cmp_len = 0;
-  if (compression != Z_NO_COMPRESSION &&  src_len > 1000)
-  {
-    cmp_len = compressBound(src_len);
-    buffer = (unsigned char*)malloc((size_t)cmp_len);
-    if (buffer == NULL)
-      abort_program("Compress database: out of memory!\n");
-    //if (compress(buffer, &cmp_len, (const unsigned char *)block->ref(0), src_len) != Z_OK)
-    if (compress2(buffer, &cmp_len, (const unsigned char *)block->ref(0), src_len, compression) != Z_OK)
-      abort_program("Compress database buffer failed!\n");
-    if (cmp_len >= src_len)
-    {
-      free(buffer);
-      buffer = (unsigned char*)block->ref(0);
-      cmp_len = 0;
-    }
-    else
-      src_len = cmp_len;
+  //Queue the record, compressed and inserted in batches by writeRecords()
+  writequeue.push_back(GeometryRecord());
+  GeometryRecord& r = writequeue.back();
+  r.object_id = objid;
+  r.timestep = step;
+  r.height = data->height;
+  r.depth = data->depth;
+  r.type = type;
+  r.data_type = dtype;
+  r.size = block->unitsize();
+  r.count = block->size();
+  r.width = data->width;
+  r.source = block->ref(0);
+  r.srclen = block->bytes();
+
+  //Compression level, per data type/label if set in "compressionlevels", or "compression"
+  r.compression = session.global("compression");
+  json levels = session.global("compressionlevels");
+  if (levels.is_object())
+  {
+    if (levels.count(block->label) && levels[block->label].is_number())
+      r.compression = levels[block->label];
+    else if (levels.count(GeomData::datalabels[dtype]) && levels[GeomData::datalabels[dtype]].is_number())
+      r.compression = levels[GeomData::datalabels[dtype]];
   }
 
   if (block->minimum == HUGE_VAL || std::isnan(block->minimum)) block->minimum = 0;
   if (block->maximum == -HUGE_VAL || std::isnan(block->maximum)) block->maximum = 0;
+  r.minimum = block->minimum;
+  r.maximum = block->maximum;
+  r.data_label = block->label;
 
-  float min[3], max[3];
   for (int c=0; c<3; c++)
   {
-    min[c] = data->min[c];
-    if (!std::isfinite(min[c])) min[c] = session.min[c];
-    if (!std::isfinite(min[c])) min[c] = 0.0;
-    max[c] = data->max[c];
-    if (!std::isfinite(max[c])) max[c] = session.max[c];
-    if (!std::isfinite(max[c])) max[c] = 0.0;
+    r.min[c] = data->min[c];
+    if (!std::isfinite(r.min[c])) r.min[c] = session.min[c];
+    if (!std::isfinite(r.min[c])) r.min[c] = 0.0;
+    r.max[c] = data->max[c];
+    if (!std::isfinite(r.max[c])) r.max[c] = session.max[c];
+    if (!std::isfinite(r.max[c])) r.max[c] = 0.0;
   }
 
-  snprintf(SQL, SQL_QUERY_MAX, "INSERT INTO geometry (object_id, timestep, rank, idx, type, data_type, size, count, width, minimum, maximum, dim_factor, units, minX, minY, minZ, maxX, maxY, maxZ, labels, data) VALUES (%d, %d, %d, %d, %d, %d, %d, %d, %d, %g, %g, %g, '%s', %g, %g, %g, %g, %g, %g, ?, ?)", objid, step, data->height, data->depth, type, dtype, block->unitsize(), block->size(), data->width, block->minimum, block->maximum, 0.0, block->label.c_str(), min[0], min[1], min[2], max[0], max[1], max[2]);
+  //Labels on vertex block only
+  if (dtype == lucVertexData)
+    r.labels = data->getLabels();
+  r.haslabels = r.labels.length() > 0;
+
+  writeprogress.records++;
+  writeprogress.bytes += r.srclen;
+  writequeuebytes += r.srclen;
+  if (writequeuebytes > 256*1024*1024)
+    writeRecords(outdb);
 
-  /* Prepare statement... */
+  //printf("QUEUED ID %d STEP %d TYPE %d DTYPE %d DIMS (%d x %d x %d) COUNT %d LABELS %s\n", 
+  //       objid, step, type, dtype, data->width, data->height, data->depth, block->size(), r.labels.c_str());
+}
+
+void Model::writeRecords(Database& outdb)
+{
+  //Compress queued records in parallel then insert in order with a single prepared statement
+  if (writequeue.size() == 0) return;
+  //Queued records reference geometry data, never keep them after a failure
+  GeometryRecords records;
+  records.swap(writequeue);
+  writequeuebytes = 0;
+  encodeRecords(records, session.global("writethreads"));
+
+  const char* SQL = "INSERT INTO geometry (object_id, timestep, rank, idx, type, data_type, size, count, width, minimum, maximum, dim_factor, units, minX, minY, minZ, maxX, maxY, maxZ, labels, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)";
+  sqlite3_stmt* statement;
   if (sqlite3_prepare_v2(outdb.db, SQL, -1, &statement, NULL) != SQLITE_OK)
-  {
     abort_program("SQL prepare error: (%s) %s\n", SQL, sqlite3_errmsg(outdb.db));
-  }
 
-  /* Setup text data for insert (on vertex block only) */
-  std::string labels = data->getLabels().c_str();
-  if (dtype == lucVertexData && labels.length() > 0)
+  for (auto& r : records)
   {
-    if (sqlite3_bind_text(statement, 1, labels.c_str(), labels.length(), SQLITE_STATIC) != SQLITE_OK)
-    //const char* clabels = labels.c_str();
-    //if (sqlite3_bind_text(statement, 1, clabels, strlen(clabels), SQLITE_STATIC) != SQLITE_OK)
-      abort_program("SQL bind error: %s\n", sqlite3_errmsg(outdb.db));
+    debug_print("Writing %lu bytes\n", r.data.size() ? r.data.size() : r.srclen);
+    r.insert(statement);
+    writeprogress.written++;
+    writeprogress.stored += r.data.size() ? r.data.size() : r.srclen;
   }
 
-  /* Setup blob data for insert */
-  debug_print("Writing %lu bytes\n", src_len);
-  if (sqlite3_bind_blob(statement, 2, buffer, src_len, SQLITE_STATIC) != SQLITE_OK)
-    abort_program("SQL bind error: %s\n", sqlite3_errmsg(outdb.db));
-
-  /* Execute statement */
-  if (sqlite3_step(statement) != SQLITE_DONE )
-    abort_program("SQL step error: (%s) %s\n", SQL, sqlite3_errmsg(outdb.db));
-
   sqlite3_finalize(statement);
+}
 
-  // Free compression buffer
-  if (cmp_len > 0) free(buffer);
-
-  //printf("WROTE ID %d STEP %d TYPE %d DTYPE %d DIMS (%d x %d x %d) COUNT %d LABELS %s\n", 
-  //       objid, step, type, dtype, data->width, data->height, data->depth, block->size(), labels.c_str());
+json Model::writeProgress()
+{
+  //Database write progress and throughput, safe to call while writing from another thread
+  json progress;
+  std::chrono::duration<double> elapsed = (writeprogress.active ? std::chrono::steady_clock::now() : writeprogress.end) - writeprogress.start;
+  unsigned long bytes = writeprogress.bytes;
+  progress["active"] = (bool)writeprogress.active;
+  progress["records"] = (unsigned long)writeprogress.records;
+  progress["written"] = (unsigned long)writeprogress.written;
+  progress["bytes"] = bytes;
+  progress["stored"] = (unsigned long)writeprogress.stored;
+  progress["seconds"] = elapsed.count();
+  progress["throughput"] = elapsed.count() > 0 ? bytes / elapsed.count() : 0;
+  return progress;
 }
 
 void Model::deleteObjectRecord(unsigned int id)
 {
   if (!database) return;
+  prefetch.clear();
   database.reopen(true);  //Open writable
   database.issue("DELETE FROM object WHERE id==%1$d; DELETE FROM geometry WHERE object_id=%1$d; DELETE FROM viewport_object WHERE object_id=%1$d;", id);
   database.issue("VACUUM");
@@ -2225,6 +2768,7 @@ void Model::deleteObject(DrawingObject* obj)
     if (obj == objects[i])
     {
       objects.erase(objects.begin()+i);
+      objects_version = ++session.changes;
       break;
     }
   }
@@ -2271,6 +2815,38 @@ json Model::objectDataSets(DrawingObject* o)
   return dict;
 }
 
+std::map<DrawingObject*, json> Model::objectDataSets()
+{
+  //Data labels for all objects, collected in a single pass over the geometry
+  //(calling objectDataSets(o) per object scans all geometry for every object)
+  std::map<DrawingObject*, json> sets;
+  for (auto g : geometry)
+  {
+    if (g->geom.size() == 0)
+      g->merge();
+    int laststep = -1;
+    for (unsigned int i = 0; i < g->geom.size(); i++)
+    {
+      //Skip all except first (for tracers which have all steps merged)
+      if (g->geom[i]->step > 0 && laststep >= 0)
+        break;
+      laststep = g->geom[i]->step;
+      DrawingObject* draw = g->geom[i]->draw;
+      for (unsigned int v = 0; v < g->geom[i]->values.size(); v++)
+      {
+        json entry;
+        auto range = draw->ranges[g->geom[i]->values[v]->label];
+        entry["minimum"] = range.minimum;
+        entry["maximum"] = range.maximum;
+        entry["size"] = g->geom[i]->values[v]->size();
+        entry["name"] = draw->name();
+        sets[draw][g->geom[i]->values[v]->label] = entry;
+      }
+    }
+  }
+  return sets;
+}
+
 std::string Model::jsonWrite(bool objdata)
 {
   std::ostringstream json;
@@ -2309,6 +2885,10 @@ void Model::jsonWrite(std::ostream& os, DrawingObject* o, bool objdata)
     cmaps.push_back(cmap);
   }
 
+  std::map<DrawingObject*, json> datasets;
+  if (!objdata)
+    datasets = objectDataSets();
+
   //if (!viewer->visible) aview->filtered = false; //Disable viewport filtering
   for (unsigned int i=0; i < objects.size(); i++)
   {
@@ -2339,9 +2919,8 @@ void Model::jsonWrite(std::ostream& os, DrawingObject* o, bool objdata)
       if (!objdata)
       {
         //Data labels
-        json dict = objectDataSets(objects[i]);
-        if (dict.size() > 0)
-          obj["data"] = dict;
+        if (datasets.count(objects[i]) > 0)
+          obj["data"] = datasets[objects[i]];
 
         //std::cout << "HAS OBJ TYPES: (point,tri,vol)" << obj.count("points") << "," 
         //          << obj.count("triangles") << "," << obj.count("volume") << std::endl;
@@ -2386,6 +2965,126 @@ void Model::jsonWrite(std::ostream& os, DrawingObject* o, bool objdata)
   os << std::setw(2) << exported;
 }
 
+void Model::checkChanges()
+{
+  //Update the change counters of the small global, view and colourmap sections
+  //by comparing with their last exported state (called with session.mutex locked)
+  auto changed = [&](json& previous, json& current, unsigned int& version)
+  {
+    if (current != previous)
+    {
+      previous = current;
+      version = ++session.changes;
+    }
+  };
+
+  json properties = session.globals;
+  //Converts named colours to js readable
+  if (properties.count("background") > 0)
+    properties["background"] = Colour(properties["background"]).toString();
+  changed(exported["properties"], properties, globals_version);
+
+  for (auto view : views)
+  {
+    view->exportProps();
+    changed(view->exported, view->properties.data, view->version);
+  }
+  //View list changes (added / removed)
+  json viewcount = views.size();
+  changed(exported["views"], viewcount, views_version);
+
+  json cmaps = json::array();
+  for (unsigned int i = 0; i < colourMaps.size(); i++)
+    cmaps.push_back(colourMaps[i]->toJSON());
+  changed(exported["colourmaps"], cmaps, colourmaps_version);
+
+  //Model bounds are included with every object
+  json bounds = {min[0], min[1], min[2], max[0], max[1], max[2]};
+  changed(exported["bounds"], bounds, bounds_version);
+}
+
+unsigned int Model::stateVersion()
+{
+  //Current change count, unchanged if nothing in the exported state has been modified
+  LOCK_GUARD(session.mutex);
+  checkChanges();
+  return session.changes;
+}
+
+void Model::jsonChanges(std::ostream& os, unsigned int since)
+{
+  //Write only the parts of the state that have changed since a previous change count (0 = all)
+  // - unchanged views are written as null, unchanged objects as their name only
+  LOCK_GUARD(session.mutex);
+  checkChanges();
+
+  json exported;
+  if (since == 0 || globals_version > since)
+    exported["properties"] = this->exported["properties"];
+
+  bool viewchanged = false;
+  json outviews = json::array();
+  for (auto view : views)
+  {
+    if (since == 0 || view->version > since)
+    {
+      outviews.push_back(view->properties.data);
+      viewchanged = true;
+    }
+    else
+      outviews.push_back(nullptr);
+  }
+  if (viewchanged || views_version > since)
+    exported["views"] = outviews;
+
+  if (since == 0 || colourmaps_version > since)
+    exported["colourmaps"] = this->exported["colourmaps"];
+
+  //Objects modified since the previous export, all if the model bounds changed
+  bool all = since == 0 || bounds_version > since;
+  std::vector<DrawingObject*> modified;
+  for (auto o : objects)
+    if (all || o->version > since)
+      modified.push_back(o);
+
+  if (modified.size() || objects_version > since)
+  {
+    //Data labels, collected in a single pass over the geometry when many objects are modified
+    std::map<DrawingObject*, json> datasets;
+    if (modified.size() > 1)
+      datasets = objectDataSets();
+    else if (modified.size() == 1)
+      datasets[modified[0]] = objectDataSets(modified[0]);
+
+    json outobjects = json::array();
+    for (auto o : objects)
+    {
+      if (all || o->version > since)
+      {
+        json obj = o->properties.data;
+        //Same bounds and data labels as full export
+        if (min[0] < max[0] && min[1] < max[1])
+        {
+          obj["min"] = {min[0], min[1], min[2]};
+          obj["max"] = {max[0], max[1], max[2]};
+        }
+        if (datasets.count(o) > 0 && datasets[o].size() > 0)
+          obj["data"] = datasets[o];
+        outobjects.push_back(obj);
+      }
+      else
+        outobjects.push_back(o->name());
+    }
+    exported["objects"] = outobjects;
+  }
+
+  if (figure >= 0 && figure < (int)fignames.size())
+    exported["figure"] = fignames[figure];
+  exported["version"] = session.changes;
+
+  os << exported;
+}
+
 int Model::jsonRead(std::string data)
 {
   LOCK_GUARD(session.mutex);
@@ -2508,6 +3207,7 @@ int Model::jsonRead(std::string data)
     
     //Merge properties
     dest->properties.merge(inobjects[i]);
+    dest->touch();
     //reload(dest);
   }
 
@@ -79,11 +79,124 @@ public:
   operator bool() const { return db != NULL; }
 };
 
+//Single geometry record read from the database
+//Fetched in one step and decompressed in another so decoding can be done away from the sqlite cursor
+class GeometryRecord
+{
+public:
+  int object_id;
+  int timestep;
+  int height;
+  int depth;
+  lucGeometryType type;
+  lucGeometryDataType data_type;
+  int size;
+  int count;
+  int width;
+  float minimum, maximum;
+  std::string data_label;
+  std::string labels;
+  bool haslabels = false;
+  bool hasbounds = false;
+  float min[3], max[3];
+  std::vector<unsigned char> data;
+
+  //Source data and compression level when writing
+  const void* source = NULL;
+  unsigned long srclen = 0;
+  int compression = 0;
+
+  void fetch(sqlite3_stmt* statement);
+  void decode();
+  void encode();
+  void insert(sqlite3_stmt* statement);
+};
+
+typedef std::vector<GeometryRecord> GeometryRecords;
+
+void decodeRecords(GeometryRecords& records, int threads=0);
+void encodeRecords(GeometryRecords& records, int threads=0);
+
+//Database write counters, may be read from another thread while writing
+struct WriteProgress
+{
+  std::atomic<bool> active;
+  std::atomic<unsigned long> records;
+  std::atomic<unsigned long> written;
+  std::atomic<unsigned long> bytes;
+  std::atomic<unsigned long> stored;
+  std::chrono::steady_clock::time_point start, end;
+
+  WriteProgress() {reset(); active = false;}
+  void reset()
+  {
+    records = written = bytes = stored = 0;
+    start = std::chrono::steady_clock::now();
+    active = true;
+  }
+  void finish()
+  {
+    end = std::chrono::steady_clock::now();
+    active = false;
+  }
+};
+
+//Background reader for time step geometry
+//Uses a worker thread with its own database connection to read and decompress
+//the next steps before they are requested, leaving only the load/upload on the render thread
+class TimeStepPrefetch
+{
+  struct Request
+  {
+    int idx;
+    int step;
+    std::string path;
+  };
+
+  std::thread worker;
+  std::mutex mutex;
+  std::condition_variable cv;
+  std::deque<Request> queued;
+  std::map<int, std::shared_ptr<GeometryRecords> > ready;
+  int loading = -1;
+  int threads = 1;
+  bool quit = false;
+  FilePath file;
+
+  void run();
+  std::shared_ptr<GeometryRecords> read(Database& db, const Request& request, int threads);
+
+public:
+  unsigned int hits = 0;
+  unsigned int misses = 0;
+
+  ~TimeStepPrefetch() {stop();}
+
+  void request(const FilePath& fn, std::vector<TimeStep*>& timesteps, std::vector<int>& steps, int threads=1);
+  bool take(int idx, GeometryRecords& records);
+  void clear();
+  void stop();
+};
+
 class Model
 {
 private:
   int now;            //Loaded step per model
   Session& session;
+  TimeStepPrefetch prefetch;
+
+  //Time step data cache, loaded step indices, least recently used first
+  std::deque<int> cached;
+  std::map<int, unsigned long> cachebytes;
+  unsigned long cachetotal = 0;
+  unsigned int cache_hits = 0;
+  unsigned int cache_misses = 0;
+  unsigned int cache_evictions = 0;
+
+  //Geometry records waiting to be written
+  GeometryRecords writequeue;
+  unsigned long writequeuebytes = 0;
+  WriteProgress writeprogress;
 
 public:
 
@@ -107,6 +220,16 @@ public:
 
   float min[3], max[3]; //Calculated model bounding box
 
+  //Change tracking for incremental state export,
+  //objects are flagged when modified (DrawingObject::touch), the object list when added/removed,
+  //the small global/view/colourmap sections are compared with their last exported state
+  json exported;
+  unsigned int globals_version = 0;
+  unsigned int views_version = 0;
+  unsigned int colourmaps_version = 0;
+  unsigned int objects_version = 0;
+  unsigned int bounds_version = 0;
+
   Geometry* getRenderer(lucGeometryType type, std::vector<Geometry*>& renderers);
   Geometry* getRenderer(lucGeometryType type);
   std::vector<Geometry*> getRenderersByTypeName(const std::string& typestr);
@@ -154,6 +277,9 @@ public:
   View* defaultView(Properties* properties=NULL);
 
   void cacheLoad();
+  void cacheStep(int idx, bool loaded);
+  void cacheClear();
+  json cacheInfo();
 
 public:
   int step()
@@ -181,6 +307,8 @@ public:
   int loadGeometry(int obj_id=0, int time_start=-1, int time_stop=-1);
   int loadFixedGeometry(int obj_id=0);
   int readGeometryRecords(sqlite3_stmt* statement, bool cache=true);
+  int loadRecord(GeometryRecord& record, bool cache=true);
+  void prefetchSteps(int stepidx, int previous);
   void mergeDatabases();
   void mergeRecords(Model* other);
   void updateObject(DrawingObject* target, lucGeometryType type);
@@ -192,6 +320,8 @@ public:
   void deleteGeometry(Database& outdb, lucGeometryType type, DrawingObject* obj, int step);
   void writeGeometry(Database& outdb, Geometry* g, DrawingObject* obj, int step);
   void writeGeometryRecord(Database& outdb, lucGeometryType type, lucGeometryDataType dtype, unsigned int objid, Geom_Ptr data, DataContainer* block, int step);
+  void writeRecords(Database& outdb);
+  json writeProgress();
   void deleteObjectRecord(unsigned int id);
   void backup(Database& fromdb, Database& todb);
   void calculateBounds(View* aview, float* default_min=NULL, float* default_max=NULL);
@@ -199,8 +329,14 @@ public:
   void deleteObject(DrawingObject* obj);
 
   json objectDataSets(DrawingObject* o);
+  std::map<DrawingObject*, json> objectDataSets();
+private:
+  void checkChanges();
+public:
   std::string jsonWrite(bool objdata=false);
   void jsonWrite(std::ostream& os, DrawingObject* obj=NULL, bool objdata=false);
+  void jsonChanges(std::ostream& os, unsigned int since);
+  unsigned int stateVersion();
   int jsonRead(std::string data);
 
   std::vector<unsigned char> serialize();
@@ -309,7 +309,8 @@ void Points::sort()
       opaqueCount++;
   }
   t2 = clock();
-  debug_print("  %.4lf seconds to calculate distances\n", (t2-t1)/(double)CLOCKS_PER_SEC);
+  sorter.distances = (t2-t1)/(double)CLOCKS_PER_SEC;
+  debug_print("  %.4lf seconds to calculate distances\n", sorter.distances);
   t1 = clock();
 
   //Skip sort if all opaque
@@ -322,9 +323,9 @@ void Points::sort()
   //Depth sort using 2-byte key radix sort, 10 times faster than equivalent quicksort
   if (view->is3d)
   {
-    sorter.sort(elements);
-    t2 = clock();
-    debug_print("  %.4lf seconds to sort %d points\n", (t2-t1)/(double)CLOCKS_PER_SEC, elements);
+    //Incremental, starts from the previous order, falls back to radix sort if too many are out of place
+    sorter.sort(elements, session.global("sortthreshold"));
+    debug_print("  %.4lf seconds to sort %d points (%s)\n", sorter.last[sorter.path], elements, sorter.pathName(sorter.path));
   }
 
   //Re-map vertex indices in sorted order
@@ -359,6 +360,13 @@ void Points::sort()
   sorter.changed = true;
 }
 
+json Points::sortInfo()
+{
+  //Depth sort timing per path, see SortData
+  LOCK_GUARD(sortmutex);
+  return sorter.info();
+}
+
 //Reloads points into display list or VBO, required after data update and depth sort
 void Points::render()
 {
@@ -26,6 +26,10 @@ public:
   int now;
   int zlib_compression = Z_BEST_SPEED;
 
+  //Change counter, incremented on each detected state change
+  //(and on geometry data loads)
+  unsigned int changes = 0;
+
   //Mutex for thread safe updates
   std::mutex mutex;
 
@@ -542,7 +542,8 @@ void TriSurfaces::sort()
       opaqueCount++;
   }
   t2 = clock();
-  debug_print("  %.4lf seconds to calculate distances\n", (t2-t1)/(double)CLOCKS_PER_SEC);
+  sorter.distances = (t2-t1)/(double)CLOCKS_PER_SEC;
+  debug_print("  %.4lf seconds to calculate distances\n", sorter.distances);
   t1 = clock();
 
   //Skip sort if all opaque
@@ -562,9 +563,9 @@ void TriSurfaces::sort()
   if (view->is3d)
   {
     //Depth sort using 2-byte key radix sort, 10 times faster than equivalent quicksort
-    sorter.sort(tricount);
-    t2 = clock();
-    debug_print("  %.4lf seconds to sort %d triangles\n", (t2-t1)/(double)CLOCKS_PER_SEC, tricount);
+    //Incremental, starts from the previous order, falls back to radix sort if too many are out of place
+    sorter.sort(tricount, session.global("sortthreshold"));
+    debug_print("  %.4lf seconds to sort %d triangles (%s)\n", sorter.last[sorter.path], tricount, sorter.pathName(sorter.path));
   }
 
   //Lock the update mutex, to allow updating the indexlist and prevent access while drawing
@@ -587,6 +588,13 @@ void TriSurfaces::sort()
   sorter.changed = true;
 }
 
+json TriSurfaces::sortInfo()
+{
+  //Depth sort timing per path, see SortData
+  LOCK_GUARD(sortmutex);
+  return sorter.info();
+}
+
 //Reloads triangle indices, required after data update and depth sort
 void TriSurfaces::render()
 {
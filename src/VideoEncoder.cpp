@@ -57,8 +57,6 @@ void VideoEncoder::copyframe(unsigned char* array, int len)
   else
     buffer->copy(array);
 
-
-  buffer->write("temp.png");
   display();
 }
 
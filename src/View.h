@@ -100,6 +100,9 @@ public:
 
   //View properties data...
   Properties properties;
+  //Change tracking, last exported state and change counter when it was modified
+  json exported;
+  unsigned int version = 0;
 
   // Scene scaling
   float scale[3];